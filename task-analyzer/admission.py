@@ -0,0 +1,77 @@
+"""Size-based admission control for running scoring off the event loop."""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+# Assumed inflation of gzip bodies when classifying them by size
+GZIP_EXPANSION = 8
+
+
+class Overloaded(Exception):
+    """Raised when the large-request lane has no room for another request."""
+
+
+class AdmissionController:
+    """
+    Run blocking work in one of two bounded executor lanes, chosen by request size.
+
+    Requests of at least `large_threshold` bytes go to the large lane, which has
+    few workers and accepts at most `max_large_pending` running or queued
+    requests; beyond that they are refused with Overloaded. Smaller requests
+    have their own workers, so they never queue behind a batch analysis.
+    """
+
+    def __init__(self, large_threshold: int = 256 * 1024, small_workers: int = 4,
+                 large_workers: int = 1, max_large_pending: int = 4):
+        self.large_threshold = large_threshold
+        self.max_large_pending = max_large_pending
+        self._small = ThreadPoolExecutor(small_workers, thread_name_prefix="tasks-small")
+        self._large = ThreadPoolExecutor(large_workers, thread_name_prefix="tasks-large")
+        self._large_pending = 0
+        self._lock = threading.Lock()
+
+    def is_large(self, size: int) -> bool:
+        return size >= self.large_threshold
+
+    async def run(self, size: int, fn: Callable, *args):
+        """
+        Await fn(*args) in the lane for a request of `size` bytes.
+
+        Raises:
+            Overloaded: if the request is large and the large lane is full
+        """
+        if not self.is_large(size):
+            return await asyncio.wrap_future(self._small.submit(fn, *args))
+
+        with self._lock:
+            if self._large_pending >= self.max_large_pending:
+                raise Overloaded(f"{self._large_pending} large requests already pending")
+            self._large_pending += 1
+        future = self._large.submit(fn, *args)
+        # Release the slot when the work finishes, even if the awaiting request is cancelled
+        future.add_done_callback(self._release_large)
+        return await asyncio.wrap_future(future)
+
+    def _release_large(self, _future) -> None:
+        with self._lock:
+            self._large_pending -= 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"large_pending": self._large_pending, "max_large_pending": self.max_large_pending}
+
+
+def admission_from_settings(config: Optional[Dict] = None) -> AdmissionController:
+    """
+    Build an AdmissionController from a TASK_ADMISSION-style dict.
+
+    Keys: LARGE_BODY_BYTES, SMALL_WORKERS, LARGE_WORKERS, MAX_LARGE_PENDING.
+    """
+    config = config or {}
+    return AdmissionController(
+        large_threshold=config.get("LARGE_BODY_BYTES", 256 * 1024),
+        small_workers=config.get("SMALL_WORKERS", 4),
+        large_workers=config.get("LARGE_WORKERS", 1),
+        max_large_pending=config.get("MAX_LARGE_PENDING", 4),
+    )
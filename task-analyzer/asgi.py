@@ -0,0 +1,13 @@
+"""
+ASGI entry point for task-analyzer.
+
+Run with any ASGI server, e.g.:
+    uvicorn asgi:application
+"""
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'settings')
+
+application = get_asgi_application()
@@ -0,0 +1,193 @@
+"""In-memory static assets for the frontend, with strong ETags and precompressed variants."""
+import gzip
+import hashlib
+import os
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+try:  # Optional: brotli variants are only built when the package is installed
+    import brotli
+except ImportError:  # pragma: no cover - brotli is not a hard dependency
+    brotli = None
+
+# Files served from the project root, with their content types
+DEFAULT_FILES = {
+    "index.html": "text/html; charset=utf-8",
+    "script.js": "application/javascript; charset=utf-8",
+    "styles.css": "text/css; charset=utf-8",
+    "tasks.json": "application/json",
+    "favicon.ico": "image/x-icon",
+}
+
+# Encodings in order of preference when the client accepts several
+ENCODINGS = ("br", "gzip")
+
+
+class Variant(NamedTuple):
+    """One representation of an asset: its body and strong ETag."""
+    body: bytes
+    etag: str
+
+
+class Asset(NamedTuple):
+    """A loaded file: its variants by content coding ("identity", "gzip", "br")."""
+    name: str
+    content_type: str
+    variants: Dict[str, Variant]
+    mtime_ns: int
+    size: int
+
+    def etags(self) -> List[str]:
+        return [variant.etag for variant in self.variants.values()]
+
+
+def load_asset(path: str, name: str, content_type: str, min_compress_size: int = 256) -> Asset:
+    """
+    Read a file and build its variants.
+
+    Every variant gets its own strong ETag derived from the file's SHA-256.
+    Compressed variants are only kept when the file is at least
+    min_compress_size bytes and compression actually makes it smaller.
+
+    Raises:
+        OSError: if the file cannot be read
+    """
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        body = f.read()
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    variants = {"identity": Variant(body, f'"{digest}"')}
+    if len(body) >= min_compress_size:
+        compressed = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            compressed["br"] = brotli.compress(body, quality=11)
+        for encoding, data in compressed.items():
+            if len(data) < len(body):
+                variants[encoding] = Variant(data, f'"{digest}-{encoding}"')
+    return Asset(name, content_type, variants, stat.st_mtime_ns, stat.st_size)
+
+
+def accepted_encodings(header: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}; malformed q values count as 0."""
+    accepted = {}
+    for item in header.split(","):
+        coding, *params = item.strip().split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(asset: Asset, accept_encoding: str) -> str:
+    """Pick the preferred variant of asset that the client accepts ("identity" if none)."""
+    if not accept_encoding:
+        return "identity"
+    accepted = accepted_encodings(accept_encoding)
+    for encoding in ENCODINGS:
+        if encoding in asset.variants and accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return "identity"
+
+
+class AssetStore:
+    """
+    Whitelisted frontend files, loaded into memory once.
+
+    Requests are answered without touching the filesystem. With reload=True
+    (development), each lookup stats the file and reloads it when its mtime or
+    size changed, so edits show up without a restart.
+    """
+
+    def __init__(self, base_dir: str, files: Optional[Dict[str, str]] = None, reload: bool = False,
+                 max_age: int = 0, min_compress_size: int = 256):
+        self.base_dir = str(base_dir)
+        self.files = dict(DEFAULT_FILES if files is None else files)
+        self.reload = reload
+        self.max_age = max_age
+        self.min_compress_size = min_compress_size
+        self._assets: Dict[str, Optional[Asset]] = {}
+        self._lock = threading.Lock()
+        for name in self.files:
+            self._assets[name] = self._load(name)
+
+    @property
+    def cache_control(self) -> str:
+        """Cache-Control value: revalidate every time unless max_age is set."""
+        return f"public, max-age={self.max_age}" if self.max_age > 0 else "no-cache"
+
+    def get(self, name: str) -> Optional[Asset]:
+        """Return the asset, or None if it is not whitelisted or does not exist."""
+        if name not in self.files:
+            return None
+        asset = self._assets.get(name)
+        if self.reload:
+            asset = self._refresh(name, asset)
+        return asset
+
+    def lookup(self, name: str, accept_encoding: str = "",
+               if_none_match: Optional[List[str]] = None) -> Tuple[Optional[Asset], str, bool]:
+        """
+        Resolve a request for an asset.
+
+        Args:
+            name: Whitelisted file name
+            accept_encoding: The request's Accept-Encoding header
+            if_none_match: ETags parsed from If-None-Match ("*" matches anything);
+                compared weakly, as RFC 9110 requires for this header
+
+        Returns:
+            (asset, encoding, not_modified); asset is None for unknown or missing files.
+            not_modified is True when the client already holds the selected variant,
+            so a 304 always carries the ETag it was validated against.
+        """
+        asset = self.get(name)
+        if asset is None:
+            return None, "identity", False
+        encoding = choose_encoding(asset, accept_encoding)
+        if_none_match = {etag[2:] if etag.startswith("W/") else etag for etag in if_none_match or ()}
+        not_modified = "*" in if_none_match or asset.variants[encoding].etag in if_none_match
+        return asset, encoding, not_modified
+
+    def _refresh(self, name: str, asset: Optional[Asset]) -> Optional[Asset]:
+        try:
+            stat = os.stat(os.path.join(self.base_dir, name))
+        except OSError:
+            stat = None
+        if asset is not None and stat is not None and (stat.st_mtime_ns, stat.st_size) == (asset.mtime_ns, asset.size):
+            return asset
+        if asset is None and stat is None:
+            return None
+        with self._lock:
+            asset = self._assets[name] = self._load(name)
+        return asset
+
+    def _load(self, name: str) -> Optional[Asset]:
+        try:
+            return load_asset(os.path.join(self.base_dir, name), name, self.files[name], self.min_compress_size)
+        except OSError:
+            return None
+
+
+def assets_from_settings(base_dir: str, config: Optional[Dict] = None, debug: bool = False) -> AssetStore:
+    """
+    Build an AssetStore from a TASK_STATIC_ASSETS-style dict.
+
+    Keys: RELOAD (default: debug), MAX_AGE (seconds, 0 = revalidate with the
+    ETag on every use), MIN_COMPRESS_SIZE (bytes).
+    """
+    config = config or {}
+    return AssetStore(
+        base_dir,
+        reload=config.get("RELOAD", debug),
+        max_age=config.get("MAX_AGE", 0),
+        min_compress_size=config.get("MIN_COMPRESS_SIZE", 256),
+    )
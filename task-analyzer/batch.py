@@ -0,0 +1,340 @@
+"""Offline batch scoring: rank JSON, NDJSON or CSV task files without the web stack.
+
+Usage:
+    python batch.py tasks.ndjson -o ranked.ndjson
+    python batch.py export.csv --strategy unblocker --top-k 100 -o top.csv
+    python batch.py huge.ndjson --mmap --workers 8 -o ranked.ndjson
+    cat tasks.ndjson | python batch.py - --format ndjson > ranked.ndjson
+
+Tasks are parsed once into compact records. The full task bodies stay in the input
+file (NDJSON) or in a disk-backed spool (JSON arrays, CSV, stdin), and are re-read
+one at a time while the ranking is written. Memory therefore grows with the number
+of tasks, not with the size of the file.
+
+NDJSON output matches the streaming analyze endpoint: one {"task": ...} line per
+ranked task, then a {"trailer": ...} line with the cycle information. CSV output
+has one row per ranked task; cycles are reported on stderr.
+"""
+import argparse
+import csv
+import io
+import json
+import mmap
+import os
+import sys
+import time
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+
+from encoding import decode_columns
+from scoring import Task, analyze_dependencies, rank_records, top_k_records
+from serialization import dumps
+from strategies import from_weights, get_strategy
+from streaming import index_ndjson_file, iter_ndjson_results, ndjson_trailer, new_spool, read_ndjson_tasks
+
+FORMATS = ("ndjson", "json", "csv")
+
+# Columns of the CSV output, after "rank"
+CSV_COLUMNS = (
+    "id", "title", "score", "raw_score", "priority", "effort", "due_date",
+    "urgency", "importance_norm", "effort_norm", "dependency_norm",
+)
+
+# CSV "dependencies" cells list task ids separated by this character
+CSV_DEPENDENCY_SEPARATOR = ";"
+
+_EXTENSIONS = {".ndjson": "ndjson", ".jsonl": "ndjson", ".json": "json", ".csv": "csv"}
+_READ_SIZE = 1024 * 1024
+
+
+class BatchError(ValueError):
+    """Raised for unreadable or malformed task files."""
+
+
+def detect_format(path: str) -> str:
+    """Guess a file's format from its extension."""
+    fmt = _EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise BatchError(f"Cannot tell the format of '{path}'; pass --format")
+    return fmt
+
+
+def load_records(path: str, fmt: str, use_mmap: bool = False) -> Tuple[List[Task], IO[bytes]]:
+    """
+    Parse a task file into records.
+
+    Args:
+        path: File to read, or "-" for stdin
+        fmt: "ndjson", "json" (an array of tasks, or an analyze body) or "csv"
+        use_mmap: Memory-map an NDJSON file instead of reading it through a file object
+
+    Returns:
+        (records, store): each record's source is the (start, length) of its task's
+        JSON line in store. The caller owns store and must close it.
+
+    Raises:
+        BatchError, streaming.NDJSONError: for malformed input
+    """
+    if fmt == "ndjson" and path != "-":
+        store = open(path, "rb")
+        if use_mmap and os.fstat(store.fileno()).st_size:
+            # The map holds its own reference to the file, so the handle can go
+            with store:
+                store = mmap.mmap(store.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return index_ndjson_file(store), store
+        except Exception:
+            store.close()
+            raise
+
+    stream = sys.stdin.buffer if path == "-" else open(path, "rb")
+    spool = new_spool()
+    try:
+        if fmt == "ndjson":
+            records = read_ndjson_tasks(stream, spool)
+        elif fmt == "json":
+            records = _spool_tasks(_iter_json_tasks(stream), spool)
+        elif fmt == "csv":
+            records = _spool_tasks(_iter_csv_tasks(stream), spool)
+        else:
+            raise BatchError(f"Unknown format '{fmt}'")
+    except Exception:
+        spool.close()
+        raise
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+    return records, spool
+
+
+def _spool_tasks(tasks: Iterator[Dict], spool: IO[bytes]) -> List[Task]:
+    """Write each task to the spool as a JSON line and keep only its record."""
+    records = []
+    for task in tasks:
+        line = dumps(task) + b"\n"
+        start = spool.tell()
+        spool.write(line)
+        records.append(Task.from_dict(task, len(records), source=(start, len(line))))
+    return records
+
+
+def _iter_json_tasks(stream: IO[bytes]) -> Iterator[Dict]:
+    """
+    Yield the task objects of a JSON array without loading the whole document.
+
+    Objects ({"tasks": [...]} or {"columns": {...}}, as the analyze endpoint
+    accepts) cannot be streamed and are loaded in one piece.
+    """
+    reader = io.TextIOWrapper(stream, encoding="utf-8")
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+    state = "start"  # start -> value -> separator -> value ... -> "]"
+    count = 0
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n":
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                raise BatchError("Unexpected end of JSON input")
+            chunk = reader.read(_READ_SIZE)
+            buffer, pos, eof = chunk, 0, not chunk
+            continue
+
+        char = buffer[pos]
+        if state == "start":
+            if char == "{":
+                yield from _tasks_from_document(json.loads(buffer[pos:] + reader.read()))
+                return
+            if char != "[":
+                raise BatchError("JSON input must be an array of task objects")
+            pos += 1
+            state = "first"
+        elif state == "separator":
+            if char == "]":
+                return
+            if char != ",":
+                raise BatchError(f"Expected ',' or ']' after task {count}")
+            pos += 1
+            state = "value"
+        elif state == "first" and char == "]":
+            return
+        else:
+            try:
+                task, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                if eof:
+                    raise BatchError(f"Invalid JSON in task {count + 1}")
+                # The task is cut off at the end of the buffer: read on and retry
+                chunk = reader.read(_READ_SIZE)
+                buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+                continue
+            if not isinstance(task, dict):
+                raise BatchError(f"Task {count + 1} must be a JSON object")
+            count += 1
+            yield task
+            pos = end
+            state = "separator"
+
+
+def _tasks_from_document(document) -> List[Dict]:
+    if isinstance(document, dict) and "columns" in document:
+        return decode_columns(document["columns"])
+    if isinstance(document, dict) and isinstance(document.get("tasks"), list):
+        return document["tasks"]
+    raise BatchError("JSON input must be a task array, or an object with 'tasks' or 'columns'")
+
+
+def _iter_csv_tasks(stream: IO[bytes]) -> Iterator[Dict]:
+    """
+    Yield one task per CSV row; the header names the task fields.
+
+    Empty cells are left out so the scorer's defaults apply, priority and effort
+    are parsed as numbers, and dependencies are split on CSV_DEPENDENCY_SEPARATOR.
+    """
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8", newline=""))
+    for row in reader:
+        task = {}
+        for name, value in row.items():
+            if name is None or not value:
+                continue  # Cells beyond the header, or empty cells
+            if name in ("priority", "effort"):
+                task[name] = _number(value, name, reader.line_num)
+            elif name == "dependencies":
+                task[name] = [dep.strip() for dep in value.split(CSV_DEPENDENCY_SEPARATOR) if dep.strip()]
+            else:
+                task[name] = value
+        yield task
+
+
+def _number(value: str, name: str, line_number: int):
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        raise BatchError(f"'{name}' must be a number on line {line_number}") from None
+
+
+def write_ndjson(ranked: List[Task], store: IO[bytes], trailer: Dict, out: IO[bytes]) -> None:
+    """Write the ranking as NDJSON task lines plus a trailer (closes store)."""
+    for line in iter_ndjson_results(ranked, store, trailer):
+        out.write(line)
+
+
+def write_csv(ranked: List[Task], store: IO[bytes], out: IO[bytes]) -> None:
+    """Write the ranking as CSV with a rank column and the CSV_COLUMNS (closes store)."""
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+    try:
+        writer = csv.writer(text)
+        writer.writerow(("rank",) + CSV_COLUMNS)
+        for rank, record in enumerate(ranked, start=1):
+            start, length = record.source
+            store.seek(start)
+            title = json.loads(store.read(length)).get("title", "")
+            writer.writerow((
+                rank, record.id, title, round(record.raw_score, 2), record.raw_score,
+                record.priority, record.effort, record.due_date or "",
+                record.urgency, record.importance_norm, record.effort_norm, record.dependency_norm,
+            ))
+    finally:
+        text.flush()
+        text.detach()  # Leave `out` open for the caller
+        store.close()
+
+
+def rank(records: List[Task], strategy, top_k: Optional[int] = None, workers: int = 1) -> List[Task]:
+    """
+    Score records and return the ranking (or its first top_k entries).
+
+    With more than one worker, inputs of at least parallel.MIN_PARALLEL_TASKS
+    records are scored on the process pool.
+    """
+    if workers > 1:
+        from parallel import MIN_PARALLEL_TASKS, rank_records_parallel, shutdown_pool
+        if len(records) >= MIN_PARALLEL_TASKS:
+            try:
+                ranked = rank_records_parallel(records, strategy, workers)
+            finally:
+                shutdown_pool()
+            return ranked if top_k is None else ranked[:top_k]
+    if top_k is not None:
+        return top_k_records(records, top_k, strategy)
+    return rank_records(records, strategy)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="Task file, or - for stdin")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    parser.add_argument("--format", choices=FORMATS, help="Input format (default: from the extension)")
+    parser.add_argument("--output-format", choices=("ndjson", "csv"),
+                        help="Output format (default: csv for a .csv output file, else ndjson)")
+    parser.add_argument("--strategy", default="smart", help="Registered strategy name (default: smart)")
+    parser.add_argument("--weights", help="Custom weights instead of --strategy, e.g. urgency=0.6,effort=0.4")
+    parser.add_argument("--top-k", type=int, help="Write only the k best tasks")
+    parser.add_argument("--workers", type=int, default=1, help="Scoring processes (default: 1)")
+    parser.add_argument("--mmap", action="store_true", help="Memory-map NDJSON input files")
+    args = parser.parse_args(argv)
+
+    if args.top_k is not None and args.top_k < 1:
+        parser.error("--top-k must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    output_format = args.output_format or (
+        "csv" if args.output and args.output.lower().endswith(".csv") else "ndjson"
+    )
+
+    started = time.perf_counter()
+    try:
+        strategy = _strategy(args)
+        fmt = args.format or detect_format(args.input)
+        records, store = load_records(args.input, fmt, use_mmap=args.mmap)
+    except (ValueError, OSError, csv.Error) as e:
+        print(f"batch.py: error: {e}", file=sys.stderr)
+        return 1
+
+    dependency_graph = analyze_dependencies(records)
+    try:
+        ranked = rank(records, strategy, args.top_k, args.workers)
+        out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    except BaseException:
+        store.close()
+        raise
+    try:
+        if output_format == "csv":
+            write_csv(ranked, store, out)
+        else:
+            write_ndjson(ranked, store, ndjson_trailer(dependency_graph, len(ranked)), out)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+        else:
+            out.flush()
+
+    print(
+        f"Ranked {len(records)} tasks ({strategy}), wrote {len(ranked)} in "
+        f"{time.perf_counter() - started:.2f}s; {len(dependency_graph.cycles)} cycle(s), "
+        f"{len(dependency_graph.dangling)} dangling dependencies",
+        file=sys.stderr,
+    )
+    for cycle in dependency_graph.cycles:
+        print("cycle: " + " -> ".join(str(task_id) for task_id in cycle), file=sys.stderr)
+    return 0
+
+
+def _strategy(args):
+    if not args.weights:
+        return get_strategy(args.strategy)
+    weights = {}
+    for item in args.weights.split(","):
+        name, _, value = item.partition("=")
+        try:
+            weights[name.strip()] = float(value)
+        except ValueError:
+            raise BatchError(f"Invalid weight '{item}'; expected component=number") from None
+    return from_weights(weights)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,468 @@
+"""Load-test harness: drive the analyze/suggest API over HTTP at several concurrency levels.
+
+Boots the app on a local port (threaded wsgiref server, Django's runserver, or
+uvicorn when installed) or targets a running server with --url, then sends a
+mix of synthetic payloads from closed-loop client threads. For each
+concurrency level it reports throughput, latency percentiles, error rates and
+the server's RSS over time as JSON.
+
+Usage:
+    python bench_load.py                                        # wsgiref, 1/4/16 clients
+    python bench_load.py --server uvicorn --workers 4 --concurrency 8 32 --duration 30
+    python bench_load.py --sizes 100 5000 --strategies smart unblocker --output load.json
+    python bench_load.py --url http://127.0.0.1:8000 --pid 1234 --compare load.json
+"""
+import argparse
+import http.client
+import importlib.util
+import itertools
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+from bench_tasks import generate_tasks
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SERVERS = ("wsgiref", "runserver", "uvicorn")
+ENDPOINTS = {
+    "analyze": "/api/tasks/analyze/",
+    "suggest": "/api/tasks/suggest/?k=3",
+}
+
+# Placeholder in each payload's first task title, replaced per request so the
+# result cache never answers (unless --cached)
+_NONCE = b"@nonce@"
+
+
+# ============================================
+# Server
+# ============================================
+
+def _serve(settings_module: str, port: int) -> None:
+    """Run the app under a threaded wsgiref server until killed (the --serve child)."""
+    os.environ["DJANGO_SETTINGS_MODULE"] = settings_module
+    sys.path.insert(0, BASE_DIR)
+    from socketserver import ThreadingMixIn
+    from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+    from django.core.wsgi import get_wsgi_application
+
+    class Server(ThreadingMixIn, WSGIServer):
+        daemon_threads = True
+        request_queue_size = 128
+
+    class Handler(WSGIRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+    make_server("127.0.0.1", port, get_wsgi_application(), server_class=Server, handler_class=Handler).serve_forever()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind: str, settings_module: str = "settings", port: Optional[int] = None,
+                 workers: int = 1, timeout: float = 60) -> Tuple[subprocess.Popen, str]:
+    """
+    Start a local server and wait until it answers.
+
+    Args:
+        kind: "wsgiref" (threaded stdlib server), "runserver" or "uvicorn" (ASGI, optional)
+        settings_module: DJANGO_SETTINGS_MODULE for the server
+        port: Port to listen on (default: a free one)
+        workers: uvicorn worker processes
+        timeout: Seconds to wait for the first successful response
+
+    Returns:
+        (process, base URL); the caller stops the process with stop_server
+
+    Raises:
+        RuntimeError: if the server is unavailable or does not come up
+    """
+    port = port or _free_port()
+    if kind == "wsgiref":
+        command = [sys.executable, os.path.abspath(__file__), "--serve", settings_module, "--port", str(port)]
+    elif kind == "runserver":
+        command = [sys.executable, "manage.py", "runserver", f"127.0.0.1:{port}", "--noreload"]
+    elif kind == "uvicorn":
+        if importlib.util.find_spec("uvicorn") is None:
+            raise RuntimeError("uvicorn is not installed (pip install uvicorn)")
+        command = [sys.executable, "-m", "uvicorn", "asgi:application", "--host", "127.0.0.1",
+                   "--port", str(port), "--workers", str(workers), "--log-level", "warning"]
+    else:
+        raise RuntimeError(f"Unknown server '{kind}'; expected one of {', '.join(SERVERS)}")
+
+    log = tempfile.TemporaryFile()
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings_module)
+    process = subprocess.Popen(command, cwd=BASE_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            break
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            connection.request("GET", "/metrics")
+            if connection.getresponse().status == 200:
+                return process, url
+        except (OSError, http.client.HTTPException):
+            time.sleep(0.1)
+        finally:
+            connection.close()
+    stop_server(process)
+    log.seek(0)
+    raise RuntimeError(f"{kind} server did not start:\n{log.read().decode(errors='replace')[-2000:]}")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+# ============================================
+# Server memory
+# ============================================
+
+def process_tree_rss_mb(pid: int) -> Optional[float]:
+    """RSS of pid plus all of its descendants (e.g. uvicorn workers) in MB; None without /proc."""
+    parents = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return None
+    for entry in entries:
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    # The parent pid follows the state, after the parenthesized command name
+                    parents[int(entry)] = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+    tree, frontier = {pid}, [pid]
+    while frontier:
+        parent = frontier.pop()
+        for child, child_parent in parents.items():
+            if child_parent == parent and child not in tree:
+                tree.add(child)
+                frontier.append(child)
+    total = 0
+    for member in tree:
+        try:
+            with open(f"/proc/{member}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+    return total / 1024 if total else None
+
+
+class RSSSampler(threading.Thread):
+    """Sample a server's RSS every `interval` seconds until stopped."""
+
+    def __init__(self, pid: Optional[int], interval: float = 0.5):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.samples: List[List[float]] = []
+        self._done = threading.Event()
+        self._started_at = time.perf_counter()
+
+    def run(self) -> None:
+        while True:
+            self.sample()
+            if self._done.wait(self.interval):
+                break
+
+    def sample(self) -> None:
+        rss = process_tree_rss_mb(self.pid) if self.pid else None
+        if rss is not None:
+            self.samples.append([round(time.perf_counter() - self._started_at, 2), round(rss, 1)])
+
+    def stop(self) -> Dict:
+        """Stop sampling and return start/peak/end RSS plus the [seconds, MB] samples."""
+        self._done.set()
+        self.join()
+        self.sample()
+        if not self.samples:
+            return {}
+        values = [mb for _, mb in self.samples]
+        return {"start": values[0], "peak": max(values), "end": values[-1], "samples": self.samples}
+
+
+# ============================================
+# Load generation
+# ============================================
+
+class Payload(NamedTuple):
+    """One entry of the request mix."""
+    endpoint: str
+    path: str
+    size: int
+    strategy: str
+    body: bytes
+
+
+class Sample(NamedTuple):
+    """One completed request."""
+    payload: Payload
+    status: str                         # HTTP status code, or the exception name
+    latency: float                      # seconds
+
+
+def build_mix(sizes: List[int], strategies: List[str], endpoints: List[str], seed: int = 0) -> List[Payload]:
+    """Every (endpoint, size, strategy) combination, with the request body prebuilt."""
+    mix = []
+    for size in sizes:
+        tasks = generate_tasks(size, seed)
+        if tasks:
+            tasks[0]["title"] = _NONCE.decode()
+        for strategy in strategies:
+            body = json.dumps({"tasks": tasks, "strategy": strategy}).encode()
+            for endpoint in endpoints:
+                mix.append(Payload(endpoint, ENDPOINTS[endpoint], size, strategy, body))
+    return mix
+
+
+def run_level(url: str, mix: List[Payload], concurrency: int, duration: float,
+              max_requests: Optional[int] = None, cached: bool = False, timeout: float = 60,
+              seed: int = 0) -> Tuple[List[Sample], float]:
+    """
+    Drive the server with `concurrency` closed-loop clients.
+
+    Each client sends a random entry of the mix, waits for the full response and
+    immediately sends the next, over a keep-alive connection where the server
+    allows it. The level ends after `duration` seconds or `max_requests` requests.
+
+    Returns:
+        (samples, elapsed seconds)
+    """
+    parts = urlsplit(url)
+    issued = itertools.count()
+    nonces = itertools.count()
+    samples: List[Sample] = []
+    deadline = time.perf_counter() + duration
+
+    def client(worker: int) -> None:
+        rng = random.Random(seed * 1000 + worker)
+        connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=timeout)
+        headers = {"Content-Type": "application/json"}
+        while time.perf_counter() < deadline and (max_requests is None or next(issued) < max_requests):
+            payload = mix[rng.randrange(len(mix))]
+            body = payload.body if cached else payload.body.replace(_NONCE, str(next(nonces)).encode(), 1)
+            start = time.perf_counter()
+            try:
+                connection.request("POST", payload.path, body, headers)
+                response = connection.getresponse()
+                response.read()
+                status = str(response.status)
+            except (OSError, http.client.HTTPException) as e:
+                status = type(e).__name__
+                connection.close()
+            samples.append(Sample(payload, status, time.perf_counter() - start))
+        connection.close()
+
+    threads = [threading.Thread(target=client, args=(worker,), daemon=True) for worker in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - started
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(samples: List[Sample], elapsed: float) -> Dict:
+    """Throughput, latency percentiles (ms), error rate and status counts of samples."""
+    latencies = sorted(sample.latency * 1000 for sample in samples)
+    errors = sum(1 for sample in samples if not sample.status.startswith("2"))
+    status: Dict[str, int] = {}
+    for sample in samples:
+        status[sample.status] = status.get(sample.status, 0) + 1
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(latencies[-1], 2) if latencies else 0.0,
+        },
+        "status": dict(sorted(status.items())),
+    }
+
+
+def level_report(concurrency: int, samples: List[Sample], elapsed: float, rss: Dict) -> Dict:
+    """Summary of one concurrency level, overall and per endpoint and payload size."""
+    report = {"concurrency": concurrency, "duration_s": round(elapsed, 2), **summarize(samples, elapsed)}
+    for key, group in (("endpoints", "endpoint"), ("sizes", "size")):
+        values = sorted({getattr(sample.payload, group) for sample in samples})
+        report[key] = {
+            str(value): summarize([s for s in samples if getattr(s.payload, group) == value], elapsed)
+            for value in values
+        }
+    report["rss_mb"] = rss
+    return report
+
+
+# ============================================
+# Regression comparison
+# ============================================
+
+def compare(levels: List[Dict], baseline: List[Dict], threshold: float) -> List[Dict]:
+    """
+    Compare p95 latency per concurrency level and endpoint with a baseline run.
+
+    A row is a regression when p95 grew by more than `threshold`, or when
+    requests failed that did not fail in the baseline.
+    """
+    previous = {level["concurrency"]: level for level in baseline}
+    rows = []
+    for level in levels:
+        old_level = previous.get(level["concurrency"])
+        if old_level is None:
+            continue
+        for endpoint, stats in level["endpoints"].items():
+            old = old_level["endpoints"].get(endpoint)
+            if old is None or not old["latency_ms"]["p95"]:
+                continue
+            ratio = stats["latency_ms"]["p95"] / old["latency_ms"]["p95"]
+            rows.append({
+                "benchmark": f"{endpoint}@{level['concurrency']}",
+                "p95_ratio": round(ratio, 3),
+                "error_rate": stats["error_rate"],
+                "regression": ratio > threshold or stats["error_rate"] > old["error_rate"],
+            })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--server", choices=SERVERS, default="wsgiref", help="Local server to boot (default: wsgiref)")
+    parser.add_argument("--url", help="Load-test a running server instead of booting one")
+    parser.add_argument("--pid", type=int, help="With --url: process whose RSS (with its children) is sampled")
+    parser.add_argument("--settings", default="settings", help="DJANGO_SETTINGS_MODULE for a booted server")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, help="Port for a booted server (default: any free port)")
+    parser.add_argument("--endpoints", nargs="+", choices=sorted(ENDPOINTS), default=sorted(ENDPOINTS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="Tasks per request")
+    parser.add_argument("--strategies", nargs="+", default=["smart"])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16], help="Concurrent clients per level")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per concurrency level")
+    parser.add_argument("--requests", type=int, help="Stop a level after this many requests")
+    parser.add_argument("--warmup", type=float, default=2, help="Unmeasured seconds before the first level")
+    parser.add_argument("--cached", action="store_true", help="Send identical bodies, so the result cache answers")
+    parser.add_argument("--timeout", type=float, default=60, help="Per-request timeout in seconds")
+    parser.add_argument("--rss-interval", type=float, default=0.5, help="Seconds between RSS samples")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="p95 slowdown ratio reported as a regression (default 1.2)")
+    parser.add_argument("--serve", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        _serve(args.serve, args.port)
+        return 0
+
+    mix = build_mix(args.sizes, args.strategies, args.endpoints, args.seed)
+    process = None
+    if args.url:
+        url, pid = args.url.rstrip("/"), args.pid
+    else:
+        try:
+            process, url = start_server(args.server, args.settings, args.port, args.workers)
+        except RuntimeError as e:
+            print(f"bench_load.py: error: {e}", file=sys.stderr)
+            return 1
+        pid = process.pid
+    try:
+        if args.warmup > 0:
+            run_level(url, mix, 1, args.warmup, cached=args.cached, timeout=args.timeout, seed=args.seed)
+        levels = []
+        for concurrency in args.concurrency:
+            sampler = RSSSampler(pid, args.rss_interval)
+            sampler.start()
+            samples, elapsed = run_level(url, mix, concurrency, args.duration, args.requests,
+                                         args.cached, args.timeout, args.seed)
+            level = level_report(concurrency, samples, elapsed, sampler.stop())
+            latency = level["latency_ms"]
+            print(
+                f"c={concurrency:<4d} {level['throughput_rps']:8.1f} req/s  p50 {latency['p50']:8.1f} ms  "
+                f"p95 {latency['p95']:8.1f} ms  p99 {latency['p99']:8.1f} ms  errors {level['error_rate']:.1%}  "
+                f"peak RSS {level['rss_mb'].get('peak', 'n/a')} MB",
+                file=sys.stderr,
+            )
+            levels.append(level)
+    finally:
+        if process is not None:
+            stop_server(process)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "server": "external" if args.url else args.server,
+            "settings": None if args.url else args.settings,
+            "workers": args.workers if args.server == "uvicorn" and not args.url else None,
+            "endpoints": args.endpoints,
+            "sizes": args.sizes,
+            "strategies": args.strategies,
+            "cached": args.cached,
+            "seed": args.seed,
+        },
+        "levels": levels,
+    }
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        mix_keys = ("endpoints", "sizes", "strategies", "cached")
+        if any(baseline["meta"].get(key) != report["meta"][key] for key in mix_keys):
+            print("warning: the baseline used a different request mix", file=sys.stderr)
+        report["comparison"] = compare(levels, baseline["levels"], args.threshold)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if any(row["regression"] for row in report.get("comparison", [])):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
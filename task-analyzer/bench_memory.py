@@ -0,0 +1,77 @@
+"""Memory benchmark: bytes per scored task for task dicts vs compact Task records.
+
+The dict side is score_tasks' output: every task dict, with its title, description
+and due date, stays in memory. The record side is the NDJSON analyze path: each raw
+line goes to a spool file and only the Task record (locating the line) is kept, so
+its in-memory size is reported together with the spool bytes it depends on.
+
+Usage:
+    python bench_memory.py                # 1,000,000 synthetic tasks
+    python bench_memory.py --tasks 100000 --output memory.json
+"""
+import argparse
+import gc
+import json
+import tempfile
+import tracemalloc
+
+from bench_tasks import generate_tasks
+from scoring import score_tasks, rank_records
+from streaming import read_ndjson_tasks
+
+
+def _measure(build, count):
+    """Return (retained, peak) bytes per task for the structure produced by build()."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    gc.collect()
+    return current / count, peak / count
+
+
+def run(count, seed=0):
+    def scored_dicts():
+        return score_tasks(generate_tasks(count, seed))
+
+    def scored_records():
+        lines = (json.dumps(task).encode() + b"\n" for task in generate_tasks(count, seed))
+        return rank_records(read_ndjson_tasks(lines, spool))
+
+    dict_retained, dict_peak = _measure(scored_dicts, count)
+    # An on-disk spool (the request path rolls to disk past SPOOL_MAX_MEMORY), so its
+    # bytes are counted separately rather than by tracemalloc
+    with tempfile.TemporaryFile() as spool:
+        record_retained, record_peak = _measure(scored_records, count)
+        spool_bytes = spool.tell() / count
+    return {
+        "tasks": count,
+        "seed": seed,
+        "dict": {"bytes_per_task": round(dict_retained, 1), "peak_bytes_per_task": round(dict_peak, 1)},
+        "record": {
+            "bytes_per_task": round(record_retained, 1),
+            "peak_bytes_per_task": round(record_peak, 1),
+            "spool_bytes_per_task": round(spool_bytes, 1),
+        },
+        "memory_reduction": round(1 - record_retained / dict_retained, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    args = parser.parse_args()
+
+    result = json.dumps(run(args.tasks, args.seed), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(result + "\n")
+    print(result)
+
+
+if __name__ == "__main__":
+    main()
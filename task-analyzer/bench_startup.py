@@ -0,0 +1,119 @@
+"""Startup benchmark: cold-start time and memory of a fresh worker, per settings module.
+
+Each run spawns a new interpreter that boots Django behind the WSGI handler (as a
+server worker would), then answers one POST /api/tasks/analyze/ with tasks.json.
+
+Usage:
+    python bench_startup.py                                   # settings vs settings_api
+    python bench_startup.py --settings settings_api --repeat 10 --output startup.json
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _rss_mb() -> float:
+    """Current resident set size in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _child(settings_module: str) -> None:
+    """Boot one worker, serve one request and print the measurements as JSON."""
+    start = time.perf_counter()
+    os.environ["DJANGO_SETTINGS_MODULE"] = settings_module
+    sys.path.insert(0, BASE_DIR)
+
+    from django.core.wsgi import get_wsgi_application
+    from django.urls import get_resolver
+    application = get_wsgi_application()
+    get_resolver().url_patterns  # Servers import the URLconf lazily; count it as boot
+    boot = time.perf_counter() - start
+    rss_boot = _rss_mb()
+
+    with open(os.path.join(BASE_DIR, "tasks.json"), "rb") as f:
+        body = f.read()
+    environ = {
+        "REQUEST_METHOD": "POST",
+        "PATH_INFO": "/api/tasks/analyze/",
+        "CONTENT_TYPE": "application/json",
+        "CONTENT_LENGTH": str(len(body)),
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "8000",
+        "HTTP_HOST": "localhost",
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+    }
+    statuses = []
+    response = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    b"".join(response)
+    first_response = time.perf_counter() - start
+
+    print(json.dumps({
+        "status": statuses[0],
+        "boot_ms": boot * 1000,
+        "first_response_ms": first_response * 1000,
+        "rss_boot_mb": rss_boot,
+        "rss_first_response_mb": _rss_mb(),
+        "modules": len(sys.modules),
+    }))
+
+
+def run(settings_module: str, repeat: int = 5) -> dict:
+    """Spawn `repeat` cold workers and return the median of each measurement."""
+    samples = []
+    for _ in range(repeat):
+        spawned = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", settings_module],
+            check=True, capture_output=True, text=True, cwd=BASE_DIR,
+        ).stdout
+        sample = json.loads(output.strip().splitlines()[-1])
+        if not sample.pop("status").startswith("200"):
+            raise RuntimeError(f"First request failed under {settings_module}")
+        sample["process_ms"] = (time.perf_counter() - spawned) * 1000
+        samples.append(sample)
+    return {
+        "settings": settings_module,
+        "repeat": repeat,
+        **{name: round(statistics.median(s[name] for s in samples), 1) for name in samples[0]},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--settings", nargs="+", default=["settings", "settings_api"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child)
+        return
+
+    result = json.dumps([run(module, args.repeat) for module in args.settings], indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(result + "\n")
+    print(result)
+
+
+if __name__ == "__main__":
+    main()
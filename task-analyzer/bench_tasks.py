@@ -0,0 +1,288 @@
+"""Benchmark harness for scoring, urgency, cycle detection and the API views.
+
+Synthetic portfolios are generated from a seed, so runs are reproducible and
+results can be diffed against an earlier run.
+
+Usage:
+    python bench_tasks.py                                # sizes 100..100k
+    python bench_tasks.py --sizes 100 1000 1000000 --output bench.json
+    python bench_tasks.py --only score --compare baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+import scoring
+from scoring import score_tasks, detect_cycles
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+STRATEGIES = ("smart", "urgency", "effort", "importance", "unblocker")
+DUE_SPREADS = ("none", "near", "wide", "mixed")
+GRAPH_SHAPES = ("none", "chain", "dag", "cycles")
+
+
+# ============================================
+# Synthetic task generators
+# ============================================
+
+def _due_date(rng: random.Random, spread: str, today: date) -> Optional[str]:
+    """Pick a due date for the given spread."""
+    if spread == "none":
+        return None
+    if spread == "near":
+        offset = rng.randint(-7, 14)
+    elif spread == "wide":
+        offset = rng.randint(-30, 3650)
+    else:  # mixed: near and far dates, missing and malformed values
+        roll = rng.random()
+        if roll < 0.1:
+            return None
+        if roll < 0.12:
+            return "not-a-date"
+        offset = rng.randint(-14, 30) if roll < 0.6 else rng.randint(31, 1500)
+    return (today + timedelta(days=offset)).strftime("%Y-%m-%d")
+
+
+def _dependencies(rng: random.Random, shape: str, i: int, n: int) -> List[str]:
+    """Pick dependency ids for task i of n in the given graph shape."""
+    if shape == "none" or n < 2:
+        return []
+    if shape == "chain":
+        return [f"t{i - 1}"] if i else []
+    if shape == "dag":
+        # Up to three edges to earlier tasks: acyclic by construction
+        if not i:
+            return []
+        return [f"t{rng.randrange(i)}" for _ in range(rng.randint(0, min(3, i)))]
+    # cycles: rings of 10 tasks plus random cross edges, so most tasks sit on a cycle
+    group_start = i - i % 10
+    group_end = min(group_start + 10, n)
+    deps = [f"t{group_start + (i - group_start + 1) % (group_end - group_start)}"]
+    if rng.random() < 0.3:
+        deps.append(f"t{rng.randrange(n)}")
+    return deps
+
+
+def generate_tasks(n: int, seed: int = 0, due_spread: str = "mixed", graph: str = "dag",
+                   today: Optional[date] = None) -> List[Dict]:
+    """
+    Generate n task dicts shaped like API payloads.
+
+    Args:
+        n: Number of tasks
+        seed: RNG seed; the same arguments always produce the same tasks
+        due_spread: One of DUE_SPREADS
+        graph: Dependency-graph shape, one of GRAPH_SHAPES
+
+    Returns:
+        List of task dictionaries with ids t0..t{n-1}
+    """
+    rng = random.Random(seed)
+    today = today or datetime.now().date()
+    return [
+        {
+            "id": f"t{i}",
+            "title": f"Synthetic task {i}",
+            "priority": rng.randint(1, 10),
+            "effort": rng.randint(1, 10),
+            "due_date": _due_date(rng, due_spread, today),
+            "dependencies": _dependencies(rng, graph, i, n),
+        }
+        for i in range(n)
+    ]
+
+
+# ============================================
+# Timing
+# ============================================
+
+def _timeit(setup: Callable, run: Callable, repeat: int) -> Dict:
+    """Time run(setup()) `repeat` times; setup is excluded from the measurement."""
+    timings = []
+    for _ in range(repeat):
+        arg = setup()
+        start = time.perf_counter()
+        run(arg)
+        timings.append(time.perf_counter() - start)
+    return {
+        "best_s": min(timings),
+        "mean_s": sum(timings) / len(timings),
+        "runs": len(timings),
+    }
+
+
+def bench_score(sizes, seed, repeat):
+    for size in sizes:
+        for strategy in STRATEGIES:
+            stats = _timeit(
+                lambda: generate_tasks(size, seed),
+                lambda tasks: score_tasks(tasks, strategy=strategy),
+                repeat,
+            )
+            yield {"name": "score_tasks", "size": size, "params": {"strategy": strategy}, **stats}
+
+
+def bench_urgency(sizes, seed, repeat):
+    today = datetime.now().date()
+    for size in sizes:
+        for spread in DUE_SPREADS:
+            due_dates = [t["due_date"] for t in generate_tasks(size, seed, due_spread=spread, graph="none")]
+
+            def run(cold):
+                if cold:
+                    scoring._urgency_for.cache_clear()
+                for due in due_dates:
+                    scoring._calculate_urgency(due, today)
+
+            for cold in (True, False):
+                stats = _timeit(lambda: cold, run, repeat)
+                yield {
+                    "name": "_calculate_urgency", "size": size,
+                    "params": {"due_spread": spread, "cache": "cold" if cold else "warm"}, **stats,
+                }
+
+
+def bench_cycles(sizes, seed, repeat):
+    for size in sizes:
+        for shape in GRAPH_SHAPES:
+            tasks = generate_tasks(size, seed, graph=shape)
+            stats = _timeit(lambda: tasks, detect_cycles, repeat)
+            yield {"name": "detect_cycles", "size": size, "params": {"graph": shape}, **stats}
+
+
+def bench_views(sizes, seed, repeat):
+    try:
+        import django
+    except ImportError:
+        print("Django not installed; skipping view benchmarks", file=sys.stderr)
+        return
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings")
+    django.setup()
+    from django.test import Client, override_settings
+    import views
+    from result_cache import cache_from_settings
+
+    client = Client()
+    # Large bodies exceed DATA_UPLOAD_MAX_MEMORY_SIZE (2.5 MB, ~18k tasks), and repeats
+    # of one body would be answered by the result cache; both would hide the view's cost
+    with override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=None):
+        cache, views._result_cache = views._result_cache, cache_from_settings({"ENABLED": False})
+        try:
+            for size in sizes:
+                body = json.dumps({"tasks": generate_tasks(size, seed), "strategy": "smart"})
+                for name, path in (("view:analyze", "/api/tasks/analyze/"), ("view:suggest", "/api/tasks/suggest/")):
+                    result = {"name": name, "size": size, "params": {"strategy": "smart"}}
+                    try:
+                        stats = _timeit(
+                            lambda: body,
+                            lambda data: _check(client.post(path, data=data, content_type="application/json")),
+                            repeat,
+                        )
+                    except RuntimeError as e:
+                        yield {**result, "error": str(e)}
+                    else:
+                        yield {**result, **stats}
+        finally:
+            views._result_cache = cache
+
+
+def _check(response):
+    if response.status_code != 200:
+        raise RuntimeError(f"View returned HTTP {response.status_code}: {response.content[:200]!r}")
+    # Drain streaming responses so serialization is part of the measurement
+    if getattr(response, "streaming", False):
+        b"".join(response.streaming_content)
+    return response
+
+
+BENCHMARKS = {
+    "score": bench_score,
+    "urgency": bench_urgency,
+    "cycles": bench_cycles,
+    "views": bench_views,
+}
+
+
+# ============================================
+# Regression comparison
+# ============================================
+
+def _key(result: Dict) -> str:
+    params = ",".join(f"{k}={v}" for k, v in sorted(result["params"].items()))
+    return f"{result['name']}[{params}]@{result['size']}"
+
+
+def compare(results: List[Dict], baseline: List[Dict], threshold: float) -> List[Dict]:
+    """Return one row per benchmark present in both runs, flagging slowdowns above threshold."""
+    previous = {_key(r): r for r in baseline}
+    rows = []
+    for result in results:
+        old = previous.get(_key(result))
+        if old is None or not old.get("best_s") or "best_s" not in result:
+            continue  # New, or failed in either run
+        ratio = result["best_s"] / old["best_s"]
+        rows.append({"benchmark": _key(result), "ratio": round(ratio, 3), "regression": ratio > threshold})
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark task scoring at realistic scales")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--view-max-size", type=int, default=100000,
+                        help="Skip view benchmarks above this many tasks")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), default=sorted(BENCHMARKS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--compare", help="Baseline JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="Slowdown ratio reported as a regression (default 1.2)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.only:
+        sizes = args.sizes
+        if name == "views":
+            sizes = [s for s in sizes if s <= args.view_max_size]
+        for result in BENCHMARKS[name](sizes, args.seed, args.repeat):
+            if "error" in result:
+                print(f"{_key(result):70s} FAILED {result['error']}", file=sys.stderr)
+            else:
+                print(f"{_key(result):70s} best {result['best_s'] * 1000:10.2f} ms", file=sys.stderr)
+            results.append(result)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.compare:
+        with open(args.compare) as f:
+            report["comparison"] = compare(results, json.load(f)["results"], args.threshold)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if any(row["regression"] for row in report.get("comparison", [])) or any("error" in r for r in results):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Analyze many independent task sets (one per team or portfolio) in one call."""
+from concurrent.futures import Executor, Future
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+import scoring
+from scoring import analyze_dependencies, score_tasks
+
+
+def analyze_task_set(tasks: List[Dict], strategy: str = "smart", today: Optional[date] = None) -> Dict:
+    """
+    Score one task set and describe its dependency graph.
+
+    Args:
+        tasks: List of task dictionaries
+        strategy: Scoring strategy (see score_tasks)
+        today: Reference date for urgency (defaults to the current date)
+
+    Returns:
+        The same body /api/tasks/analyze/ returns: tasks, cycle_detected,
+        cycles and dangling_dependencies
+    """
+    dependency_graph = analyze_dependencies(tasks)
+    return {
+        "tasks": score_tasks(tasks, strategy=strategy, today=today),
+        "cycle_detected": bool(dependency_graph.cycles),
+        "cycles": dependency_graph.cycles,
+        "dangling_dependencies": dependency_graph.dangling,
+    }
+
+
+def analyze_task_sets(sets: List[Tuple[List[Dict], str]], today: Optional[date] = None,
+                      parallel: bool = False, workers: Optional[int] = None,
+                      executor: Optional[Executor] = None) -> List[Dict]:
+    """
+    Analyze independent task sets, isolating failures to the set that caused them.
+
+    Every set is scored against the same reference date, so the memoized
+    urgency lookups computed for one set are reused by all the others.
+
+    Args:
+        sets: (tasks, strategy) pairs
+        today: Reference date shared by all sets (defaults to the current date)
+        parallel: Spread the sets over the process pool (see parallel.get_pool)
+        workers: Pool size when parallel is set (defaults to the CPU count)
+        executor: Executor to use instead of the persistent pool
+
+    Returns:
+        One result per set, in input order: an analyze body, or
+        {"error": ..., "details": ...} if that set failed to score
+    """
+    today = today or datetime.now().date()
+    if not (parallel or executor) or len(sets) < 2:
+        return [_analyze_isolated(tasks, strategy, today) for tasks, strategy in sets]
+
+    # Imported here so serial-only workers never load the process-pool machinery
+    from parallel import get_pool
+    holidays = scoring.get_holidays()
+    pool = executor or get_pool(workers)
+    futures = [
+        pool.submit(_analyze_in_worker, tasks, strategy, today, holidays)
+        for tasks, strategy in sets
+    ]
+    return [_collect(future) for future in futures]
+
+
+def _analyze_isolated(tasks: List[Dict], strategy: str, today: date) -> Dict:
+    """Analyze one set, turning a scoring failure into a per-set error."""
+    try:
+        return analyze_task_set(tasks, strategy, today)
+    except Exception as e:
+        return _set_error(e)
+
+
+def _collect(future: Future) -> Dict:
+    """Wait for one set; a set that cannot be sent to or run by a worker fails alone."""
+    try:
+        return future.result()
+    except Exception as e:
+        return _set_error(e)
+
+
+def _set_error(error: Exception) -> Dict:
+    return {"error": "Scoring failed", "details": str(error)}
+
+
+def _analyze_in_worker(tasks: List[Dict], strategy: str, today: date, holidays: Tuple) -> Dict:
+    """Worker: analyze one set with the parent's holiday calendar."""
+    from parallel import _sync_holidays
+    _sync_holidays(holidays)
+    return _analyze_isolated(tasks, strategy, today)
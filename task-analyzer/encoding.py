@@ -0,0 +1,117 @@
+"""Request-body decoding: gzip bodies and the compact columnar task encoding."""
+import zlib
+from typing import Dict, Iterable, Iterator, List
+
+# Refuse compressed bodies that inflate beyond this many bytes
+MAX_DECOMPRESSED_SIZE = 64 * 1024 * 1024
+
+_READ_SIZE = 64 * 1024
+
+
+class EncodingError(ValueError):
+    """Raised when a request body cannot be decoded."""
+
+
+def is_gzip(content_encoding: str) -> bool:
+    """Return True for a gzip Content-Encoding header value."""
+    return (content_encoding or "").strip().lower() in ("gzip", "x-gzip")
+
+
+def gunzip(body: bytes, max_size: int = MAX_DECOMPRESSED_SIZE) -> bytes:
+    """
+    Decompress a gzip request body.
+
+    Args:
+        body: Compressed bytes
+        max_size: Largest decompressed size accepted
+
+    Returns:
+        The decompressed bytes
+
+    Raises:
+        EncodingError: if the body is not valid gzip or inflates beyond max_size
+    """
+    return b"".join(_inflate([body], max_size))
+
+
+def iter_gunzip_lines(stream, max_size: int = MAX_DECOMPRESSED_SIZE) -> Iterator[bytes]:
+    """
+    Yield the lines of a gzip-compressed stream without inflating it all at once.
+
+    Args:
+        stream: Binary file-like object with read() (e.g. a Django request)
+        max_size: Largest total decompressed size accepted
+
+    Raises:
+        EncodingError: if the stream is not valid gzip or inflates beyond max_size
+    """
+    chunks = iter(lambda: stream.read(_READ_SIZE), b"")
+    pending = b""
+    for data in _inflate(chunks, max_size):
+        lines = (pending + data).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + b"\n"
+    if pending:
+        yield pending
+
+
+def _inflate(chunks: Iterable[bytes], max_size: int) -> Iterator[bytes]:
+    """Inflate gzip chunks, never producing more than max_size bytes in total."""
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    remaining = max_size
+    try:
+        for chunk in chunks:
+            while chunk:
+                # Bound each step so a small, highly compressed chunk cannot blow up memory
+                data = decompressor.decompress(chunk, remaining + 1)
+                remaining -= len(data)
+                if remaining < 0:
+                    raise EncodingError(f"Decompressed body exceeds {max_size} bytes")
+                if data:
+                    yield data
+                chunk = decompressor.unconsumed_tail
+        data = decompressor.flush()
+    except zlib.error:
+        raise EncodingError("Invalid gzip body")
+    if len(data) > remaining:
+        raise EncodingError(f"Decompressed body exceeds {max_size} bytes")
+    if not decompressor.eof:
+        raise EncodingError("Truncated gzip body")
+    if data:
+        yield data
+
+
+def decode_columns(columns: Dict) -> List[Dict]:
+    """
+    Expand the columnar task encoding into task dicts.
+
+    `{"id": ["a", "b"], "priority": [8, 3], "due_date": ["2025-01-10", null]}`
+    becomes `[{"id": "a", "priority": 8, "due_date": "2025-01-10"},
+    {"id": "b", "priority": 3}]`. Every column must be a list of the same length;
+    null entries are left out so the scorer's defaults apply.
+
+    Args:
+        columns: Mapping of field name to a list of values, one per task
+
+    Returns:
+        List of task dictionaries
+
+    Raises:
+        EncodingError: if the columns are not equal-length lists
+    """
+    if not isinstance(columns, dict):
+        raise EncodingError("'columns' must be an object of field lists")
+    lengths = set()
+    for name, values in columns.items():
+        if not isinstance(values, list):
+            raise EncodingError(f"Column '{name}' must be a list")
+        lengths.add(len(values))
+    if len(lengths) > 1:
+        raise EncodingError("All columns must have the same length")
+
+    names = list(columns)
+    return [
+        {name: value for name, value in zip(names, row) if value is not None}
+        for row in zip(*(columns[name] for name in names))
+    ]
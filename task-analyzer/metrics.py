@@ -0,0 +1,149 @@
+"""Lightweight stage timers and counters, exported as Server-Timing and Prometheus text."""
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+# Counters always recorded (name -> help text); stage timings are only taken for sampled requests
+COUNTERS = {
+    "requests": "API requests handled, by endpoint",
+    "tasks_scored": "Tasks scored",
+    "dependency_edges": "Dependency edges traversed by cycle detection",
+}
+
+_PREFIX = "task_analyzer_"
+
+_current: ContextVar[Optional["Timings"]] = ContextVar("task_timings", default=None)
+
+
+class Timings:
+    """Stage durations (seconds) collected for one sampled request."""
+
+    __slots__ = ("stages",)
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def server_timing(self) -> str:
+        """Format the stages as a Server-Timing header value (durations in ms)."""
+        return ", ".join(f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.stages.items())
+
+
+class Registry:
+    """Process-wide stage summaries and labelled counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, list] = {}
+        self._counters: Dict[Tuple[str, Tuple], float] = {}
+
+    def observe(self, stage_name: str, seconds: float) -> None:
+        with self._lock:
+            totals = self._stages.setdefault(stage_name, [0.0, 0])
+            totals[0] += seconds
+            totals[1] += 1
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def render(self, extra: Iterable[Tuple[str, str, str, float]] = ()) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Args:
+            extra: (name, type, help, value) samples owned by other components,
+                e.g. the result cache's hit and miss counts
+
+        Returns:
+            The exposition text, ending with a newline
+        """
+        with self._lock:
+            stages = {name: tuple(totals) for name, totals in self._stages.items()}
+            counters = dict(self._counters)
+
+        lines = [
+            f"# HELP {_PREFIX}stage_seconds Time spent per stage in sampled requests",
+            f"# TYPE {_PREFIX}stage_seconds summary",
+        ]
+        for name, (total, count) in sorted(stages.items()):
+            lines.append(f'{_PREFIX}stage_seconds_sum{{stage="{name}"}} {total:.6f}')
+            lines.append(f'{_PREFIX}stage_seconds_count{{stage="{name}"}} {count}')
+
+        for counter, help_text in COUNTERS.items():
+            lines.append(f"# HELP {_PREFIX}{counter}_total {help_text}")
+            lines.append(f"# TYPE {_PREFIX}{counter}_total counter")
+            for (name, labels), value in sorted(counters.items()):
+                if name == counter:
+                    lines.append(f"{_PREFIX}{counter}_total{_labels(labels)} {value:g}")
+
+        for name, metric_type, help_text, value in extra:
+            lines.append(f"# HELP {_PREFIX}{name} {help_text}")
+            lines.append(f"# TYPE {_PREFIX}{name} {metric_type}")
+            lines.append(f"{_PREFIX}{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: Tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+REGISTRY = Registry()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block as stage `name` of the current request; a no-op when it is not sampled."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        timings.add(name, elapsed)
+        REGISTRY.observe(name, elapsed)
+
+
+def active() -> bool:
+    """Return True while timings are being collected for the current request."""
+    return _current.get() is not None
+
+
+def count(name: str, value: float = 1, **labels) -> None:
+    """Increment one of the COUNTERS."""
+    REGISTRY.inc(name, value, **labels)
+
+
+def sampled(rate: float) -> bool:
+    """Decide whether to time a request, given a sampling rate between 0 and 1."""
+    return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+@contextmanager
+def collect(enabled: bool = True) -> Iterator[Optional[Timings]]:
+    """Collect stage timings for the enclosed request; yields None when not enabled."""
+    if not enabled:
+        yield None
+        return
+    timings = Timings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
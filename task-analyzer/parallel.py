@@ -0,0 +1,143 @@
+"""Multi-core batch scoring for very large portfolios."""
+import heapq
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import metrics
+import scoring
+from scoring import Schedule, Task, _as_records, _unlocks_for_records, score_record, score_tasks
+from strategies import Strategy, resolve as resolve_strategy
+
+# Below this many tasks the pool's pickling overhead outweighs the extra cores
+MIN_PARALLEL_TASKS = 20000
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def get_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Return the persistent worker pool, (re)creating it for a different size."""
+    global _pool, _pool_workers
+    workers = workers or os.cpu_count() or 1
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers)
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """Stop the persistent worker pool, if one was started."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = None
+        _pool_workers = 0
+
+
+def score_tasks_parallel(tasks: List[Dict], strategy: str = "smart", workers: Optional[int] = None,
+                         chunk_size: Optional[int] = None, executor: Optional[Executor] = None,
+                         min_tasks: int = MIN_PARALLEL_TASKS, schedule: Optional[Schedule] = None) -> List[Dict]:
+    """
+    Score tasks across processes; the result is identical to score_tasks.
+
+    The task-set normalizers (max priority, effort and unlocks) are computed once
+    in the calling process. Workers receive only the per-task fields they need,
+    return chunks already sorted by (-raw_score, index), and the chunks are
+    combined with a k-way heap merge rather than a global re-sort.
+
+    Args:
+        tasks: List of task dictionaries
+        strategy: Scoring strategy (see score_tasks)
+        workers: Worker processes (defaults to the CPU count)
+        chunk_size: Tasks per submitted chunk (defaults to an even split over 4x workers)
+        executor: Executor to use instead of the persistent pool
+        min_tasks: Inputs smaller than this are scored serially
+        schedule: compute_schedule result, for the smart strategy's critical-path boost
+
+    Returns:
+        List of tasks with score and components, best first
+    """
+    workers = workers or os.cpu_count() or 1
+    if len(tasks) < min_tasks or (workers == 1 and executor is None):
+        return score_tasks(tasks, strategy=strategy, schedule=schedule)
+
+    ranked = rank_records_parallel(_as_records(tasks), strategy, workers, chunk_size, executor, schedule)
+    return [record.write_to(record.source) for record in ranked]
+
+
+def rank_records_parallel(records: List[Task], strategy: str = "smart", workers: Optional[int] = None,
+                          chunk_size: Optional[int] = None, executor: Optional[Executor] = None,
+                          schedule: Optional[Schedule] = None) -> List[Task]:
+    """
+    Score records across processes and return them best first, like scoring.rank_records.
+
+    Records must be numbered 0..n-1 in list order (as Task.from_dict callers do);
+    their sources never leave this process. See score_tasks_parallel for the
+    arguments.
+    """
+    workers = workers or os.cpu_count() or 1
+    if not records:
+        return []
+    unlocks = _unlocks_for_records(records)
+    normalizers = (
+        max(r.priority for r in records),
+        max(r.effort for r in records),
+        max(unlocks),
+        datetime.now().date(),
+        scoring.get_holidays(),
+    )
+
+    # Resolved once here; workers receive the Strategy (see Strategy.__reduce__)
+    strategy = resolve_strategy(strategy)
+    critical = set(schedule.critical) if schedule is not None and strategy.critical_path_boost else ()
+    rows = [(r.index, r.priority, r.effort, r.due_date, u, r.id in critical) for r, u in zip(records, unlocks)]
+    chunk_size = chunk_size or max(1, -(-len(rows) // (workers * 4)))
+    pool = executor or get_pool(workers)
+    futures = [
+        pool.submit(_score_chunk, rows[start:start + chunk_size], normalizers, strategy)
+        for start in range(0, len(rows), chunk_size)
+    ]
+
+    ranked = []
+    for neg_score, index, urgency, importance_norm, effort_norm, dependency_norm in heapq.merge(
+        *(future.result() for future in futures)
+    ):
+        record = records[index]
+        record.raw_score = -neg_score
+        record.urgency = urgency
+        record.importance_norm = importance_norm
+        record.effort_norm = effort_norm
+        record.dependency_norm = dependency_norm
+        ranked.append(record)
+    metrics.count("tasks_scored", len(ranked))
+    return ranked
+
+
+def _score_chunk(rows: List[Tuple], normalizers: Tuple, strategy: Strategy) -> List[Tuple]:
+    """Worker: score one chunk and return it sorted by (-raw_score, index)."""
+    max_priority, max_effort, max_unlocks, today, holidays = normalizers
+    _sync_holidays(holidays)
+    scored = []
+    for index, priority, effort, due_date, unlock_count, critical in rows:
+        record = Task(index, None, priority, effort, due_date)
+        score_record(record, unlock_count, max_priority, max_effort, max_unlocks, today, strategy, critical)
+        scored.append((
+            -record.raw_score, index,
+            record.urgency, record.importance_norm, record.effort_norm, record.dependency_norm,
+        ))
+    scored.sort()
+    return scored
+
+
+def _sync_holidays(holidays: Tuple) -> None:
+    """Worker: adopt the parent's holiday calendar if it changed since the fork."""
+    if scoring.get_holidays() != holidays:
+        scoring.set_holidays(holidays)
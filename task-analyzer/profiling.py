@@ -0,0 +1,254 @@
+"""Opt-in per-request profiling: cProfile stats and tracemalloc snapshots saved to disk."""
+import cProfile
+import hmac
+import json
+import os
+import pstats
+import re
+import shutil
+import threading
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Files of one capture directory
+STATS_FILE = "profile.pstats"
+SNAPSHOT_FILE = "allocations.snapshot"
+META_FILE = "meta.json"
+
+_CAPTURE_ID = re.compile(r"^\d{8}-\d{12}-[0-9a-f]{8}$")
+
+# Allocations made by the profiler itself are left out of snapshots
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class Profiler:
+    """
+    Profile single requests on demand and keep the newest captures on disk.
+
+    Each capture is a directory holding the cProfile stats (profile.pstats, readable
+    with `python -m pstats`), a tracemalloc snapshot taken when the view returned
+    (allocations.snapshot, see tracemalloc.Snapshot.load) and meta.json with the
+    timing, the tracemalloc peak and the payload's size and shape. Request bodies
+    are never stored.
+
+    A token is required when enabled: behind a reverse proxy on the same host every
+    client connects from 127.0.0.1, so the address check alone trusts everyone.
+
+    Only one request is profiled at a time; a request asking while another capture
+    runs is served unprofiled. tracemalloc is process-wide, so allocations made
+    concurrently by other requests are included in the peak.
+    """
+
+    def __init__(self, directory: str, enabled: bool = False, trusted_ips: Iterable[str] = ("127.0.0.1", "::1"),
+                 token: Optional[str] = None, max_captures: int = 50, frames: int = 1):
+        if enabled and not token:
+            raise ValueError("Profiling needs a token (TASK_PROFILING['TOKEN']) when enabled")
+        self.directory = str(directory)
+        self.enabled = enabled
+        self.trusted_ips = frozenset(trusted_ips)
+        self.token = token
+        self.max_captures = max_captures
+        self.frames = frames
+        self._busy = threading.Lock()
+
+    def trusted(self, meta: Mapping) -> bool:
+        """Whether a caller (request.META) may trigger captures and read them."""
+        if not self.token or meta.get("REMOTE_ADDR") not in self.trusted_ips:
+            return False
+        return hmac.compare_digest(meta.get("HTTP_X_PROFILE_TOKEN", "").encode(), self.token.encode())
+
+    def wanted(self, meta: Mapping, query: Mapping) -> bool:
+        """Whether to profile a request: enabled, asked for (X-Profile: 1 or ?debug=profile) and trusted."""
+        if not self.enabled:
+            return False
+        if meta.get("HTTP_X_PROFILE") != "1" and query.get("debug") != "profile":
+            return False
+        return self.trusted(meta)
+
+    def capture(self, endpoint: str, run: Callable, metadata: Optional[Dict] = None) -> Tuple[object, Optional[str]]:
+        """
+        Call run() under cProfile and tracemalloc and save the capture.
+
+        Args:
+            endpoint: Name recorded with the capture
+            run: The work to profile, e.g. the view call
+            metadata: Extra JSON-serializable details (payload size and shape, ...)
+
+        Returns:
+            (run's result, capture id); the id is None if another capture was running.
+            If run raises, the capture is still saved with the error, then the
+            exception propagates.
+        """
+        if not self._busy.acquire(blocking=False):
+            return run(), None
+        try:
+            capture_id = f"{datetime.now():%Y%m%d-%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start(self.frames)
+            tracemalloc.reset_peak()
+            profile = cProfile.Profile()
+            error = None
+            result = None
+            start = time.perf_counter()
+            try:
+                profile.enable()
+                try:
+                    result = run()
+                finally:
+                    profile.disable()
+            except BaseException as e:
+                error = repr(e)
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                current, peak = tracemalloc.get_traced_memory()
+                snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+                if started_tracing:
+                    tracemalloc.stop()
+                capture_id = self._save(capture_id, profile, snapshot, {
+                    "id": capture_id,
+                    "endpoint": endpoint,
+                    "timestamp": datetime.now().isoformat(timespec="seconds"),
+                    "duration_ms": round(elapsed * 1000, 3),
+                    "status": getattr(result, "status_code", None),
+                    "error": error,
+                    "tracemalloc_peak_bytes": peak,
+                    "tracemalloc_current_bytes": current,
+                    **(metadata or {}),
+                })
+            return result, capture_id
+        finally:
+            self._busy.release()
+
+    def captures(self, limit: int = 20) -> List[Dict]:
+        """Metadata of the newest captures, newest first."""
+        found = []
+        for capture_id in self._capture_ids()[:max(limit, 0)]:
+            try:
+                with open(os.path.join(self.directory, capture_id, META_FILE)) as f:
+                    found.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return found
+
+    def detail(self, capture_id: str, top: int = 25) -> Optional[Dict]:
+        """
+        Metadata of one capture plus its costliest functions and allocation sites.
+
+        Returns:
+            None for an unknown or malformed id
+        """
+        if not _CAPTURE_ID.match(capture_id):
+            return None
+        path = os.path.join(self.directory, capture_id)
+        try:
+            with open(os.path.join(path, META_FILE)) as f:
+                detail = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        stats = pstats.Stats(os.path.join(path, STATS_FILE))
+        stats.sort_stats("cumulative")
+        detail["functions"] = []
+        for function in stats.fcn_list[:top]:
+            _, calls, own, cumulative, _ = stats.stats[function]
+            filename, line, name = function
+            detail["functions"].append({
+                "function": f"{filename}:{line}({name})",
+                "calls": calls,
+                "tottime_ms": round(own * 1000, 3),
+                "cumtime_ms": round(cumulative * 1000, 3),
+            })
+
+        snapshot = tracemalloc.Snapshot.load(os.path.join(path, SNAPSHOT_FILE))
+        detail["allocations"] = [
+            {
+                "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_bytes": stat.size,
+                "count": stat.count,
+            }
+            for stat in snapshot.statistics("lineno")[:top]
+        ]
+        return detail
+
+    def _save(self, capture_id: str, profile: cProfile.Profile, snapshot: tracemalloc.Snapshot,
+              meta: Dict) -> Optional[str]:
+        """Write a capture and prune the oldest; returns None if it could not be written."""
+        path = os.path.join(self.directory, capture_id)
+        try:
+            os.makedirs(path)
+            profile.dump_stats(os.path.join(path, STATS_FILE))
+            snapshot.dump(os.path.join(path, SNAPSHOT_FILE))
+            # meta.json last: captures() and detail() skip directories without it
+            with open(os.path.join(path, META_FILE), "w") as f:
+                json.dump(meta, f, indent=2, default=str)
+        except OSError:
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+        for stale in self._capture_ids()[self.max_captures:]:
+            shutil.rmtree(os.path.join(self.directory, stale), ignore_errors=True)
+        return capture_id
+
+    def _capture_ids(self) -> List[str]:
+        """Capture directory names, newest first (ids start with their timestamp)."""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return sorted((name for name in names if _CAPTURE_ID.match(name)), reverse=True)
+
+
+def payload_shape(tasks: List) -> Dict:
+    """Size and shape of a task list, for capture metadata (no task contents)."""
+    dependency_counts = []
+    fields = set()
+    ids = set()
+    with_due_date = 0
+    for task in tasks:
+        if not isinstance(task, dict):
+            continue
+        fields.update(task)
+        ids.add(str(task.get("id")))
+        dependencies = task.get("dependencies")
+        dependency_counts.append(len(dependencies) if isinstance(dependencies, list) else 0)
+        if task.get("due_date"):
+            with_due_date += 1
+    return {
+        "tasks": len(tasks),
+        "unique_ids": len(ids),
+        "with_due_date": with_due_date,
+        "dependency_edges": sum(dependency_counts),
+        "max_dependencies": max(dependency_counts, default=0),
+        "fields": sorted(str(field) for field in fields)[:50],
+    }
+
+
+def profiler_from_settings(config: Optional[Dict] = None, base_dir: str = ".") -> Profiler:
+    """
+    Build a Profiler from a TASK_PROFILING-style dict.
+
+    Keys: ENABLED (default False), DIRECTORY (default <base_dir>/profiles),
+    TRUSTED_IPS, TOKEN (required when enabled; sent as X-Profile-Token), MAX_CAPTURES,
+    TRACEMALLOC_FRAMES (stack depth per allocation; each extra frame slows
+    profiled requests noticeably, and the detail view only reports the first).
+
+    Raises:
+        ValueError: if ENABLED is set without a TOKEN
+    """
+    config = config or {}
+    return Profiler(
+        config.get("DIRECTORY") or os.path.join(str(base_dir), "profiles"),
+        enabled=config.get("ENABLED", False),
+        trusted_ips=config.get("TRUSTED_IPS", ("127.0.0.1", "::1")),
+        token=config.get("TOKEN"),
+        max_captures=config.get("MAX_CAPTURES", 50),
+        frames=config.get("TRACEMALLOC_FRAMES", 1),
+    )
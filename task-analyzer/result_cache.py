@@ -0,0 +1,129 @@
+"""Content-addressed cache for analyze/suggest responses."""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional
+
+import scoring
+from serialization import dumps
+
+
+class InProcessBackend:
+    """LRU dict with a per-entry TTL, private to this worker process."""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DjangoCacheBackend:
+    """Store entries in a Django cache alias (locmem, file-based, memcached, ...)."""
+
+    def __init__(self, alias: str = "default", ttl_seconds: float = 300):
+        from django.core.cache import caches
+
+        self.cache = caches[alias]
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.cache.get(key)
+
+    def set(self, key: str, value: bytes) -> None:
+        self.cache.set(key, value, timeout=self.ttl_seconds)
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+
+class ResultCache:
+    """
+    Response cache keyed by a hash of the canonical request content.
+
+    The key covers the task list (serialized with sorted keys, so field order
+    and whitespace do not matter), the strategy, any extra parameters, the
+    current date and the holiday calendar, because urgency depends on both.
+    """
+
+    def __init__(self, backend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key(self, kind: str, tasks, strategy: str, **params) -> str:
+        canonical = dumps(
+            {
+                "kind": kind,
+                "tasks": tasks,
+                "strategy": strategy,
+                "params": params,
+                "today": datetime.now().date().isoformat(),
+                "holidays": [day.isoformat() for day in scoring.get_holidays()],
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return "task-result:" + hashlib.sha256(canonical).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        if self.enabled:
+            self.backend.set(key, value)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+def cache_from_settings(config: Optional[Dict] = None) -> ResultCache:
+    """
+    Build a ResultCache from a TASK_RESULT_CACHE-style dict.
+
+    Keys: ENABLED (default True), BACKEND ("inprocess" or "django"),
+    ALIAS (Django cache alias), MAX_ENTRIES, TTL_SECONDS.
+    """
+    config = config or {}
+    ttl = config.get("TTL_SECONDS", 300)
+    if config.get("BACKEND", "inprocess") == "django":
+        backend = DjangoCacheBackend(config.get("ALIAS", "default"), ttl)
+    else:
+        backend = InProcessBackend(config.get("MAX_ENTRIES", 256), ttl)
+    return ResultCache(backend, enabled=config.get("ENABLED", True))
@@ -84,9 +84,13 @@ class TaskAnalyzer {
         this.analyzeBtn.addEventListener('click', () => this.analyzeTasks());
         this.clearBtn.addEventListener('click', () => this.clearAllTasks());
         
-        // Strategy change
+        // Strategy change: results carry every strategy's ranking, so re-rank locally
         this.strategyDropdown.addEventListener('change', (e) => {
             this.currentStrategy = e.target.value;
+            const ranked = this.rankedResults(this.currentStrategy);
+            if (ranked) {
+                this.displayResults(ranked);
+            }
         });
     }
 
@@ -234,7 +238,8 @@ class TaskAnalyzer {
                 },
                 body: JSON.stringify({
                     tasks: this.tasks,
-                    strategy: this.currentStrategy
+                    strategy: this.currentStrategy,
+                    strategies: 'all'
                 })
             });
 
@@ -244,7 +249,7 @@ class TaskAnalyzer {
 
             const data = await response.json();
             this.results = data;
-            this.displayResults(data);
+            this.displayResults(this.rankedResults(this.currentStrategy) || data);
             this.hideLoading();
             this.showResults();
 
@@ -259,6 +264,20 @@ class TaskAnalyzer {
     // Results Display
     // ============================================
 
+    // Results ordered by one strategy's ranking from a comparison response
+    rankedResults(strategy) {
+        const data = this.results;
+        if (!data || !data.rankings || !data.rankings[strategy]) {
+            return null;
+        }
+        const tasks = data.rankings[strategy].map(index => {
+            const task = data.tasks[index];
+            const rawScore = task.scores[strategy];
+            return { ...task, raw_score: rawScore, score: Math.round(rawScore * 100) / 100 };
+        });
+        return { ...data, tasks };
+    }
+
     displayResults(data) {
         const { tasks, cycle_detected, cycles } = data;
 
@@ -522,6 +541,9 @@ class TaskAnalyzer {
         if (components.effort >= 0.5) {
             reasons.push('good effort-to-value ratio');
         }
+        if (components.dependency >= 0.5) {
+            reasons.push('unblocks other tasks');
+        }
 
         if (reasons.length === 0) {
             reasons.push('overall balance of all factors');
@@ -532,7 +554,8 @@ class TaskAnalyzer {
 
     updateStrategyInfo() {
         const strategyDescriptions = {
-            smart: '🧠 Smart Balance - Combines urgency (40%), importance (40%), and effort efficiency (20%)',
+            smart: '🧠 Smart Balance - Combines urgency (40%), importance (40%), and effort efficiency (20%), boosting tasks that unblock others',
+            unblocker: '🔓 Unblocker - Prioritizes tasks that unblock the most dependent work',
             effort: '⚡ Fastest Wins - Prioritizes tasks with lowest effort to build momentum',
             importance: '🎯 High Impact - Focuses on task importance regardless of effort or urgency',
             urgency: '⏰ Deadline Driven - Prioritizes tasks by urgency and approaching deadlines'
@@ -0,0 +1,67 @@
+"""JSON encoding for API responses: orjson when installed, the stdlib otherwise."""
+import json
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.http import HttpResponse
+
+try:  # Optional fast encoder
+    import orjson
+except ImportError:  # pragma: no cover - orjson is not a hard dependency
+    orjson = None
+
+
+
+def dumps(obj, sort_keys: bool = False, default: Optional[Callable] = None) -> bytes:
+    """
+    Encode obj as compact UTF-8 JSON.
+
+    orjson is used when available; values it rejects (integers beyond 64 bits,
+    non-string keys) are encoded with the stdlib encoder instead.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=default, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+        except TypeError:
+            pass
+    return json.dumps(obj, sort_keys=sort_keys, default=default, separators=(",", ":")).encode("utf-8")
+
+
+def json_response(data, status: int = 200) -> HttpResponse:
+    """Build a JSON HttpResponse with the fastest available encoder."""
+    return HttpResponse(dumps(data), content_type="application/json", status=status)
+
+
+def project_tasks(tasks: Iterable[Dict], fields: Optional[List[str]] = None,
+                  precision: Optional[int] = None) -> List[Dict]:
+    """
+    Trim scored tasks for output.
+
+    Args:
+        tasks: Scored task dicts (as returned by score_tasks)
+        fields: Keep only these top-level keys (e.g. ["id", "score"]); None keeps all
+        precision: Round raw_score, the components and any per-strategy "scores"
+            to this many digits; score (2 digits from the scorer) is re-derived
+            from raw_score at this precision
+
+    Returns:
+        Task dicts ready to encode; the input dicts are never modified
+    """
+    if fields is None and precision is None:
+        return list(tasks)
+    projected = []
+    for task in tasks:
+        if fields is None:
+            out = dict(task)
+        else:
+            out = {field: task[field] for field in fields if field in task}
+        if precision is not None:
+            if "score" in out:
+                out["score"] = round(task.get("raw_score", out["score"]), precision)
+            if "raw_score" in out:
+                out["raw_score"] = round(out["raw_score"], precision)
+            if "components" in out:
+                out["components"] = {name: round(value, precision) for name, value in out["components"].items()}
+            if "scores" in out:
+                out["scores"] = {name: round(value, precision) for name, value in out["scores"].items()}
+        projected.append(out)
+    return projected
@@ -0,0 +1,439 @@
+"""Persistent task sessions with incremental re-scoring."""
+import threading
+import time
+import uuid
+from bisect import bisect_left, insort
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from scoring import Task, _count_unlocks, analyze_dependencies, calculate_unlocks, score_record
+from strategies import resolve as resolve_strategy
+
+
+class SessionError(ValueError):
+    """Raised when a session upload or delta is invalid."""
+
+
+class TaskSession:
+    """
+    A scored task set that is kept up to date by add/update/delete deltas.
+
+    The ranking is a sorted list of (-raw_score, seq, id) keys, so a delta only
+    re-scores and re-positions the tasks it affects. Everything that is shared
+    across tasks is maintained incrementally:
+
+    - max priority / effort / unlocks via value counters,
+    - unlock counts via a reverse-dependency index, recomputed only for the
+      dependency closure of the edited edges (and the tasks those depend on),
+    - the cycle index, which is only recomputed when an added edge closes a
+      cycle or when the graph already had cycles.
+
+    A full re-score happens only when a normalizer (max priority, effort or
+    unlocks) or the calendar day changes.
+    """
+
+    def __init__(self, tasks: List[Dict], strategy: str = "smart"):
+        self.strategy = resolve_strategy(strategy)
+        self.lock = threading.Lock()
+        self.touched = time.monotonic()
+        self.records: Dict[str, Task] = {}
+        self._seq = 0
+        self._order: List[Tuple[float, int, str]] = []
+        self._keys: Dict[str, Tuple[float, int, str]] = {}
+        self._priorities = _MaxTracker()
+        self._efforts = _MaxTracker()
+        self._unlock_values = _MaxTracker()
+        self._deps: Dict[str, List[str]] = {}                  # task id -> unique dependency ids
+        self._dependents: Dict[str, Dict[str, None]] = {}      # dependency id -> dependent ids
+        self._missing: Dict[str, None] = {}                    # referenced ids with no task
+        self._unlocks: Dict[str, int] = {}
+
+        for task in tasks:
+            self._add(task)
+        self._graph = analyze_dependencies(self._ordered_records())
+        self._recompute_unlocks()
+        self._rescore_all()
+
+    # ----------------------------------------
+    # Public API
+    # ----------------------------------------
+
+    def ranked(self, limit: Optional[int] = None) -> List[Dict]:
+        """Return the scored task dicts, best first."""
+        keys = self._order if limit is None else self._order[:limit]
+        return [self.records[task_id].source for _, _, task_id in keys]
+
+    def summary(self) -> Dict:
+        """Cycle information and size of the session."""
+        return {
+            "count": len(self.records),
+            "cycle_detected": bool(self._graph.cycles),
+            "cycles": self._graph.cycles,
+            "dangling_dependencies": list(self._missing),
+        }
+
+    def apply(self, add: Iterable[Dict] = (), update: Iterable[Dict] = (),
+              delete: Iterable[str] = ()) -> Dict:
+        """
+        Apply a delta and re-score only what it affects.
+
+        Args:
+            add: New task dicts
+            update: Partial task dicts; each must carry the 'id' of an existing task
+            delete: Ids of tasks to remove
+
+        Returns:
+            {"updated": [task dicts with their new "rank"], "deleted": [...],
+             "rescored": int, "full_rescore": bool, ...summary()}
+
+        Raises:
+            SessionError: if the delta references unknown ids or adds duplicates
+        """
+        add, update, delete = list(add), list(update), list(delete)
+        self._validate_delta(add, update, delete)
+
+        changed: Set[str] = set()
+        seeds: Set[str] = set()
+        added_edges: List[Tuple[str, str]] = []
+        had_cycles = bool(self._graph.cycles)
+        graph_edited = False
+
+        for task_id in delete:
+            seeds.update(self._remove(task_id))
+            changed.discard(task_id)
+            graph_edited = True
+
+        for task in add:
+            task_id, edges = self._add(task)
+            changed.add(task_id)
+            seeds.add(task_id)
+            seeds.update(dep for _, dep in edges)
+            added_edges.extend(edges)
+            graph_edited = graph_edited or bool(edges)
+
+        for patch in update:
+            task_id, removed_deps, edges = self._update(patch)
+            changed.add(task_id)
+            seeds.update(removed_deps)
+            seeds.update(dep for _, dep in edges)
+            added_edges.extend(edges)
+            graph_edited = graph_edited or bool(removed_deps) or bool(edges)
+
+        # Cycle index: only re-run the SCC pass when the cycle set can have changed
+        if (had_cycles and graph_edited) or any(self._reaches(dep, task_id) for task_id, dep in added_edges):
+            self._graph = analyze_dependencies(self._ordered_records())
+
+        if had_cycles or self._graph.cycles:
+            unlock_changes = self._recompute_unlocks()
+        else:
+            unlock_changes = self._recompute_unlocks(seeds)
+        changed.update(task_id for task_id in unlock_changes if task_id in self.records)
+
+        normalizers = self._normalizers()
+        full_rescore = normalizers != self._normalizer_state
+        if full_rescore:
+            self._rescore_all(normalizers)
+            changed = set(self.records)
+        else:
+            for task_id in changed:
+                self._rescore(task_id)
+
+        self.touched = time.monotonic()
+        updated = [
+            dict(self.records[task_id].source, rank=bisect_left(self._order, self._keys[task_id]))
+            for task_id in changed
+        ]
+        updated.sort(key=lambda task: task["rank"])
+        return {
+            "updated": updated,
+            "deleted": list(delete),
+            "rescored": len(changed),
+            "full_rescore": full_rescore,
+            **self.summary(),
+        }
+
+    # ----------------------------------------
+    # Task bookkeeping
+    # ----------------------------------------
+
+    def _validate_delta(self, add: List[Dict], update: List[Dict], delete: List[str]) -> None:
+        """Reject a delta up front so a bad one never leaves the session half-applied."""
+        deleted, added = set(), set()
+
+        def exists(task_id):
+            return task_id in added or (task_id in self.records and task_id not in deleted)
+
+        for task_id in delete:
+            if not exists(task_id):
+                raise SessionError(f"Unknown task id: {task_id}")
+            deleted.add(task_id)
+        for offset, task in enumerate(add):
+            if not isinstance(task, dict):
+                raise SessionError("Each task must be a JSON object")
+            _validate_fields(task)
+            task_id = task["id"] if "id" in task else f"task_{self._seq + offset}"
+            if exists(task_id):
+                raise SessionError(f"Duplicate task id: {task_id}")
+            added.add(task_id)
+        for patch in update:
+            if not isinstance(patch, dict) or "id" not in patch:
+                raise SessionError("Each update must be an object with an 'id'")
+            if not exists(patch["id"]):
+                raise SessionError(f"Unknown task id: {patch['id']}")
+            _validate_fields(patch)
+
+    def _ordered_records(self) -> List[Task]:
+        # Ids are never re-inserted in place, so dict order is sequence order
+        return list(self.records.values())
+
+    def _add(self, task: Dict) -> Tuple[str, List[Tuple[str, str]]]:
+        if not isinstance(task, dict):
+            raise SessionError("Each task must be a JSON object")
+        _validate_fields(task)
+        record = Task.from_dict(task, self._seq)
+        if record.id in self.records:
+            raise SessionError(f"Duplicate task id: {record.id}")
+        self._seq += 1
+        self.records[record.id] = record
+        self._priorities.add(record.priority)
+        self._efforts.add(record.effort)
+        self._unlocks[record.id] = 0
+        self._unlock_values.add(0)
+        self._missing.pop(record.id, None)
+
+        # Earlier tasks that referenced this id now have a real edge to it
+        edges = [(dependent, record.id) for dependent in self._dependents.get(record.id, ())]
+        edges.extend(self._link(record))
+        return record.id, edges
+
+    def _remove(self, task_id: str) -> List[str]:
+        record = self.records.pop(task_id)
+        self._order.pop(bisect_left(self._order, self._keys.pop(task_id)))
+        self._priorities.remove(record.priority)
+        self._efforts.remove(record.effort)
+        self._unlock_values.remove(self._unlocks.pop(task_id))
+        removed = self._unlink(task_id)
+        if self._dependents.get(task_id):
+            self._missing[task_id] = None
+        return removed
+
+    def _update(self, patch: Dict) -> Tuple[str, List[str], List[Tuple[str, str]]]:
+        if not isinstance(patch, dict) or "id" not in patch:
+            raise SessionError("Each update must be an object with an 'id'")
+        task_id = patch["id"]
+        if task_id not in self.records:
+            raise SessionError(f"Unknown task id: {task_id}")
+        _validate_fields(patch)
+        record = self.records[task_id]
+        source = record.source
+        source.update(patch)
+
+        self._priorities.remove(record.priority)
+        self._efforts.remove(record.effort)
+        record.priority = source.get("priority", 5)
+        record.effort = source.get("effort", 5)
+        record.due_date = source.get("due_date")
+        self._priorities.add(record.priority)
+        self._efforts.add(record.effort)
+
+        if "dependencies" not in patch:
+            return task_id, [], []
+        removed = self._unlink(task_id)
+        record.dependencies = source.get("dependencies", [])
+        return task_id, removed, self._link(record)
+
+    def _link(self, record: Task) -> List[Tuple[str, str]]:
+        deps = record.dependencies if isinstance(record.dependencies, list) else []
+        unique = list(dict.fromkeys(deps))
+        self._deps[record.id] = unique
+        for dep in unique:
+            self._dependents.setdefault(dep, {})[record.id] = None
+            if dep not in self.records:
+                self._missing[dep] = None
+        return [(record.id, dep) for dep in unique if dep in self.records]
+
+    def _unlink(self, task_id: str) -> List[str]:
+        removed = self._deps.pop(task_id, [])
+        for dep in removed:
+            dependents = self._dependents[dep]
+            dependents.pop(task_id, None)
+            if not dependents:
+                del self._dependents[dep]
+                self._missing.pop(dep, None)
+        return [dep for dep in removed if dep in self.records]
+
+    def _reaches(self, start: str, target: str) -> bool:
+        """True if `target` is reachable from `start` by following dependencies."""
+        stack = [start]
+        seen = {start}
+        while stack:
+            node = stack.pop()
+            if node == target:
+                return True
+            for dep in self._deps.get(node, ()):
+                if dep in self.records and dep not in seen:
+                    seen.add(dep)
+                    stack.append(dep)
+        return False
+
+    # ----------------------------------------
+    # Unlock counts and normalizers
+    # ----------------------------------------
+
+    def _recompute_unlocks(self, seeds: Optional[Set[str]] = None) -> Dict[str, int]:
+        """
+        Refresh unlock counts and return {task_id: old_count} for those that changed.
+
+        With seeds, only their dependency closure is recomputed (valid while the
+        graph is acyclic); without, calculate_unlocks runs over the whole set.
+        """
+        if seeds is None:
+            records = self._ordered_records()
+            fresh = dict(zip((r.id for r in records), calculate_unlocks(records)))
+        else:
+            fresh = self._closure_unlocks(seeds)
+        changes = {}
+        for task_id, count in fresh.items():
+            old = self._unlocks[task_id]
+            if old != count:
+                changes[task_id] = old
+                self._unlocks[task_id] = count
+                self._unlock_values.remove(old)
+                self._unlock_values.add(count)
+        return changes
+
+    def _closure_unlocks(self, seeds: Set[str]) -> Dict[str, int]:
+        affected = self._closure(seeds, self._deps)
+
+        # Distinct counts need the downstream sets, so the tasks below the affected
+        # ones are counted too; only the affected counts are returned. Edges to tasks
+        # outside the region are kept so every task is sampled as in a full count.
+        region = self._closure(affected, self._dependents)
+        nodes = set(region)
+        deps_of = {}
+        for node in region:
+            deps = [dep for dep in self._deps.get(node, ()) if dep in self.records]
+            if deps:
+                deps_of[node] = deps
+                nodes.update(deps)
+        counts = _count_unlocks(nodes, deps_of, limit=len(self.records) - 1)
+        return {node: counts[node] for node in affected}
+
+    def _closure(self, start: Set[str], edges: Dict) -> Set[str]:
+        """Tasks in start plus every task reachable from them along edges."""
+        found = set()
+        stack = [task_id for task_id in start if task_id in self.records]
+        while stack:
+            node = stack.pop()
+            if node in found:
+                continue
+            found.add(node)
+            stack.extend(other for other in edges.get(node, ()) if other in self.records)
+        return found
+
+    def _normalizers(self) -> Tuple:
+        return (
+            self._priorities.max if self.records else 10,
+            self._efforts.max if self.records else 10,
+            self._unlock_values.max or 0,
+            datetime.now().date(),
+        )
+
+    # ----------------------------------------
+    # Scoring
+    # ----------------------------------------
+
+    def _rescore_all(self, normalizers: Optional[Tuple] = None) -> None:
+        if normalizers is None:
+            normalizers = self._normalizers()
+        self._normalizer_state = normalizers
+        max_priority, max_effort, max_unlocks, today = normalizers
+        self._keys = {}
+        for task_id, record in self.records.items():
+            score_record(record, self._unlocks[task_id], max_priority, max_effort, max_unlocks,
+                         today, self.strategy)
+            record.write_to(record.source)
+            self._keys[task_id] = (-record.raw_score, record.index, task_id)
+        self._order = sorted(self._keys.values())
+
+    def _rescore(self, task_id: str) -> None:
+        record = self.records[task_id]
+        old_key = self._keys.get(task_id)
+        if old_key is not None:
+            self._order.pop(bisect_left(self._order, old_key))
+        max_priority, max_effort, max_unlocks, today = self._normalizer_state
+        score_record(record, self._unlocks[task_id], max_priority, max_effort, max_unlocks,
+                     today, self.strategy)
+        record.write_to(record.source)
+        key = (-record.raw_score, record.index, task_id)
+        self._keys[task_id] = key
+        insort(self._order, key)
+
+
+def _validate_fields(task: Dict) -> None:
+    for field in ("priority", "effort"):
+        value = task.get(field, 5)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise SessionError(f"'{field}' must be a number")
+
+
+class _MaxTracker:
+    """Multiset of values that keeps its maximum up to date."""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.max = None
+
+    def add(self, value) -> None:
+        self.counts[value] += 1
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def remove(self, value) -> None:
+        self.counts[value] -= 1
+        if self.counts[value] <= 0:
+            del self.counts[value]
+            if value == self.max:
+                self.max = max(self.counts, default=None)
+
+
+class SessionStore:
+    """In-process LRU store of task sessions with an idle timeout."""
+
+    def __init__(self, max_sessions: int = 100, ttl_seconds: float = 3600):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions: "OrderedDict[str, TaskSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, tasks: List[Dict], strategy: str = "smart") -> Tuple[str, TaskSession]:
+        session = TaskSession(tasks, strategy)
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            self._expire()
+            self._sessions[session_id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session_id, session
+
+    def get(self, session_id: str) -> Optional[TaskSession]:
+        with self._lock:
+            self._expire()
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.touched = time.monotonic()
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.ttl_seconds
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.touched >= cutoff:
+                break
+            del self._sessions[session_id]
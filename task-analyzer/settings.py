@@ -20,6 +20,7 @@ ALLOWED_HOSTS = ['*']
 INSTALLED_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.auth',
+    'taskstore',
 ]
 
 MIDDLEWARE = [
@@ -61,5 +62,73 @@ TIME_ZONE = 'UTC'
 USE_I18N = True
 USE_TZ = True
 
+# Incremental task sessions (/api/tasks/sessions/)
+TASK_SESSION_MAX_SESSIONS = 100
+TASK_SESSION_TTL_SECONDS = 3600
+
+# Bulk analyze: maximum task sets per request, and process-pool size when a
+# request asks for parallel scoring (None = CPU count)
+TASK_BULK_MAX_SETS = 1000
+TASK_BULK_WORKERS = None
+
+# Serve analyze/suggest with the async views (recommended under ASGI, see asgi.py)
+TASK_ASYNC_VIEWS = True
+
+# Admission control for the async views: bodies of at least LARGE_BODY_BYTES
+# (gzip bodies count 8x) run in a separate lane of LARGE_WORKERS threads that
+# holds at most MAX_LARGE_PENDING requests (more get HTTP 503 + Retry-After);
+# smaller requests use SMALL_WORKERS threads of their own
+TASK_ADMISSION = {
+    'LARGE_BODY_BYTES': 256 * 1024,
+    'SMALL_WORKERS': 4,
+    'LARGE_WORKERS': 1,
+    'MAX_LARGE_PENDING': 4,
+}
+
+# Instrumentation: SAMPLE_RATE of analyze/suggest requests get per-stage timings
+# (Server-Timing header when SERVER_TIMING, and the /metrics summaries); request
+# counters are always kept, and ?debug=timing times a single request
+TASK_METRICS = {
+    'ENABLED': True,
+    'SAMPLE_RATE': 0.1,
+    'SERVER_TIMING': True,
+}
+
+# Largest accepted size of a Content-Encoding: gzip request body once inflated
+TASK_MAX_DECOMPRESSED_BYTES = 64 * 1024 * 1024
+
+# Response cache for analyze/suggest: BACKEND is "inprocess" (per-worker LRU)
+# or "django" (uses the CACHES alias named by ALIAS, e.g. locmem or file-based)
+TASK_RESULT_CACHE = {
+    'ENABLED': True,
+    'BACKEND': 'inprocess',
+    'ALIAS': 'default',
+    'MAX_ENTRIES': 256,
+    'TTL_SECONDS': 300,
+}
+
+# Frontend files (index.html, script.js, ...) are served from memory with strong
+# ETags and gzip/brotli variants. RELOAD re-reads changed files (default: DEBUG);
+# MAX_AGE > 0 lets browsers skip revalidation for that many seconds
+TASK_STATIC_ASSETS = {
+    'MAX_AGE': 0,
+    'MIN_COMPRESS_SIZE': 256,
+}
+
+# Per-request profiling: when ENABLED, trusted callers (REMOTE_ADDR in TRUSTED_IPS
+# and an X-Profile-Token header equal to TOKEN) can send X-Profile: 1
+# or ?debug=profile to analyze/suggest. cProfile stats, a tracemalloc snapshot and
+# the payload's size/shape are saved under DIRECTORY (default: profiles/ next to
+# this file, newest MAX_CAPTURES kept) and listed at /api/debug/profiles/. TOKEN is
+# required when ENABLED: behind a reverse proxy every client arrives from 127.0.0.1
+TASK_PROFILING = {
+    'ENABLED': False,
+    'DIRECTORY': None,
+    'TRUSTED_IPS': ['127.0.0.1', '::1'],
+    'TOKEN': None,
+    'MAX_CAPTURES': 50,
+    'TRACEMALLOC_FRAMES': 1,
+}
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -0,0 +1,25 @@
+"""
+API-only settings for task-analyzer workers.
+
+Serves the JSON endpoints, the static frontend and /metrics without the pieces
+they never use: no auth or contenttypes apps, no template engine, no CSRF or
+clickjacking middleware (the API views are csrf_exempt), no translation
+machinery and no database. The persistent task store needs the ORM, so its
+/api/store/ routes are not available under this profile.
+
+Use with DJANGO_SETTINGS_MODULE=settings_api.
+"""
+
+from settings import *  # noqa: F401,F403
+
+INSTALLED_APPS = []
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+]
+
+TEMPLATES = []
+
+DATABASES = {}
+
+USE_I18N = False
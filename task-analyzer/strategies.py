@@ -0,0 +1,203 @@
+"""Strategy registry: each strategy is compiled once into a function of the score components."""
+import math
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+# Score components every strategy function receives, in argument order
+COMPONENTS = ("urgency", "importance_norm", "effort", "dependency")
+
+# Strategy used for unknown names, matching the scorer's historical fallback
+DEFAULT_STRATEGY = "smart"
+
+
+class StrategyError(ValueError):
+    """Raised for invalid strategy definitions (unknown components, bad weights, ...)."""
+
+
+class Strategy:
+    """
+    A compiled scoring strategy.
+
+    `score(urgency, importance_norm, effort, dependency)` returns the raw score. It
+    only uses arithmetic, so the numpy backend calls it with whole component arrays.
+
+    `critical_path_boost` raises the urgency of critical-path tasks, but only when the
+    scorer is given a schedule; of the API endpoints, only /api/tasks/schedule/ does,
+    so analyze and suggest rank without the boost.
+    """
+
+    __slots__ = ("name", "weights", "score", "critical_path_boost")
+
+    def __init__(self, name: str, score: Callable, weights: Optional[Tuple[Tuple[str, float], ...]] = None,
+                 critical_path_boost: bool = False):
+        self.name = name
+        self.score = score
+        self.weights = weights
+        self.critical_path_boost = critical_path_boost
+
+    def __repr__(self) -> str:
+        return f"Strategy({self.name!r})"
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __reduce__(self):
+        # Compiled functions do not pickle: process workers rebuild the strategy instead
+        if _registry.get(self.name) is self:
+            return get_strategy, (self.name,)
+        if self.weights is not None:
+            return _weighted, (self.name, self.weights, self.critical_path_boost)
+        raise StrategyError(
+            f"Strategy '{self.name}' has a custom function and is no longer registered under that name, "
+            "so it cannot be sent to a worker process"
+        )
+
+
+_registry: Dict[str, Strategy] = {}
+_registry_lock = threading.Lock()
+
+
+def compile_weights(weights: Iterable[Tuple[str, float]]) -> Callable:
+    """
+    Compile (component, weight) pairs into a straight-line scoring function.
+
+    Terms are summed in the given order and zero weights are dropped; a weight
+    of 1.0 uses the component as is. The generated code has no branches, so the
+    per-task cost is one call.
+
+    Raises:
+        StrategyError: for unknown components or non-finite weights
+    """
+    terms = []
+    for component, weight in weights:
+        if component not in COMPONENTS:
+            raise StrategyError(f"Unknown component '{component}'; expected one of {', '.join(COMPONENTS)}")
+        weight = _as_weight(weight)
+        if weight is None:
+            raise StrategyError(f"Weight for '{component}' must be a finite number")
+        if weight == 1:
+            terms.append(component)
+        elif weight:
+            terms.append(f"({component} * {weight!r})")
+    source = f"lambda {', '.join(COMPONENTS)}: {' + '.join(terms) or '0.0 * urgency'}"
+    return eval(compile(source, "<strategy>", "eval"), {})
+
+
+def _as_weight(weight) -> Optional[float]:
+    """weight as a finite float, or None if it is not a number or too large for a float."""
+    if isinstance(weight, bool) or not isinstance(weight, (int, float)):
+        return None
+    try:
+        weight = float(weight)
+    except OverflowError:  # Integers beyond ~1.8e308, e.g. from a JSON body
+        return None
+    return weight if math.isfinite(weight) else None
+
+
+def register(name: str, weights: Optional[Iterable[Tuple[str, float]]] = None,
+             function: Optional[Callable] = None, critical_path_boost: bool = False) -> Strategy:
+    """
+    Register a named strategy, replacing any strategy of that name.
+
+    Args:
+        name: Name used as "strategy" in requests
+        weights: (component, weight) pairs, compiled with compile_weights
+        function: Custom score function of (urgency, importance_norm, effort, dependency);
+            it must use arithmetic only so that it also works on numpy arrays
+        critical_path_boost: Raise the urgency of critical-path tasks when a schedule is given
+            (only /api/tasks/schedule/ passes one)
+
+    Returns:
+        The compiled Strategy
+
+    Raises:
+        StrategyError: unless exactly one of weights and function is given
+    """
+    if (weights is None) == (function is None):
+        raise StrategyError("Give either weights or a function")
+    if weights is not None:
+        weights = tuple(weights)
+        function = compile_weights(weights)
+    strategy = Strategy(name, function, weights, critical_path_boost)
+    with _registry_lock:
+        _registry[name] = strategy
+    return strategy
+
+
+def get_strategy(name: str) -> Strategy:
+    """
+    Return a registered strategy.
+
+    Raises:
+        StrategyError: for an unknown name
+    """
+    try:
+        return _registry[name]
+    except KeyError:
+        raise StrategyError(f"Unknown strategy: {name}") from None
+
+
+def strategy_names() -> List[str]:
+    """Names of the registered strategies, in registration order."""
+    return list(_registry)
+
+
+def resolve(strategy: Union[str, Strategy, None]) -> Strategy:
+    """Return the Strategy for a name or Strategy; unknown names get the default strategy."""
+    if type(strategy) is Strategy:
+        return strategy
+    found = _registry.get(strategy)
+    return found if found is not None else _registry[DEFAULT_STRATEGY]
+
+
+def from_weights(weights: Dict[str, float]) -> Strategy:
+    """
+    Build a strategy from user-supplied component weights, e.g. from a request body.
+
+    Weights must be non-negative with at least one positive. Components are summed
+    in COMPONENTS order, so equal weights always give the same strategy, and each
+    distinct weighting is compiled only once.
+
+    Raises:
+        StrategyError: for unknown components or invalid weights
+    """
+    if not isinstance(weights, dict) or not weights:
+        raise StrategyError("'weights' must be a non-empty object of component weights")
+    parsed = {}
+    for component, weight in weights.items():
+        if component not in COMPONENTS:
+            raise StrategyError(f"Unknown component '{component}'; expected one of {', '.join(COMPONENTS)}")
+        parsed[component] = _as_weight(weight)
+        if parsed[component] is None or parsed[component] < 0:
+            raise StrategyError(f"Weight for '{component}' must be a non-negative number")
+    if not any(parsed.values()):
+        raise StrategyError("At least one weight must be positive")
+    return _compiled_weights(tuple((component, parsed.get(component, 0.0)) for component in COMPONENTS))
+
+
+@lru_cache(maxsize=256)
+def _compiled_weights(weights: Tuple[Tuple[str, float], ...]) -> Strategy:
+    name = "weights(" + ",".join(f"{component}={weight!r}" for component, weight in weights if weight) + ")"
+    return Strategy(name, compile_weights(weights), weights)
+
+
+def _weighted(name: str, weights: Tuple[Tuple[str, float], ...], critical_path_boost: bool) -> Strategy:
+    """Rebuild a weighted strategy, reusing the compiled function of an equal weighting."""
+    compiled = _compiled_weights(weights)
+    if compiled.name == name and compiled.critical_path_boost == critical_path_boost:
+        return compiled
+    return Strategy(name, compiled.score, weights, critical_path_boost)
+
+
+def _smart(urgency, importance_norm, effort, dependency):
+    score = (urgency * 0.4) + (importance_norm * 0.4) + (effort * 0.2)
+    # Blockers close up to 20% of the remaining gap to 1.0
+    return score + (1 - score) * 0.2 * dependency
+
+
+register("smart", function=_smart, critical_path_boost=True)
+register("urgency", weights=[("urgency", 1.0)])
+register("effort", weights=[("effort", 1.0)])
+register("importance", weights=[("importance_norm", 1.0)])
+register("unblocker", weights=[("dependency", 0.6), ("urgency", 0.2), ("importance_norm", 0.2)])
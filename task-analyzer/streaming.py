@@ -0,0 +1,117 @@
+"""NDJSON ingestion and streaming output for large task portfolios."""
+import json
+import tempfile
+from typing import Dict, IO, Iterable, Iterator, List
+
+from scoring import Task
+from serialization import dumps
+
+# Raw task lines are kept in memory up to this size, then spilled to disk
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+
+class NDJSONError(ValueError):
+    """Raised when an NDJSON line is not a JSON task object."""
+
+
+def read_ndjson_tasks(lines: Iterable[bytes], spool: IO[bytes]) -> List[Task]:
+    """
+    Parse NDJSON task lines incrementally into compact Task records.
+
+    Each raw line is copied to `spool` so the full task can be re-emitted later;
+    only the record (whose source is the line's (start, length) on the spool) is
+    kept in memory.
+
+    Args:
+        lines: Iterable of raw NDJSON lines (e.g. a request or file stream)
+        spool: Writable, seekable binary file receiving the raw lines
+
+    Returns:
+        List of Task records in input order
+
+    Raises:
+        NDJSONError: if a non-blank line is not a JSON object
+    """
+    records = []
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        task = _parse_line(line, line_number)
+        start = spool.tell()
+        spool.write(line)
+        records.append(Task.from_dict(task, len(records), source=(start, len(line))))
+    return records
+
+
+def index_ndjson_file(stream: IO[bytes]) -> List[Task]:
+    """
+    Parse a seekable NDJSON file into records whose sources point into the file itself.
+
+    Unlike read_ndjson_tasks nothing is copied: each record's source is its line's
+    (start, length) in `stream`, which can then be passed to iter_ndjson_results in
+    place of a spool. Works with regular files and mmap objects.
+
+    Raises:
+        NDJSONError: if a non-blank line is not a JSON object
+    """
+    records = []
+    offset = 0
+    for line_number, line in enumerate(iter(stream.readline, b""), start=1):
+        start = offset
+        offset += len(line)
+        if not line.strip():
+            continue
+        task = _parse_line(line, line_number)
+        records.append(Task.from_dict(task, len(records), source=(start, len(line))))
+    return records
+
+
+def _parse_line(line: bytes, line_number: int) -> Dict:
+    try:
+        task = json.loads(line)
+    except ValueError:
+        raise NDJSONError(f"Invalid JSON on line {line_number}")
+    if not isinstance(task, dict):
+        raise NDJSONError(f"Line {line_number} must be a JSON object")
+    return task
+
+
+def iter_ndjson_results(ranked: Iterable[Task], spool: IO[bytes], trailer: Dict) -> Iterator[bytes]:
+    """
+    Yield one `{"task": ...}` NDJSON record per ranked task, then a `{"trailer": ...}` record.
+
+    The original task is re-read from the spool and merged with the scorer's output,
+    so only one full task object is materialized at a time. The spool is closed
+    once the trailer has been produced.
+    """
+    try:
+        for record in ranked:
+            start, length = record.source
+            spool.seek(start)
+            task = record.write_to(json.loads(spool.read(length)))
+            yield dumps({"task": task}) + b"\n"
+        yield dumps({"trailer": trailer}) + b"\n"
+    finally:
+        spool.close()
+
+
+def new_spool() -> IO[bytes]:
+    """Create the temporary buffer used to hold raw task lines."""
+    return tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+
+
+def is_ndjson(content_type: str) -> bool:
+    """Return True for NDJSON / JSON Lines content types."""
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    return media_type in ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+def ndjson_trailer(dependency_graph, count: int) -> Dict:
+    """Build the trailer record carrying cycle information for a streamed analysis."""
+    return {
+        "count": count,
+        "cycle_detected": bool(dependency_graph.cycles),
+        "cycles": dependency_graph.cycles,
+        "dangling_dependencies": dependency_graph.dangling,
+    }
+
@@ -0,0 +1 @@
+"""Persistent task store with indexed priority queries."""
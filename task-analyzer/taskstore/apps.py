@@ -0,0 +1,6 @@
+from django.apps import AppConfig
+
+
+class TaskStoreConfig(AppConfig):
+    name = "taskstore"
+    verbose_name = "Task store"
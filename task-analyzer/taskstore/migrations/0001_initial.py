@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Portfolio',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('next_position', models.PositiveIntegerField(default=0)),
+                ('scored_on', models.DateField(null=True)),
+                ('scored_calendar', models.CharField(blank=True, max_length=64)),
+                ('max_priority', models.FloatField(default=10)),
+                ('max_effort', models.FloatField(default=10)),
+                ('max_unlocks', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StoredTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.CharField(max_length=200)),
+                ('position', models.PositiveIntegerField()),
+                ('data', models.JSONField()),
+                ('priority', models.FloatField(default=5)),
+                ('effort', models.FloatField(default=5)),
+                ('due_date', models.DateField(null=True)),
+                ('urgency', models.FloatField(default=0)),
+                ('unlocks', models.PositiveIntegerField(default=0)),
+                ('score_smart', models.FloatField(default=0)),
+                ('score_urgency', models.FloatField(default=0)),
+                ('score_effort', models.FloatField(default=0)),
+                ('score_importance', models.FloatField(default=0)),
+                ('score_unblocker', models.FloatField(default=0)),
+                ('portfolio', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='taskstore.portfolio')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['portfolio', 'due_date', 'position'], name='storedtask_due'), models.Index(fields=['portfolio', '-priority', 'position'], name='storedtask_priority'), models.Index(fields=['portfolio', 'effort', 'position'], name='storedtask_effort'), models.Index(fields=['portfolio', '-score_smart', 'position'], name='storedtask_top_smart'), models.Index(fields=['portfolio', '-score_urgency', 'position'], name='storedtask_top_urgency'), models.Index(fields=['portfolio', '-score_effort', 'position'], name='storedtask_top_effort'), models.Index(fields=['portfolio', '-score_importance', 'position'], name='storedtask_top_importance'), models.Index(fields=['portfolio', '-score_unblocker', 'position'], name='storedtask_top_unblocker')],
+                'constraints': [models.UniqueConstraint(fields=('portfolio', 'task_id'), name='storedtask_unique_id')],
+            },
+        ),
+    ]
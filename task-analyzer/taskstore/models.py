@@ -0,0 +1,58 @@
+"""Portfolios of stored tasks, with the columns the priority queries are answered from."""
+from django.db import models
+
+# Strategies with a precomputed, indexed score column on StoredTask
+STRATEGIES = ("smart", "urgency", "effort", "importance", "unblocker")
+
+
+class Portfolio(models.Model):
+    """A named task list plus the normalizers its stored scores were computed with."""
+
+    name = models.CharField(max_length=100, unique=True)
+    next_position = models.PositiveIntegerField(default=0)
+    # Date and holiday calendar the urgency buckets and scores were computed for
+    scored_on = models.DateField(null=True)
+    scored_calendar = models.CharField(max_length=64, blank=True)
+    max_priority = models.FloatField(default=10)
+    max_effort = models.FloatField(default=10)
+    max_unlocks = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return self.name
+
+
+class StoredTask(models.Model):
+    """One task; `data` is the task as submitted, the other columns are derived from it."""
+
+    portfolio = models.ForeignKey(Portfolio, on_delete=models.CASCADE, related_name="tasks")
+    task_id = models.CharField(max_length=200)
+    # Submission order; ties in score are broken by it, as score_tasks does with input order
+    position = models.PositiveIntegerField()
+    data = models.JSONField()
+    priority = models.FloatField(default=5)
+    effort = models.FloatField(default=5)
+    due_date = models.DateField(null=True)  # None when missing or unparseable
+    # Refreshed once per day (or when the portfolio changes)
+    urgency = models.FloatField(default=0)
+    unlocks = models.PositiveIntegerField(default=0)
+    score_smart = models.FloatField(default=0)
+    score_urgency = models.FloatField(default=0)
+    score_effort = models.FloatField(default=0)
+    score_importance = models.FloatField(default=0)
+    score_unblocker = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["portfolio", "task_id"], name="storedtask_unique_id"),
+        ]
+        indexes = [
+            models.Index(fields=["portfolio", "due_date", "position"], name="storedtask_due"),
+            models.Index(fields=["portfolio", "-priority", "position"], name="storedtask_priority"),
+            models.Index(fields=["portfolio", "effort", "position"], name="storedtask_effort"),
+        ] + [
+            models.Index(fields=["portfolio", f"-score_{strategy}", "position"], name=f"storedtask_top_{strategy}")
+            for strategy in STRATEGIES
+        ]
+
+    def __str__(self):
+        return f"{self.portfolio_id}:{self.task_id}"
@@ -0,0 +1,308 @@
+"""Writes and indexed queries for the persistent task store."""
+import hashlib
+from datetime import date, datetime
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.db import connection, models, transaction
+
+import scoring
+from scoring import Task, _unlocks_for_records, score_record
+from strategies import Strategy, get_strategy
+from taskstore.models import STRATEGIES, Portfolio, StoredTask
+
+_DATA_FIELDS = ["data", "priority", "effort", "due_date"]
+_SCORE_FIELDS = ["urgency", "unlocks"] + [f"score_{strategy}" for strategy in STRATEGIES]
+
+
+class StoreError(ValueError):
+    """Raised for invalid store requests (bad tasks, unknown strategy, ...)."""
+
+
+def upsert_tasks(name: str, tasks: List[Dict], replace: bool = False) -> Portfolio:
+    """
+    Insert or replace tasks by id, then rescore the portfolio.
+
+    New tasks are appended after the existing ones; replaced tasks keep their
+    position. Tasks without an id get `task_<position>`. Only the written tasks
+    are rescored unless the dependency graph, a normalizer or the scoring date
+    changed; then every task is, and only rows whose scores moved are updated.
+
+    Args:
+        name: Portfolio name (created if it does not exist)
+        tasks: Task dictionaries, as accepted by /api/tasks/analyze/
+        replace: Drop every existing task of the portfolio first
+
+    Returns:
+        The refreshed Portfolio
+
+    Raises:
+        StoreError: if a task is malformed or an id is repeated
+    """
+    for task in tasks:
+        _validate_task(task)
+
+    with transaction.atomic():
+        portfolio, _ = Portfolio.objects.select_for_update().get_or_create(name=name)
+        if replace:
+            portfolio.tasks.all().delete()
+            portfolio.next_position = 0
+        existing = {row.task_id: row for row in portfolio.tasks.all()}
+        before = {row.pk: _score_values(row) for row in existing.values()}
+
+        seen = set()
+        created, updated = [], []
+        graph_changed = replace
+        for task in tasks:
+            task = dict(task)
+            row = existing.get(str(task["id"])) if "id" in task else None
+            if row is None:
+                position = portfolio.next_position
+                portfolio.next_position += 1
+                if "id" not in task:
+                    task["id"] = _free_id(f"task_{position}", existing, seen)
+                row = StoredTask(portfolio=portfolio, task_id=str(task["id"]), position=position)
+                created.append(row)
+            else:
+                updated.append(row)
+                graph_changed |= _dependencies(row.data) != _dependencies(task)
+            if row.task_id in seen:
+                raise StoreError(f"Duplicate task id: {row.task_id}")
+            seen.add(row.task_id)
+            _fill_columns(row, task)
+
+        rows = [*existing.values(), *created]
+        if created and not graph_changed:
+            # A new task only moves unlock counts if it has dependencies or is one
+            referenced = {dep for row in rows for dep in _dependencies(row.data)}
+            graph_changed = any(_dependencies(row.data) or row.task_id in referenced for row in created)
+
+        # Score in memory before writing, so every row is written at most once
+        today = datetime.now().date()
+        if graph_changed or _is_stale(portfolio, today) or _normalizers_changed(portfolio, rows):
+            _rescore(portfolio, sorted(rows, key=lambda row: row.position), today)
+        else:
+            # Unlock counts and normalizers stand; the stored scores of untouched rows are current
+            touched = [*updated, *created]
+            records = [Task.from_dict(row.data, row.position, source=row) for row in touched]
+            _score_rows(portfolio, records, [row.unlocks for row in updated] + [0] * len(created), today)
+        _insert_rows(created)
+        _write_columns(updated, _DATA_FIELDS + _SCORE_FIELDS)
+        touched = {row.pk for row in updated}
+        _write_columns(_changed([row for row in existing.values() if row.pk not in touched], before), _SCORE_FIELDS)
+        portfolio.save()
+    return portfolio
+
+
+def delete_tasks(name: str, task_ids: List[str]) -> int:
+    """Delete tasks by id, rescore what remains and return how many were deleted."""
+    with transaction.atomic():
+        portfolio = Portfolio.objects.select_for_update().get(name=name)
+        deleted, _ = portfolio.tasks.filter(task_id__in=[str(task_id) for task_id in task_ids]).delete()
+        if deleted:
+            refresh_portfolio(portfolio, force=True)
+    return deleted
+
+
+def refresh_portfolio(portfolio: Portfolio, today: Optional[date] = None, force: bool = False) -> bool:
+    """
+    Recompute urgency buckets, unlock counts and every strategy score.
+
+    Scores are only stale when the date or the holiday calendar changed since
+    the last refresh, or when tasks were written (force), so reads normally
+    skip this entirely.
+
+    Returns:
+        True if the portfolio was rescored
+    """
+    today = today or datetime.now().date()
+    if not force and not _is_stale(portfolio, today):
+        return False
+
+    rows = list(portfolio.tasks.order_by("position"))
+    before = {row.pk: _score_values(row) for row in rows}
+    _rescore(portfolio, rows, today)
+    with transaction.atomic():
+        _write_columns(_changed(rows, before), _SCORE_FIELDS)
+        portfolio.save()
+    return True
+
+
+def _rescore(portfolio: Portfolio, rows: List[StoredTask], today: Optional[date] = None) -> None:
+    """Set the derived columns of rows (in position order) and the portfolio's normalizers."""
+    today = today or datetime.now().date()
+    records = [Task.from_dict(row.data, row.position, source=row) for row in rows]
+    unlocks = _unlocks_for_records(records)
+    portfolio.max_priority = max((r.priority for r in records), default=10)
+    portfolio.max_effort = max((r.effort for r in records), default=10)
+    portfolio.max_unlocks = max(unlocks, default=0)
+    _score_rows(portfolio, records, unlocks, today)
+    portfolio.scored_on = today
+    portfolio.scored_calendar = _calendar_key()
+
+
+def _score_rows(portfolio: Portfolio, records: List[Task], unlocks: List[int], today: date) -> None:
+    """Set the derived columns of the records' rows against the portfolio's normalizers."""
+    strategies = [get_strategy(name) for name in STRATEGIES]
+    for record, unlock_count in zip(records, unlocks):
+        row = record.source
+        row.unlocks = unlock_count
+        for strategy in strategies:
+            setattr(row, f"score_{strategy}", _score(record, unlock_count, portfolio, today, strategy))
+        row.urgency = record.urgency
+
+
+def _is_stale(portfolio: Portfolio, today: date) -> bool:
+    """Whether urgency buckets were computed for another date or holiday calendar."""
+    return portfolio.scored_on != today or portfolio.scored_calendar != _calendar_key()
+
+
+def _normalizers_changed(portfolio: Portfolio, rows: List[StoredTask]) -> bool:
+    return (
+        max((row.priority for row in rows), default=10) != portfolio.max_priority
+        or max((row.effort for row in rows), default=10) != portfolio.max_effort
+    )
+
+
+def _score_values(row: StoredTask) -> Tuple:
+    return tuple(getattr(row, name) for name in _SCORE_FIELDS)
+
+
+def _changed(rows: List[StoredTask], before: Dict[int, Tuple]) -> List[StoredTask]:
+    """Rows whose derived columns differ from their values when loaded."""
+    return [row for row in rows if _score_values(row) != before[row.pk]]
+
+
+def _dependencies(data: Dict) -> List:
+    return data.get("dependencies", [])
+
+
+def top_tasks(name: str, strategy: str = "smart", n: int = 3) -> List[Dict]:
+    """
+    Return the n best tasks of a portfolio, exactly as score_tasks would rank them.
+
+    Answered from the (portfolio, -score, position) index; only the n winning
+    rows are loaded.
+
+    Raises:
+        Portfolio.DoesNotExist: for an unknown portfolio
+        StoreError: for an unknown strategy
+    """
+    if strategy not in STRATEGIES:
+        raise StoreError(f"Unknown strategy: {strategy}")
+    portfolio = Portfolio.objects.get(name=name)
+    refresh_portfolio(portfolio)
+    resolved = get_strategy(strategy)
+
+    rows = portfolio.tasks.order_by(f"-score_{strategy}", "position")[:max(n, 0)]
+    top = []
+    for row in rows:
+        record = Task.from_dict(row.data, row.position, source=dict(row.data))
+        _score(record, row.unlocks, portfolio, portfolio.scored_on, resolved)
+        top.append(record.write_to(record.source))
+    return top
+
+
+def overdue_tasks(name: str, limit: int = 100, today: Optional[date] = None) -> List[Dict]:
+    """
+    Return tasks due before today, most overdue first, from the due-date index.
+
+    Raises:
+        Portfolio.DoesNotExist: for an unknown portfolio
+    """
+    today = today or datetime.now().date()
+    portfolio = Portfolio.objects.get(name=name)
+    rows = portfolio.tasks.filter(due_date__lt=today).order_by("due_date", "position")[:max(limit, 0)]
+    return [{**row.data, "days_overdue": (today - row.due_date).days} for row in rows]
+
+
+def _insert_rows(rows: List[StoredTask]) -> None:
+    """Insert new rows with one prepared INSERT; bulk_create spends most of its time building SQL."""
+    if not rows:
+        return
+    meta = StoredTask._meta
+    quote = connection.ops.quote_name
+    fields = [field for field in meta.concrete_fields if not field.primary_key]
+    sql = "INSERT INTO {} ({}) VALUES ({})".format(
+        quote(meta.db_table),
+        ", ".join(quote(field.column) for field in fields),
+        ", ".join(["%s"] * len(fields)),
+    )
+    converters = _converters(fields)
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, [_prepared(row, converters) for row in rows])
+
+
+def _write_columns(rows: List[StoredTask], names: List[str]) -> None:
+    """Update the given fields of rows with one prepared UPDATE (bulk_update's CASE chains are far slower)."""
+    if not rows:
+        return
+    meta = StoredTask._meta
+    quote = connection.ops.quote_name
+    fields = [meta.get_field(name) for name in names]
+    sql = "UPDATE {} SET {} WHERE {} = %s".format(
+        quote(meta.db_table),
+        ", ".join(f"{quote(field.column)} = %s" for field in fields),
+        quote(meta.pk.column),
+    )
+    converters = _converters(fields)
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, [_prepared(row, converters) + [row.pk] for row in rows])
+
+
+def _converters(fields) -> List[Tuple[str, Optional[Callable]]]:
+    """Pair each field's attribute with its database adapter; numbers and strings need none."""
+    return [
+        (field.attname, partial(field.get_db_prep_save, connection=connection)
+         if isinstance(field, (models.JSONField, models.DateField)) else None)
+        for field in fields
+    ]
+
+
+def _prepared(row: StoredTask, converters) -> List:
+    return [
+        getattr(row, attname) if convert is None else convert(getattr(row, attname))
+        for attname, convert in converters
+    ]
+
+
+def _score(record: Task, unlock_count: int, portfolio: Portfolio, today: date, strategy: Strategy) -> float:
+    return score_record(
+        record, unlock_count, portfolio.max_priority, portfolio.max_effort,
+        portfolio.max_unlocks, today, strategy,
+    )
+
+
+def _calendar_key() -> str:
+    holidays = ",".join(day.isoformat() for day in scoring.get_holidays())
+    return hashlib.sha256(holidays.encode("ascii")).hexdigest()
+
+
+def _free_id(candidate: str, *taken) -> str:
+    while any(candidate in ids for ids in taken):
+        candidate += "_"
+    return candidate
+
+
+def _validate_task(task) -> None:
+    if not isinstance(task, dict):
+        raise StoreError("Each task must be an object")
+    for field in ("priority", "effort"):
+        value = task.get(field, 5)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise StoreError(f"'{field}' must be a number")
+    if not isinstance(task.get("dependencies", []), list):
+        raise StoreError("'dependencies' must be a list")
+    due = task.get("due_date")
+    if due is not None and not isinstance(due, str):
+        raise StoreError("'due_date' must be a YYYY-MM-DD string")
+
+
+def _fill_columns(row: StoredTask, task: Dict) -> None:
+    row.data = task
+    row.priority = task.get("priority", 5)
+    row.effort = task.get("effort", 5)
+    try:
+        row.due_date = datetime.strptime(task.get("due_date") or "", "%Y-%m-%d").date()
+    except ValueError:
+        row.due_date = None  # Scored with the 0.3 "unknown" urgency, never overdue
@@ -0,0 +1,11 @@
+"""URL routes of the persistent task store, included under api/store/."""
+from django.urls import path
+
+from taskstore import views
+
+urlpatterns = [
+    path("<str:portfolio>/", views.store_portfolio, name="store-portfolio"),
+    path("<str:portfolio>/tasks/", views.store_tasks, name="store-tasks"),
+    path("<str:portfolio>/top/", views.store_top, name="store-top"),
+    path("<str:portfolio>/overdue/", views.store_overdue, name="store-overdue"),
+]
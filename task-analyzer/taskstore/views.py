@@ -0,0 +1,109 @@
+"""HTTP views for the persistent task store (routed only when the app is installed)."""
+import json
+
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from serialization import json_response
+from taskstore import store
+from taskstore.models import Portfolio
+from views import _load_tasks_from_request, _request_body
+
+
+@csrf_exempt
+@require_http_methods(["GET", "DELETE"])
+def store_portfolio(request, portfolio):
+    """
+    GET /api/store/<portfolio>/     -> {"portfolio": ..., "count": int, "scored_on": "YYYY-MM-DD"}
+    DELETE /api/store/<portfolio>/  -> drop the portfolio and its tasks
+    """
+    try:
+        stored = Portfolio.objects.get(name=portfolio)
+    except Portfolio.DoesNotExist:
+        return JsonResponse({"error": "Unknown portfolio"}, status=404)
+
+    if request.method == "DELETE":
+        stored.delete()
+        return HttpResponse(status=204)
+    return JsonResponse({
+        "portfolio": portfolio,
+        "count": stored.tasks.count(),
+        "scored_on": stored.scored_on.isoformat() if stored.scored_on else None,
+    })
+
+
+@csrf_exempt
+@require_http_methods(["POST", "DELETE"])
+def store_tasks(request, portfolio):
+    """
+    POST /api/store/<portfolio>/tasks/[?replace=1]
+    Body: same as /api/tasks/analyze/; tasks are inserted or replaced by id
+    Response: { "portfolio": ..., "upserted": int, "count": int }
+
+    DELETE /api/store/<portfolio>/tasks/
+    Body: {"ids": [...]}
+    Response: { "portfolio": ..., "deleted": int, "count": int }
+    """
+    if request.method == "DELETE":
+        raw, err = _request_body(request)
+        if err:
+            return HttpResponseBadRequest(json.dumps({"error": err}), content_type="application/json")
+        try:
+            body = json.loads(raw.decode("utf-8"))
+        except Exception:
+            return HttpResponseBadRequest(json.dumps({"error": "Invalid JSON payload"}), content_type="application/json")
+        if not isinstance(body, dict) or not isinstance(body.get("ids"), list):
+            return HttpResponseBadRequest(json.dumps({"error": "Body must be an object with an 'ids' list"}), content_type="application/json")
+        try:
+            deleted = store.delete_tasks(portfolio, body["ids"])
+        except Portfolio.DoesNotExist:
+            return JsonResponse({"error": "Unknown portfolio"}, status=404)
+        count = Portfolio.objects.get(name=portfolio).tasks.count()
+        return JsonResponse({"portfolio": portfolio, "deleted": deleted, "count": count})
+
+    payload, err = _load_tasks_from_request(request)
+    if err:
+        return HttpResponseBadRequest(json.dumps({"error": err}), content_type="application/json")
+    try:
+        stored = store.upsert_tasks(portfolio, payload["tasks"], replace=request.GET.get("replace") in ("1", "true"))
+    except store.StoreError as e:
+        return HttpResponseBadRequest(json.dumps({"error": str(e)}), content_type="application/json")
+    return JsonResponse({"portfolio": portfolio, "upserted": len(payload["tasks"]), "count": stored.tasks.count()})
+
+
+@require_http_methods(["GET"])
+def store_top(request, portfolio):
+    """
+    GET /api/store/<portfolio>/top/?strategy=smart&n=3
+    Returns the n best stored tasks, scored and ranked exactly like /api/tasks/analyze/,
+    read from the per-strategy score index instead of rescoring the portfolio.
+    """
+    try:
+        n = int(request.GET.get("n", 3))
+    except ValueError:
+        return HttpResponseBadRequest(json.dumps({"error": "'n' must be an integer"}), content_type="application/json")
+    try:
+        tasks = store.top_tasks(portfolio, request.GET.get("strategy", "smart"), n)
+    except Portfolio.DoesNotExist:
+        return JsonResponse({"error": "Unknown portfolio"}, status=404)
+    except store.StoreError as e:
+        return HttpResponseBadRequest(json.dumps({"error": str(e)}), content_type="application/json")
+    return json_response({"portfolio": portfolio, "tasks": tasks})
+
+
+@require_http_methods(["GET"])
+def store_overdue(request, portfolio):
+    """
+    GET /api/store/<portfolio>/overdue/?limit=100
+    Returns tasks due before today, most overdue first, each with "days_overdue".
+    """
+    try:
+        limit = int(request.GET.get("limit", 100))
+    except ValueError:
+        return HttpResponseBadRequest(json.dumps({"error": "'limit' must be an integer"}), content_type="application/json")
+    try:
+        tasks = store.overdue_tasks(portfolio, limit)
+    except Portfolio.DoesNotExist:
+        return JsonResponse({"error": "Unknown portfolio"}, status=404)
+    return json_response({"portfolio": portfolio, "tasks": tasks})
@@ -0,0 +1,135 @@
+"""Tests for size-based admission control."""
+import asyncio
+import json
+import os
+import sys
+import threading
+
+import django
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings")
+sys.path.insert(0, BASE_DIR)
+django.setup()
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+
+import views
+from admission import AdmissionController, Overloaded
+
+
+def _asgi_request(method, path, body=b"", headers=()):
+    """Send one request through Django's ASGI handler; returns (status, headers, body)."""
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(name.encode(), value.encode()) for name, value in headers],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(3600)  # Nothing more to send; the handler cancels this
+    
+    async def send(message):
+        sent.append(message)
+    
+    asyncio.run(ASGIHandler()(scope, receive, send))
+    start = next(m for m in sent if m["type"] == "http.response.start")
+    content = b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body")
+    return start["status"], dict(start["headers"]), content
+
+
+class TestAdmissionController:
+    """Test the small and large executor lanes."""
+    
+    def test_small_requests_do_not_wait_for_large_ones(self):
+        """Test that a small request completes while the large lane is busy."""
+        controller = AdmissionController(large_threshold=100, large_workers=1, max_large_pending=2)
+        release = threading.Event()
+        
+        async def scenario():
+            large = asyncio.ensure_future(controller.run(1000, release.wait, 5))
+            small = await asyncio.wait_for(controller.run(10, lambda: "small"), timeout=2)
+            release.set()
+            return small, await large
+        
+        assert asyncio.run(scenario()) == ("small", True)
+    
+    def test_full_large_lane_rejects(self):
+        """Test that large requests beyond max_large_pending are refused, then admitted again."""
+        controller = AdmissionController(large_threshold=100, large_workers=1, max_large_pending=2)
+        release = threading.Event()
+        
+        async def scenario():
+            pending = [asyncio.ensure_future(controller.run(1000, release.wait, 5)) for _ in range(2)]
+            await asyncio.sleep(0)
+            with pytest.raises(Overloaded):
+                await controller.run(1000, lambda: None)
+            release.set()
+            await asyncio.gather(*pending)
+            return await controller.run(1000, lambda: "admitted")
+        
+        assert asyncio.run(scenario()) == "admitted"
+        assert controller.stats()["large_pending"] == 0
+
+
+class TestAsyncViews:
+    """Test the async analyze/suggest views end to end through the ASGI handler."""
+    
+    def test_analyze_and_suggest(self):
+        """Test that both async views answer like their sync counterparts."""
+        tasks = json.dumps([
+            {"id": "a", "title": "Write", "priority": 8, "effort": 2},
+            {"id": "b", "title": "Review", "priority": 3, "effort": 5, "dependencies": ["a"]},
+        ]).encode()
+        headers = [("content-type", "application/json"), ("content-length", str(len(tasks)))]
+        
+        status, _, body = _asgi_request("POST", "/api/tasks/analyze/", tasks, headers)
+        assert status == 200
+        assert [task["id"] for task in json.loads(body)["tasks"]] == ["a", "b"]
+        
+        status, _, body = _asgi_request("POST", "/api/tasks/suggest/", tasks, headers)
+        assert status == 200
+        assert json.loads(body)["suggestions"][0]["id"] == "a"
+    
+    def test_wrong_method_rejected(self):
+        """Test that require_http_methods wraps the async view."""
+        status, _, _ = _asgi_request("GET", "/api/tasks/analyze/")
+        assert status == 405
+    
+    def test_body_without_length_takes_large_lane(self, monkeypatch):
+        """Test that a length-less (e.g. chunked) body goes to the large lane without being read."""
+        monkeypatch.setattr(views, "_admission", AdmissionController(large_threshold=1000, max_large_pending=0))
+        tasks = json.dumps([{"id": "a"}]).encode()
+        
+        status, headers, _ = _asgi_request("POST", "/api/tasks/analyze/", tasks, [("content-type", "application/json")])
+        
+        assert status == 503
+        assert headers[b"Retry-After"] == b"1"
+    
+    def test_ndjson_beyond_upload_limit_streams(self):
+        """Test that an NDJSON body over DATA_UPLOAD_MAX_MEMORY_SIZE streams through the async route."""
+        lines = [json.dumps({"id": f"t{i}", "title": f"Task {i}", "description": "x" * 80, "priority": i % 10 + 1})
+                 for i in range(25000)]
+        body = ("\n".join(lines) + "\n").encode()
+        headers = [("content-type", "application/x-ndjson"), ("content-length", str(len(body)))]
+        
+        status, _, content = _asgi_request("POST", "/api/tasks/analyze/", body, headers)
+        
+        assert len(body) > settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+        assert status == 200
+        assert len(content.splitlines()) == 25000 + 1  # Ranked tasks plus the trailer
@@ -5,8 +5,9 @@ import django
 import json
 
 # Set up Django
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'settings')
-sys.path.insert(0, r'C:\Users\sureshraj\task-analyzer')
+sys.path.insert(0, BASE_DIR)
 django.setup()
 
 from views import analyze_tasks
@@ -18,9 +19,10 @@ class FakeRequest:
     def __init__(self, body):
         self.body = body
         self.method = 'POST'
+        self.content_type = 'application/json'
 
 # Load test data
-with open('tasks.json', 'r') as f:
+with open(os.path.join(BASE_DIR, 'tasks.json'), 'r') as f:
     test_data = f.read().encode('utf-8')
 
 # Create request
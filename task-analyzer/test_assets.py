@@ -0,0 +1,140 @@
+"""Tests for the in-memory static asset store."""
+import gzip
+import os
+
+import assets
+import pytest
+from assets import AssetStore, accepted_encodings, assets_from_settings, choose_encoding, load_asset
+
+SCRIPT = b"function analyze() { return fetch('/api/tasks/analyze/'); }\n" * 20
+
+
+@pytest.fixture
+def site(tmp_path):
+    (tmp_path / "script.js").write_bytes(SCRIPT)
+    (tmp_path / "tasks.json").write_bytes(b"[]")
+    return tmp_path
+
+
+def _touch(path, data):
+    """Rewrite path with a later mtime, so the change is seen on coarse clocks too."""
+    stat = os.stat(path)
+    path.write_bytes(data)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+class TestLoadAsset:
+    """Test cases for building asset variants."""
+    
+    def test_gzip_variant_round_trips(self, site):
+        """Test that the gzip variant decodes to the file and has its own strong ETag."""
+        asset = load_asset(str(site / "script.js"), "script.js", "application/javascript")
+        
+        identity, compressed = asset.variants["identity"], asset.variants["gzip"]
+        assert identity.body == SCRIPT
+        assert gzip.decompress(compressed.body) == SCRIPT
+        assert len(compressed.body) < len(SCRIPT)
+        assert identity.etag.startswith('"') and identity.etag.endswith('"')
+        assert compressed.etag == identity.etag[:-1] + '-gzip"'
+    
+    def test_small_files_are_not_compressed(self, site):
+        """Test that files under the threshold only have the identity variant."""
+        asset = load_asset(str(site / "tasks.json"), "tasks.json", "application/json")
+        assert list(asset.variants) == ["identity"]
+    
+    def test_etag_follows_content(self, site):
+        """Test that the ETag is stable for equal content and changes with it."""
+        first = load_asset(str(site / "script.js"), "script.js", "application/javascript")
+        again = load_asset(str(site / "script.js"), "script.js", "application/javascript")
+        (site / "script.js").write_bytes(SCRIPT + b"//")
+        changed = load_asset(str(site / "script.js"), "script.js", "application/javascript")
+        
+        assert first.etags() == again.etags()
+        assert set(first.etags()).isdisjoint(changed.etags())
+
+
+class TestNegotiation:
+    """Test cases for Accept-Encoding handling."""
+    
+    def test_parses_quality_values(self):
+        """Test q parameters, case and malformed values."""
+        assert accepted_encodings("gzip;q=0.5, BR, identity;q=bad") == {"gzip": 0.5, "br": 1.0, "identity": 0.0}
+    
+    @pytest.mark.parametrize("header, expected", [
+        ("", "identity"),
+        ("gzip, deflate", "gzip"),
+        ("gzip;q=0", "identity"),
+        ("*", "gzip"),
+        ("*, gzip;q=0", "identity"),
+        ("deflate", "identity"),
+    ])
+    def test_choose_encoding(self, site, header, expected):
+        """Test that only accepted, available variants are chosen."""
+        asset = load_asset(str(site / "script.js"), "script.js", "application/javascript")
+        assert choose_encoding(asset, header) == expected
+    
+    def test_prefers_brotli(self, site, monkeypatch):
+        """Test that brotli wins over gzip when both are built and accepted."""
+        class FakeBrotli:
+            @staticmethod
+            def compress(data, quality):
+                return b"br"
+        monkeypatch.setattr(assets, "brotli", FakeBrotli)
+        asset = load_asset(str(site / "script.js"), "script.js", "application/javascript")
+        
+        assert choose_encoding(asset, "gzip, br") == "br"
+        assert choose_encoding(asset, "gzip, br;q=0") == "gzip"
+
+
+class TestAssetStore:
+    """Test cases for lookups, conditional requests and reloading."""
+    
+    def test_only_whitelisted_existing_files(self, site):
+        """Test that unknown or missing files are not served."""
+        (site / "secrets.py").write_text("KEY = 1")
+        store = AssetStore(site)
+        
+        assert store.get("script.js").content_type == "application/javascript; charset=utf-8"
+        assert store.get("secrets.py") is None
+        assert store.get("index.html") is None
+        assert store.lookup("../settings.py") == (None, "identity", False)
+    
+    def test_if_none_match(self, site):
+        """Test that the selected variant's ETag, weak or strong, or * means not modified."""
+        store = AssetStore(site)
+        asset = store.get("script.js")
+        gzip_etag = asset.variants["gzip"].etag
+        
+        assert store.lookup("script.js", "gzip", [gzip_etag]) == (asset, "gzip", True)
+        assert store.lookup("script.js", "gzip", ["W/" + gzip_etag])[2]
+        assert store.lookup("script.js", "", ["*"])[2]
+        assert not store.lookup("script.js", "", [gzip_etag])[2]
+        assert not store.lookup("script.js", "gzip", [asset.variants["identity"].etag])[2]
+        assert not store.lookup("script.js", "", ['"stale"'])[2]
+        assert not store.lookup("script.js")[2]
+    
+    def test_files_are_read_once(self, site):
+        """Test that without reload, later edits on disk are not picked up."""
+        store = AssetStore(site)
+        _touch(site / "script.js", b"changed")
+        assert store.get("script.js").variants["identity"].body == SCRIPT
+    
+    def test_reload_picks_up_changes(self, site):
+        """Test that reload re-reads changed, created and deleted files."""
+        store = AssetStore(site, reload=True)
+        
+        _touch(site / "script.js", b"changed")
+        assert store.get("script.js").variants["identity"].body == b"changed"
+        (site / "index.html").write_bytes(b"<html></html>")
+        assert store.get("index.html").variants["identity"].body == b"<html></html>"
+        (site / "tasks.json").unlink()
+        assert store.get("tasks.json") is None
+    
+    def test_from_settings(self, site):
+        """Test the TASK_STATIC_ASSETS keys and the DEBUG default for reloading."""
+        store = assets_from_settings(site, {"MAX_AGE": 600, "MIN_COMPRESS_SIZE": 10 ** 6}, debug=True)
+        
+        assert store.reload is True
+        assert store.cache_control == "public, max-age=600"
+        assert list(store.get("script.js").variants) == ["identity"]
+        assert assets_from_settings(site).cache_control == "no-cache"
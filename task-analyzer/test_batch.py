@@ -0,0 +1,149 @@
+"""Tests for the offline batch scoring CLI."""
+import copy
+import csv
+import io
+import json
+
+import batch
+import pytest
+from batch import BatchError, load_records, main
+from bench_tasks import generate_tasks
+from scoring import score_tasks
+
+
+def _tasks():
+    tasks = generate_tasks(300, seed=11, graph="dag")
+    tasks[3]["dependencies"] = ["t4"]
+    tasks[4]["dependencies"] = ["t3"]
+    return tasks
+
+
+def _write(path, fmt, tasks):
+    if fmt == "ndjson":
+        path.write_text("".join(json.dumps(task) + "\n" for task in tasks))
+    elif fmt == "json":
+        path.write_text(json.dumps(tasks, indent=2))
+    else:
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "title", "priority", "effort", "due_date", "dependencies"])
+            for task in tasks:
+                writer.writerow([
+                    task["id"], task["title"], task["priority"], task["effort"],
+                    task.get("due_date") or "", ";".join(task["dependencies"]),
+                ])
+
+
+def _ranked(path):
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    return [line["task"] for line in lines[:-1]], lines[-1]["trailer"]
+
+
+class TestBatchCli:
+    """Test end-to-end runs of batch.main."""
+    
+    @pytest.mark.parametrize("fmt", ["ndjson", "json", "csv"])
+    def test_matches_score_tasks(self, tmp_path, fmt):
+        """Test that every input format ranks exactly like score_tasks."""
+        tasks = _tasks()
+        source = tmp_path / f"tasks.{fmt}"
+        _write(source, fmt, tasks)
+        
+        assert main([str(source), "-o", str(tmp_path / "out.ndjson"), "--strategy", "unblocker"]) == 0
+        
+        ranked, trailer = _ranked(tmp_path / "out.ndjson")
+        expected = score_tasks(copy.deepcopy(tasks), strategy="unblocker")
+        assert [(t["id"], t["raw_score"]) for t in ranked] == [(t["id"], t["raw_score"]) for t in expected]
+        assert trailer["count"] == 300
+        assert trailer["cycles"] == [["t3", "t4", "t3"]]
+    
+    def test_ndjson_output_keeps_full_tasks(self, tmp_path):
+        """Test that output lines carry the original fields plus the scores."""
+        tasks = _tasks()
+        _write(tmp_path / "tasks.ndjson", "ndjson", tasks)
+        
+        main([str(tmp_path / "tasks.ndjson"), "--mmap", "-o", str(tmp_path / "out.ndjson")])
+        
+        ranked, _ = _ranked(tmp_path / "out.ndjson")
+        assert ranked == score_tasks(copy.deepcopy(tasks))
+    
+    def test_top_k_csv_output(self, tmp_path):
+        """Test that --top-k writes only the best rows, as CSV for a .csv output."""
+        tasks = _tasks()
+        _write(tmp_path / "tasks.ndjson", "ndjson", tasks)
+        
+        main([str(tmp_path / "tasks.ndjson"), "--top-k", "5", "-o", str(tmp_path / "top.csv")])
+        
+        with open(tmp_path / "top.csv", newline="") as f:
+            rows = list(csv.DictReader(f))
+        expected = score_tasks(copy.deepcopy(tasks))[:5]
+        assert [row["id"] for row in rows] == [task["id"] for task in expected]
+        assert [row["rank"] for row in rows] == ["1", "2", "3", "4", "5"]
+        assert rows[0]["title"] == expected[0]["title"]
+        assert float(rows[0]["raw_score"]) == expected[0]["raw_score"]
+    
+    def test_custom_weights(self, tmp_path):
+        """Test that --weights ranks with a compiled weight strategy."""
+        tasks = _tasks()
+        _write(tmp_path / "tasks.ndjson", "ndjson", tasks)
+        
+        main([str(tmp_path / "tasks.ndjson"), "--weights", "effort=1", "-o", str(tmp_path / "out.ndjson")])
+        
+        ranked, _ = _ranked(tmp_path / "out.ndjson")
+        assert [t["id"] for t in ranked] == [t["id"] for t in score_tasks(copy.deepcopy(tasks), strategy="effort")]
+    
+    @pytest.mark.parametrize("args, message", [
+        (["tasks.txt"], "Cannot tell the format"),
+        (["tasks.ndjson", "--strategy", "nope"], "Unknown strategy"),
+        (["tasks.ndjson", "--weights", "speed=1"], "Unknown component"),
+    ])
+    def test_errors(self, tmp_path, capsys, args, message):
+        """Test that bad arguments exit with status 1 and a message."""
+        (tmp_path / "tasks.txt").write_text("")
+        _write(tmp_path / "tasks.ndjson", "ndjson", _tasks())
+        
+        assert main([str(tmp_path / args[0])] + args[1:]) == 1
+        assert message in capsys.readouterr().err
+
+
+class TestReaders:
+    """Test the streaming input readers."""
+    
+    def test_json_array_across_buffer_boundaries(self, tmp_path, monkeypatch):
+        """Test that tasks split across read chunks are reassembled."""
+        monkeypatch.setattr(batch, "_READ_SIZE", 7)
+        tasks = _tasks()[:40]
+        _write(tmp_path / "tasks.json", "json", tasks)
+        
+        records, store = load_records(str(tmp_path / "tasks.json"), "json")
+        with store:
+            store.seek(records[-1].source[0])
+            assert json.loads(store.read(records[-1].source[1])) == tasks[-1]
+        assert [record.id for record in records] == [task["id"] for task in tasks]
+    
+    @pytest.mark.parametrize("content, message", [
+        ('{"not": "tasks"}', "object with 'tasks'"),
+        ("[1, 2]", "must be a JSON object"),
+        ('[{"id": "a"} {"id": "b"}]', "Expected ','"),
+        ('[{"id": "a"},', "Unexpected end"),
+        ('[{"id": "a"', "Invalid JSON"),
+    ])
+    def test_invalid_json(self, tmp_path, content, message):
+        """Test that malformed JSON arrays raise BatchError."""
+        (tmp_path / "tasks.json").write_text(content)
+        with pytest.raises(BatchError, match=message):
+            load_records(str(tmp_path / "tasks.json"), "json")
+    
+    def test_csv_cells(self):
+        """Test CSV number parsing, empty cells and dependency lists."""
+        body = "id,priority,effort,due_date,dependencies,extra\na,8,2.5,,b; c,\nb,,,2030-01-01,,x\n"
+        tasks = list(batch._iter_csv_tasks(io.BytesIO(body.encode())))
+        assert tasks == [
+            {"id": "a", "priority": 8, "effort": 2.5, "dependencies": ["b", "c"]},
+            {"id": "b", "due_date": "2030-01-01", "extra": "x"},
+        ]
+    
+    def test_csv_invalid_number(self):
+        """Test that a non-numeric priority names its line."""
+        with pytest.raises(BatchError, match="line 3"):
+            list(batch._iter_csv_tasks(io.BytesIO(b"id,priority\na,1\nb,high\n")))
@@ -0,0 +1,56 @@
+"""Tests for bulk task-set analysis."""
+import copy
+from concurrent.futures import ProcessPoolExecutor
+
+from bench_tasks import generate_tasks
+from bulk import analyze_task_set, analyze_task_sets
+from scoring import score_tasks
+
+
+class TestAnalyzeTaskSets:
+    """Test analyzing several independent task sets together."""
+    
+    def setup_method(self):
+        """Build three portfolios with different graph shapes and strategies."""
+        self.sets = [
+            (generate_tasks(40, seed=1, graph="dag"), "smart"),
+            (generate_tasks(30, seed=2, graph="cycles"), "unblocker"),
+            (generate_tasks(20, seed=3, graph="none"), "urgency"),
+        ]
+    
+    def test_matches_individual_analysis(self):
+        """Test that each result equals analyzing that set on its own."""
+        expected = [analyze_task_set(copy.deepcopy(tasks), strategy) for tasks, strategy in self.sets]
+        
+        assert analyze_task_sets(copy.deepcopy(self.sets)) == expected
+        assert expected[0]["tasks"] == score_tasks(copy.deepcopy(self.sets[0][0]))
+        assert expected[1]["cycle_detected"]
+    
+    def test_failing_set_does_not_fail_the_batch(self):
+        """Test that a set with malformed tasks gets its own error entry."""
+        sets = [self.sets[0], ([{"priority": "high"}], "smart"), self.sets[2]]
+        
+        results = analyze_task_sets(sets)
+        
+        assert "tasks" in results[0] and "tasks" in results[2]
+        assert results[1]["error"] == "Scoring failed"
+    
+    def test_parallel_matches_serial(self):
+        """Test that process-pool analysis returns the serial results in order."""
+        expected = analyze_task_sets(copy.deepcopy(self.sets))
+        
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            actual = analyze_task_sets(copy.deepcopy(self.sets), executor=executor)
+        
+        assert actual == expected
+    
+    def test_parallel_failure_stays_with_its_set(self):
+        """Test that a set the pool cannot pickle gets an error entry instead of failing the batch."""
+        sets = copy.deepcopy(self.sets)
+        sets.insert(1, ([{"id": "a", "callback": lambda: None}], "smart"))
+        
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = analyze_task_sets(sets, executor=executor)
+        
+        assert results.pop(1)["error"] == "Scoring failed"
+        assert results == analyze_task_sets(copy.deepcopy(self.sets))
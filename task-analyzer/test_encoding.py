@@ -0,0 +1,60 @@
+"""Tests for gzip and columnar request-body decoding."""
+import gzip
+import io
+import json
+
+import pytest
+from encoding import EncodingError, decode_columns, gunzip, iter_gunzip_lines
+
+
+class TestGunzip:
+    """Test bounded gzip decompression."""
+    
+    def test_round_trip(self):
+        """Test that a gzip body inflates to the original bytes."""
+        body = json.dumps([{"id": str(i)} for i in range(1000)]).encode()
+        assert gunzip(gzip.compress(body)) == body
+    
+    def test_size_limit(self):
+        """Test that a body inflating past the limit is rejected."""
+        bomb = gzip.compress(b"0" * 1_000_000)
+        with pytest.raises(EncodingError, match="exceeds"):
+            gunzip(bomb, max_size=1000)
+        assert len(gunzip(bomb, max_size=1_000_000)) == 1_000_000
+    
+    @pytest.mark.parametrize("body", [b"not gzip", gzip.compress(b"x" * 100)[:-12]])
+    def test_invalid_bodies(self, body):
+        """Test that corrupt and truncated bodies raise EncodingError."""
+        with pytest.raises(EncodingError):
+            gunzip(body)
+    
+    def test_lines_are_streamed(self):
+        """Test that NDJSON lines survive chunk boundaries."""
+        lines = [json.dumps({"id": str(i), "title": "x" * (i % 50)}).encode() + b"\n" for i in range(20000)]
+        stream = io.BytesIO(gzip.compress(b"".join(lines)))
+        
+        assert list(iter_gunzip_lines(stream)) == lines
+
+
+class TestDecodeColumns:
+    """Test the compact columnar task encoding."""
+    
+    def test_columns_become_tasks(self):
+        """Test that rows are rebuilt and nulls fall back to defaults."""
+        tasks = decode_columns({
+            "id": ["a", "b"],
+            "priority": [8, None],
+            "due_date": ["2025-01-10", None],
+            "dependencies": [[], ["a"]],
+        })
+        
+        assert tasks == [
+            {"id": "a", "priority": 8, "due_date": "2025-01-10", "dependencies": []},
+            {"id": "b", "dependencies": ["a"]},
+        ]
+    
+    @pytest.mark.parametrize("columns", [[1, 2], {"id": "a"}, {"id": ["a"], "priority": [1, 2]}])
+    def test_malformed_columns(self, columns):
+        """Test that non-list and ragged columns are rejected."""
+        with pytest.raises(EncodingError):
+            decode_columns(columns)
@@ -0,0 +1,86 @@
+"""Tests for the HTTP load-test harness."""
+import json
+import os
+
+import bench_load
+import pytest
+from bench_load import Payload, Sample, build_mix, compare, percentile, summarize
+
+
+def _sample(status="200", latency=0.01, endpoint="analyze", size=10):
+    return Sample(Payload(endpoint, bench_load.ENDPOINTS[endpoint], size, "smart", b""), status, latency)
+
+
+class TestStatistics:
+    """Test cases for the latency and error summaries."""
+    
+    def test_percentile_nearest_rank(self):
+        """Test nearest-rank percentiles on small and empty lists."""
+        values = list(range(1, 101))
+        assert (percentile(values, 50), percentile(values, 95), percentile(values, 99)) == (50, 95, 99)
+        assert percentile([7.0], 99) == 7.0
+        assert percentile([], 50) == 0.0
+    
+    def test_summarize(self):
+        """Test throughput, percentiles, error rate and status counts."""
+        samples = [_sample(latency=i / 1000) for i in range(1, 99)]
+        samples += [_sample("500", 0.2), _sample("ConnectionResetError", 0.3)]
+        
+        summary = summarize(samples, elapsed=2.0)
+        
+        assert summary["requests"] == 100
+        assert summary["throughput_rps"] == 50.0
+        assert (summary["errors"], summary["error_rate"]) == (2, 0.02)
+        assert summary["latency_ms"]["p50"] == 50.0
+        assert summary["latency_ms"]["max"] == 300.0
+        assert summary["status"] == {"200": 98, "500": 1, "ConnectionResetError": 1}
+    
+    def test_compare_flags_slowdowns_and_new_errors(self):
+        """Test that p95 growth beyond the threshold or new errors are regressions."""
+        def level(p95, error_rate=0.0):
+            stats = {"latency_ms": {"p95": p95}, "error_rate": error_rate}
+            return {"concurrency": 4, "endpoints": {"analyze": stats}}
+        
+        assert not compare([level(11.0)], [level(10.0)], 1.2)[0]["regression"]
+        assert compare([level(13.0)], [level(10.0)], 1.2)[0]["regression"]
+        assert compare([level(10.0, 0.01)], [level(10.0)], 1.2)[0]["regression"]
+        assert compare([dict(level(10.0), concurrency=8)], [level(10.0)], 1.2) == []
+
+
+class TestRequestMix:
+    """Test cases for payload generation."""
+    
+    def test_every_combination_is_prebuilt(self):
+        """Test that the mix covers each endpoint, size and strategy with a valid body."""
+        mix = build_mix([5, 20], ["smart", "effort"], ["analyze", "suggest"])
+        
+        assert len(mix) == 8
+        assert {(p.endpoint, p.size, p.strategy) for p in mix} == {
+            (e, n, s) for e in ("analyze", "suggest") for n in (5, 20) for s in ("smart", "effort")
+        }
+        body = json.loads(mix[0].body)
+        assert len(body["tasks"]) == mix[0].size
+        assert body["tasks"][0]["title"] == bench_load._NONCE.decode()
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="RSS sampling reads /proc")
+class TestLoadRun:
+    """Test a short run against a real local server."""
+    
+    def test_run_level_against_wsgiref(self):
+        """Test that a booted server is driven, measured and stopped."""
+        process, url = bench_load.start_server("wsgiref", "settings_api")
+        try:
+            sampler = bench_load.RSSSampler(process.pid, interval=0.1)
+            sampler.start()
+            samples, elapsed = bench_load.run_level(url, build_mix([10], ["smart"], ["analyze", "suggest"]),
+                                                    concurrency=2, duration=5, max_requests=20)
+            report = bench_load.level_report(2, samples, elapsed, sampler.stop())
+        finally:
+            bench_load.stop_server(process)
+        
+        assert report["requests"] == 20
+        assert report["errors"] == 0
+        assert set(report["endpoints"]) == {"analyze", "suggest"}
+        assert report["rss_mb"]["peak"] > 0
+        assert process.returncode is not None
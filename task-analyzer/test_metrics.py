@@ -0,0 +1,66 @@
+"""Tests for stage timers, counters and the Prometheus rendering."""
+import metrics
+from bench_tasks import generate_tasks
+from metrics import Registry, Timings
+from scoring import score_tasks
+
+
+class TestStageTimers:
+    """Test per-request stage collection."""
+    
+    def setup_method(self):
+        """Start every test from an empty registry."""
+        metrics.REGISTRY.reset()
+    
+    def test_stages_are_noops_outside_a_sampled_request(self):
+        """Test that nothing is recorded without an active collector."""
+        with metrics.stage("parse"):
+            pass
+        assert not metrics.active()
+        assert "stage_seconds_sum" not in metrics.REGISTRY.render()
+    
+    def test_scoring_stages_are_collected(self):
+        """Test that score_tasks reports its stages and counts the tasks scored."""
+        with metrics.collect() as timings:
+            score_tasks(generate_tasks(50))
+        
+        assert {"unlocks", "urgency", "score", "sort", "write"} <= set(timings.stages)
+        assert "task_analyzer_tasks_scored_total 50" in metrics.REGISTRY.render()
+    
+    def test_unsampled_collect_yields_none(self):
+        """Test that a disabled collector records no stages."""
+        with metrics.collect(False) as timings:
+            score_tasks(generate_tasks(5))
+        assert timings is None
+    
+    def test_sampling_rate_bounds(self):
+        """Test that rates of 0 and 1 never and always sample."""
+        assert not any(metrics.sampled(0) for _ in range(100))
+        assert all(metrics.sampled(1) for _ in range(100))
+
+
+class TestRendering:
+    """Test the Server-Timing and Prometheus output formats."""
+    
+    def test_server_timing(self):
+        """Test that stage durations are reported in milliseconds."""
+        timings = Timings()
+        timings.add("parse", 0.0015)
+        timings.add("parse", 0.0005)
+        timings.add("score", 0.25)
+        assert timings.server_timing() == "parse;dur=2.000, score;dur=250.000"
+    
+    def test_prometheus_text(self):
+        """Test summaries, labelled counters and extra samples."""
+        registry = Registry()
+        registry.observe("cycles", 0.5)
+        registry.observe("cycles", 0.25)
+        registry.inc("requests", endpoint="analyze")
+        registry.inc("requests", 2, endpoint="suggest")
+        
+        text = registry.render([("result_cache_hits_total", "counter", "Hits", 7)])
+        
+        assert 'task_analyzer_stage_seconds_sum{stage="cycles"} 0.750000' in text
+        assert 'task_analyzer_stage_seconds_count{stage="cycles"} 2' in text
+        assert 'task_analyzer_requests_total{endpoint="suggest"} 2' in text
+        assert "# TYPE task_analyzer_result_cache_hits_total counter\ntask_analyzer_result_cache_hits_total 7\n" in text
@@ -0,0 +1,76 @@
+"""Tests for multi-core batch scoring."""
+import copy
+from datetime import timedelta
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+import scoring
+from bench_tasks import generate_tasks
+from parallel import score_tasks_parallel
+from scoring import compute_schedule, score_tasks
+from strategies import from_weights
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+class TestScoreTasksParallel:
+    """Test that the process-pool path matches serial scoring exactly."""
+    
+    @pytest.mark.parametrize("strategy", ["smart", "urgency", "effort", "importance", "unblocker"])
+    def test_matches_serial(self, executor, strategy):
+        """Test identical dicts and ordering, including ties across chunks."""
+        tasks = generate_tasks(500, seed=7, graph="dag")
+        expected = score_tasks(copy.deepcopy(tasks), strategy=strategy)
+        
+        actual = score_tasks_parallel(
+            copy.deepcopy(tasks), strategy=strategy, workers=2, chunk_size=37,
+            executor=executor, min_tasks=0,
+        )
+        
+        assert actual == expected
+    
+    def test_critical_path_boost_matches_serial(self, executor):
+        """Test that workers apply the smart strategy's critical-path boost."""
+        tasks = generate_tasks(500, seed=5, graph="dag")
+        schedule = compute_schedule(tasks)
+        expected = score_tasks(copy.deepcopy(tasks), schedule=schedule)
+        
+        actual = score_tasks_parallel(
+            copy.deepcopy(tasks), workers=2, chunk_size=64, executor=executor, min_tasks=0,
+            schedule=schedule,
+        )
+        
+        assert actual == expected
+        assert expected != score_tasks(copy.deepcopy(tasks))
+    
+    def test_custom_weights_reach_workers(self, executor):
+        """Test that a compiled weight strategy is rebuilt in the workers."""
+        tasks = generate_tasks(300, seed=9, graph="dag")
+        strategy = from_weights({"urgency": 0.2, "dependency": 0.8})
+        expected = score_tasks(copy.deepcopy(tasks), strategy=strategy)
+        
+        actual = score_tasks_parallel(copy.deepcopy(tasks), strategy=strategy, executor=executor, chunk_size=50, min_tasks=0)
+        
+        assert actual == expected
+    
+    def test_small_inputs_run_serially(self):
+        """Test that inputs below the threshold never touch a pool."""
+        tasks = [{"title": "A"}, {"title": "B", "priority": 9}]
+        assert score_tasks_parallel(tasks, workers=4)[0]["id"] == "task_1"
+    
+    def test_workers_use_the_parent_holiday_calendar(self, executor):
+        """Test that holidays set after the pool started still reach the workers."""
+        tasks = generate_tasks(200, seed=3, due_spread="near", graph="none")
+        today = scoring.datetime.now().date()
+        scoring.set_holidays([today + timedelta(days=offset) for offset in range(1, 8)])
+        try:
+            expected = score_tasks(copy.deepcopy(tasks))
+            actual = score_tasks_parallel(copy.deepcopy(tasks), executor=executor, chunk_size=50, min_tasks=0)
+        finally:
+            scoring.set_holidays([])
+        
+        assert actual == expected
@@ -0,0 +1,145 @@
+"""Tests for opt-in per-request profiling."""
+import os
+import pstats
+import tracemalloc
+
+import pytest
+from profiling import META_FILE, SNAPSHOT_FILE, STATS_FILE, Profiler, payload_shape, profiler_from_settings
+
+TOKEN = "s3cret"
+
+
+class Response:
+    status_code = 200
+
+
+def _work():
+    data = [list(range(100)) for _ in range(200)]
+    return Response() if data else None
+
+
+class TestTrust:
+    """Test cases for deciding who may profile."""
+    
+    def test_requires_enabled_flag_and_trusted_address(self, tmp_path):
+        """Test that all three conditions are needed."""
+        profiler = Profiler(tmp_path, enabled=True, token=TOKEN)
+        local = {"REMOTE_ADDR": "127.0.0.1", "HTTP_X_PROFILE": "1", "HTTP_X_PROFILE_TOKEN": TOKEN}
+        
+        assert profiler.wanted(local, {})
+        assert profiler.wanted({"REMOTE_ADDR": "::1", "HTTP_X_PROFILE_TOKEN": TOKEN}, {"debug": "profile"})
+        assert not profiler.wanted(dict(local, HTTP_X_PROFILE="0"), {"debug": "timing"})
+        assert not profiler.wanted(dict(local, REMOTE_ADDR="203.0.113.9"), {})
+        assert not Profiler(tmp_path).wanted(local, {})
+    
+    def test_token_required_when_enabled(self, tmp_path):
+        """Test that the loopback check alone never trusts a caller."""
+        with pytest.raises(ValueError):
+            Profiler(tmp_path, enabled=True)
+        with pytest.raises(ValueError):
+            profiler_from_settings({"ENABLED": True, "DIRECTORY": str(tmp_path)})
+        assert not Profiler(tmp_path).trusted({"REMOTE_ADDR": "127.0.0.1"})
+    
+    def test_token(self, tmp_path):
+        """Test that the token must be sent in X-Profile-Token."""
+        profiler = Profiler(tmp_path, enabled=True, trusted_ips=["10.0.0.5"], token=TOKEN)
+        
+        assert profiler.trusted({"REMOTE_ADDR": "10.0.0.5", "HTTP_X_PROFILE_TOKEN": "s3cret"})
+        assert not profiler.trusted({"REMOTE_ADDR": "10.0.0.5", "HTTP_X_PROFILE_TOKEN": "wrong"})
+        assert not profiler.trusted({"REMOTE_ADDR": "10.0.0.5"})
+        assert not profiler.trusted({"REMOTE_ADDR": "127.0.0.1", "HTTP_X_PROFILE_TOKEN": "s3cret"})
+
+
+class TestCapture:
+    """Test cases for recording and reading captures."""
+    
+    def test_capture_files_and_metadata(self, tmp_path):
+        """Test that stats, snapshot and metadata are written and listed."""
+        profiler = Profiler(tmp_path, enabled=True, token=TOKEN)
+        
+        response, capture_id = profiler.capture("analyze", _work, {"shape": {"tasks": 3}})
+        
+        assert response.status_code == 200
+        assert sorted(os.listdir(tmp_path / capture_id)) == sorted([META_FILE, SNAPSHOT_FILE, STATS_FILE])
+        assert any(name == "_work" for _, _, name in pstats.Stats(str(tmp_path / capture_id / STATS_FILE)).stats)
+        meta = profiler.captures()[0]
+        assert (meta["id"], meta["endpoint"], meta["status"], meta["error"]) == (capture_id, "analyze", 200, None)
+        assert meta["tracemalloc_peak_bytes"] > 0
+        assert meta["shape"] == {"tasks": 3}
+        assert not tracemalloc.is_tracing()
+    
+    def test_detail(self, tmp_path):
+        """Test the function and allocation summaries, and that bad ids are refused."""
+        profiler = Profiler(tmp_path, enabled=True, token=TOKEN)
+        _, capture_id = profiler.capture("suggest", _work)
+        
+        detail = profiler.detail(capture_id, top=5)
+        
+        assert detail["id"] == capture_id
+        assert 0 < len(detail["functions"]) <= 5
+        assert detail["functions"][0]["cumtime_ms"] >= detail["functions"][-1]["cumtime_ms"]
+        assert any("_work" in row["function"] for row in detail["functions"])
+        assert all(row["size_bytes"] > 0 for row in detail["allocations"])
+        assert profiler.detail("../" + capture_id) is None
+        assert profiler.detail("20000101-000000000000-00000000") is None
+    
+    def test_errors_are_captured_and_reraised(self, tmp_path):
+        """Test that a failing view still leaves a capture behind."""
+        profiler = Profiler(tmp_path, enabled=True, token=TOKEN)
+        
+        def fail():
+            raise RuntimeError("boom")
+        
+        with pytest.raises(RuntimeError):
+            profiler.capture("analyze", fail)
+        assert profiler.captures()[0]["error"] == "RuntimeError('boom')"
+        assert not tracemalloc.is_tracing()
+    
+    def test_one_capture_at_a_time(self, tmp_path):
+        """Test that a nested request is served without a capture."""
+        profiler = Profiler(tmp_path, enabled=True, token=TOKEN)
+        inner = []
+        
+        profiler.capture("analyze", lambda: inner.append(profiler.capture("suggest", _work)))
+        
+        assert inner[0][0].status_code == 200
+        assert inner[0][1] is None
+        assert [meta["endpoint"] for meta in profiler.captures()] == ["analyze"]
+    
+    def test_keeps_newest_captures(self, tmp_path):
+        """Test that only MAX_CAPTURES captures are kept, newest first."""
+        profiler = profiler_from_settings({"ENABLED": True, "TOKEN": TOKEN, "DIRECTORY": str(tmp_path), "MAX_CAPTURES": 2})
+        ids = [profiler.capture("analyze", _work)[1] for _ in range(4)]
+        
+        assert [meta["id"] for meta in profiler.captures()] == ids[:1:-1]
+        assert profiler.captures(limit=1)[0]["id"] == ids[-1]
+    
+    def test_leaves_existing_tracing_running(self, tmp_path):
+        """Test that tracemalloc started by someone else is not stopped."""
+        tracemalloc.start()
+        try:
+            Profiler(tmp_path, enabled=True, token=TOKEN).capture("analyze", _work)
+            assert tracemalloc.is_tracing()
+        finally:
+            tracemalloc.stop()
+
+
+class TestPayloadShape:
+    """Test cases for payload metadata."""
+    
+    def test_shape(self):
+        """Test counts, dependency edges and field names, without any values."""
+        tasks = [
+            {"id": "a", "title": "Secret plan", "due_date": "2030-01-01"},
+            {"id": "b", "dependencies": ["a"], "notes": "x"},
+            {"id": "b", "dependencies": ["a", "b", "c"]},
+            "not a task",
+        ]
+        assert payload_shape(tasks) == {
+            "tasks": 4,
+            "unique_ids": 2,
+            "with_due_date": 1,
+            "dependency_edges": 4,
+            "max_dependencies": 3,
+            "fields": ["dependencies", "due_date", "id", "notes", "title"],
+        }
@@ -0,0 +1,74 @@
+"""Tests for the analyze/suggest response cache."""
+import scoring
+from result_cache import InProcessBackend, ResultCache, cache_from_settings
+
+
+class TestCacheKey:
+    """Test cases for canonical request hashing."""
+    
+    def setup_method(self):
+        self.cache = ResultCache(InProcessBackend())
+    
+    def teardown_method(self):
+        scoring.set_holidays([])
+    
+    def test_field_order_does_not_matter(self):
+        """Test that equivalent payloads share a key."""
+        a = [{"id": "1", "priority": 3, "effort": 2}]
+        b = [{"effort": 2, "priority": 3, "id": "1"}]
+        assert self.cache.key("analyze", a, "smart") == self.cache.key("analyze", b, "smart")
+    
+    def test_strategy_params_and_kind_change_the_key(self):
+        """Test that anything affecting the response is part of the key."""
+        tasks = [{"id": "1"}]
+        keys = {
+            self.cache.key("analyze", tasks, "smart"),
+            self.cache.key("analyze", tasks, "effort"),
+            self.cache.key("suggest", tasks, "smart", k=3),
+            self.cache.key("suggest", tasks, "smart", k=5),
+            self.cache.key("analyze", [{"id": "2"}], "smart"),
+        }
+        assert len(keys) == 5
+    
+    def test_holiday_calendar_changes_the_key(self):
+        """Test that urgency inputs other than the tasks are covered."""
+        before = self.cache.key("analyze", [], "smart")
+        scoring.set_holidays(["2030-01-01"])
+        assert self.cache.key("analyze", [], "smart") != before
+
+
+class TestInProcessBackend:
+    """Test cases for LRU/TTL eviction and counters."""
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        backend = InProcessBackend(max_entries=2)
+        backend.set("a", b"1")
+        backend.set("b", b"2")
+        backend.get("a")
+        backend.set("c", b"3")
+        
+        assert backend.get("b") is None
+        assert backend.get("a") == b"1"
+        assert backend.get("c") == b"3"
+    
+    def test_ttl_expiry(self):
+        """Test that expired entries are not returned."""
+        backend = InProcessBackend(ttl_seconds=-1)
+        backend.set("a", b"1")
+        assert backend.get("a") is None
+    
+    def test_hit_and_miss_counters(self):
+        """Test the cache statistics."""
+        cache = cache_from_settings({"MAX_ENTRIES": 10})
+        cache.get("k")
+        cache.set("k", b"body")
+        cache.get("k")
+        
+        assert cache.stats() == {"hits": 1, "misses": 1}
+    
+    def test_disabled_cache(self):
+        """Test that a disabled cache never stores or returns entries."""
+        cache = cache_from_settings({"ENABLED": False})
+        cache.set("k", b"body")
+        assert cache.get("k") is None
@@ -1,7 +1,7 @@
 """Tests for the task scoring module."""
 import pytest
 from datetime import datetime, timedelta
-from scoring import score_tasks, detect_cycles, _calculate_urgency
+from scoring import score_tasks, top_k_tasks, compare_strategies, detect_cycles, analyze_dependencies, calculate_unlocks, compute_schedule, _calculate_urgency, _business_days_between, set_holidays
 
 
 class TestScoreTasks:
@@ -172,6 +172,54 @@ class TestCalculateUrgency:
         """Test urgency with invalid date format."""
         urgency = _calculate_urgency("invalid-date")
         assert urgency == 0.3
+    
+    def test_urgency_uses_business_days(self):
+        """Test that weekends do not count towards the urgency tiers."""
+        friday = datetime(2026, 1, 2).date()
+        # Friday -> next Wednesday is 5 calendar days but only 3 business days
+        assert _calculate_urgency("2026-01-07", today=friday) == 0.8
+        # Friday -> Friday two weeks out is 14 calendar days but 10 business days
+        assert _calculate_urgency("2026-01-16", today=friday) == 0.4
+
+
+class TestBusinessDays:
+    """Test cases for the closed-form business-day counter."""
+    
+    def teardown_method(self):
+        set_holidays([])
+    
+    def test_matches_day_by_day_count(self):
+        """Test closed-form count against a naive day-by-day walk."""
+        base = datetime(2026, 3, 1).date()
+        for offset in range(7):
+            start = base + timedelta(days=offset)
+            for span in range(0, 45):
+                end = start + timedelta(days=span)
+                expected = sum(
+                    1 for d in range(span) if (start + timedelta(days=d)).weekday() < 5
+                )
+                assert _business_days_between(start, end) == expected
+    
+    def test_far_future_due_date(self):
+        """Test that distant due dates are counted without iterating."""
+        start = datetime(2026, 1, 5).date()  # Monday
+        end = datetime(2036, 1, 5).date()  # 521 weeks and 5 days later
+        assert _business_days_between(start, end) == 521 * 5 + 5
+    
+    def test_holidays_are_excluded(self):
+        """Test that weekday holidays reduce the count and weekend holidays are ignored."""
+        start = datetime(2026, 12, 21).date()  # Monday
+        end = datetime(2026, 12, 28).date()
+        assert _business_days_between(start, end) == 5
+        set_holidays(["2026-12-25", "2026-12-26"])  # Friday, Saturday
+        assert _business_days_between(start, end) == 4
+    
+    def test_holidays_reset_urgency_cache(self):
+        """Test that changing the calendar invalidates memoized urgencies."""
+        monday = datetime(2026, 12, 21).date()
+        assert _calculate_urgency("2026-12-28", today=monday) == 0.6
+        set_holidays(["2026-12-24", "2026-12-25"])
+        assert _calculate_urgency("2026-12-28", today=monday) == 0.8
 
 
 # ============================================
@@ -376,3 +424,439 @@ class TestScoreConsistency:
         assert scores == sorted(scores, reverse=True)
 
 
+class TestNumpyBackend:
+    """Test that the columnar backend matches the per-task loop exactly."""
+    
+    def _tasks(self):
+        today = datetime.now().date()
+        tasks = []
+        for i in range(60):
+            due = None
+            if i % 5:
+                due = (today + timedelta(days=(i * 7) % 90 - 10)).strftime("%Y-%m-%d")
+            elif i % 10 == 0:
+                due = "not-a-date"
+            deps = [str(i // 2)] if i > 1 and i % 3 else []
+            tasks.append({
+                "id": str(i), "priority": (i * 3) % 10 + 1, "effort": (i * 7) % 10 + 1,
+                "due_date": due, "dependencies": deps,
+            })
+        tasks.append({"title": "Defaults only"})
+        return tasks
+    
+    @pytest.mark.parametrize("strategy", ["smart", "urgency", "effort", "importance", "unblocker"])
+    def test_matches_python_backend(self, strategy):
+        """Test identical scores, components and ordering for every strategy."""
+        pytest.importorskip("numpy")
+        expected = score_tasks(self._tasks(), strategy=strategy)
+        actual = score_tasks(self._tasks(), strategy=strategy, backend="numpy")
+        assert actual == expected
+    
+    def test_empty_task_list(self):
+        """Test scoring an empty task list with the numpy backend."""
+        pytest.importorskip("numpy")
+        assert score_tasks([], backend="numpy") == []
+
+
+class TestAnalyzeDependencies:
+    """Test cases for the iterative SCC-based dependency analysis."""
+    
+    def test_deep_chain_does_not_recurse(self):
+        """Test a dependency chain deeper than the recursion limit."""
+        depth = 20000
+        tasks = [{"id": str(i), "dependencies": [str(i + 1)]} for i in range(depth)]
+        tasks[-1]["dependencies"] = ["0"]
+        
+        has_cycle, cycles = detect_cycles(tasks)
+        
+        assert has_cycle is True
+        assert len(cycles) == 1
+        assert len(cycles[0]) == depth + 1
+    
+    def test_reports_every_cycle(self):
+        """Test that cycles reachable from the same DFS tree are all reported."""
+        tasks = [
+            {"id": "a", "dependencies": ["b", "c"]},
+            {"id": "b", "dependencies": ["a"]},
+            {"id": "c", "dependencies": ["d"]},
+            {"id": "d", "dependencies": ["c"]},
+            {"id": "e", "dependencies": ["e", "a"]},
+        ]
+        
+        result = analyze_dependencies(tasks)
+        
+        assert sorted(sorted(c) for c in result.cyclic_components) == [["a", "b"], ["c", "d"], ["e"]]
+        assert len(result.cycles) == 3
+    
+    def test_representative_cycles_follow_edges(self):
+        """Test that each representative cycle is a closed walk along dependencies."""
+        tasks = [
+            {"id": "1", "dependencies": ["2"]},
+            {"id": "2", "dependencies": ["3", "1"]},
+            {"id": "3", "dependencies": ["1"]},
+        ]
+        
+        result = analyze_dependencies(tasks)
+        
+        for cycle in result.cycles:
+            assert cycle[0] == cycle[-1]
+            for node, dep in zip(cycle, cycle[1:]):
+                assert dep in result.graph[node]
+    
+    def test_dangling_dependencies(self):
+        """Test that references to unknown tasks are reported once each."""
+        tasks = [
+            {"id": "1", "dependencies": ["99", "2"]},
+            {"id": "2", "dependencies": ["99", "98"]},
+        ]
+        
+        result = analyze_dependencies(tasks)
+        
+        assert result.cycles == []
+        assert result.dangling == ["99", "98"]
+
+
+class TestDependencyUnlocking:
+    """Test cases for the dependency unlocking component."""
+    
+    def test_counts_direct_and_transitive_dependents(self):
+        """Test unlock counts along a chain with a side branch."""
+        tasks = [
+            {"id": "a", "dependencies": []},
+            {"id": "b", "dependencies": ["a"]},
+            {"id": "c", "dependencies": ["b"]},
+            {"id": "d", "dependencies": ["a", "a"]},  # Duplicate edge counts once
+            {"id": "e", "dependencies": ["missing"]},
+        ]
+        
+        assert calculate_unlocks(tasks) == [3, 1, 0, 0, 0]
+    
+    def test_cycles_do_not_hang(self):
+        """Test that cyclic graphs terminate and still credit acyclic dependents."""
+        tasks = [
+            {"id": "a", "dependencies": ["b"]},
+            {"id": "b", "dependencies": ["a"]},
+            {"id": "c", "dependencies": ["a"]},
+        ]
+        
+        assert calculate_unlocks(tasks) == [1, 0, 0]
+    
+    def test_linear_on_large_graph(self):
+        """Test a wide, deep graph with 100k edges."""
+        tasks = [{"id": str(i), "dependencies": [str(i - 1)] if i else []} for i in range(50000)]
+        tasks += [{"id": f"x{i}", "dependencies": [str(i)]} for i in range(50000)]
+        
+        unlocks = calculate_unlocks(tasks)
+        
+        assert unlocks[0] == 49999 + 50000
+        assert unlocks[49999] == 1
+    
+    @staticmethod
+    def _layered(layers):
+        """Two tasks per layer, each depending on both tasks of the layer before."""
+        return [
+            {"id": f"{layer}-{k}", "dependencies": [f"{layer - 1}-0", f"{layer - 1}-1"] if layer else []}
+            for layer in range(layers)
+            for k in range(2)
+        ]
+    
+    def test_shared_dependents_counted_once(self):
+        """Test that a layered DAG counts each downstream task once, not once per path."""
+        unlocks = calculate_unlocks(self._layered(40))
+        
+        assert unlocks[:4] == [78, 78, 76, 76]
+        assert unlocks[-2:] == [0, 0]
+    
+    def test_large_shared_counts_are_estimated(self):
+        """Test that counts beyond the sample size stay close to the distinct count."""
+        layers = 1100
+        unlocks = calculate_unlocks(self._layered(layers))
+        
+        for layer in (0, 100, 500, 1000):
+            exact = 2 * (layers - layer - 1)
+            assert abs(unlocks[2 * layer] - exact) <= 0.3 * exact
+        assert max(unlocks) < 2 * layers * 1.3
+        assert unlocks[-2:] == [0, 0]
+    
+    def test_layered_dag_numpy_backend(self):
+        """Test that deep diamond-heavy graphs score on the numpy backend."""
+        pytest.importorskip("numpy")
+        
+        scored = score_tasks(self._layered(1100), strategy="unblocker", backend="numpy")
+        
+        assert scored[0]["components"]["dependency"] == 1.0
+        assert {t["id"] for t in scored[-2:]} == {"1099-0", "1099-1"}
+    
+    def test_component_is_exposed(self):
+        """Test that the dependency component is normalized and reported."""
+        tasks = [
+            {"id": "1", "dependencies": []},
+            {"id": "2", "dependencies": ["1"]},
+        ]
+        
+        scored = {t["id"]: t for t in score_tasks(tasks)}
+        
+        assert scored["1"]["components"]["dependency"] == 1.0
+        assert scored["2"]["components"]["dependency"] == 0.0
+    
+    def test_unblocker_strategy(self):
+        """Test that the unblocker strategy ranks blocking tasks first."""
+        tasks = [
+            {"id": "leaf", "priority": 10, "effort": 1, "dependencies": ["root"]},
+            {"id": "root", "priority": 1, "effort": 10, "dependencies": []},
+        ]
+        
+        scored = score_tasks(tasks, strategy="unblocker")
+        
+        assert scored[0]["id"] == "root"
+    
+    def test_smart_unchanged_without_dependencies(self):
+        """Test that smart scores are the plain weighted sum when nothing is blocked."""
+        tasks = [{"id": "1", "priority": 10, "effort": 5, "due_date": None}]
+        
+        scored = score_tasks(tasks, strategy="smart")
+        
+        assert scored[0]["raw_score"] == (0.3 * 0.4) + (1.0 * 0.4) + (0.0 * 0.2)
+
+
+class TestTopKTasks:
+    """Test cases for heap-based top-k selection."""
+    
+    def _tasks(self):
+        today = datetime.now().date()
+        return [
+            {
+                "id": str(i),
+                "priority": (i * 7) % 10 + 1,
+                "effort": (i * 3) % 10 + 1,
+                "due_date": (today + timedelta(days=i % 20)).strftime("%Y-%m-%d"),
+                "dependencies": [str(i - 1)] if i % 4 else [],
+            }
+            for i in range(40)
+        ]
+    
+    @pytest.mark.parametrize("strategy", ["smart", "urgency", "effort", "importance", "unblocker"])
+    def test_matches_full_sort(self, strategy):
+        """Test that top-k equals the head of the fully sorted list, ties included."""
+        expected = score_tasks(self._tasks(), strategy=strategy)[:5]
+        assert top_k_tasks(self._tasks(), k=5, strategy=strategy) == expected
+    
+    def test_only_winners_are_mutated(self):
+        """Test that unselected tasks are left untouched."""
+        tasks = [{"title": "A", "priority": 1}, {"title": "B", "priority": 9}, {"title": "C"}]
+        
+        top = top_k_tasks(tasks, k=1, strategy="importance")
+        
+        assert top[0]["id"] == "task_1"
+        assert "score" in top[0]
+        assert tasks[0] == {"title": "A", "priority": 1}
+        assert tasks[2] == {"title": "C"}
+    
+    def test_k_larger_than_list(self):
+        """Test that k beyond the list size returns everything."""
+        assert len(top_k_tasks(self._tasks(), k=100)) == 40
+    
+    def test_empty_and_zero_k(self):
+        """Test degenerate inputs."""
+        assert top_k_tasks([], k=3) == []
+        assert top_k_tasks(self._tasks(), k=0) == []
+
+
+class TestCompareStrategies:
+    """Test cases for scoring once and ranking under several strategies."""
+    
+    def test_rankings_match_score_tasks(self):
+        """Test that every ranking and score equals a separate score_tasks run, ties included."""
+        names = ["smart", "urgency", "effort", "importance", "unblocker"]
+        tasks = TestTopKTasks()._tasks()
+        
+        comparison = compare_strategies(tasks, names)
+        
+        assert comparison.strategies == names
+        assert [task["id"] for task in comparison.tasks] == [str(i) for i in range(40)]
+        for name in names:
+            expected = score_tasks(TestTopKTasks()._tasks(), strategy=name)
+            ranked = [comparison.tasks[i] for i in comparison.rankings[name]]
+            assert [task["id"] for task in ranked] == [task["id"] for task in expected]
+            assert [task["scores"][name] for task in ranked] == [task["raw_score"] for task in expected]
+    
+    def test_tasks_scored_with_first_strategy(self):
+        """Test that the usual score fields follow the first strategy."""
+        comparison = compare_strategies(TestTopKTasks()._tasks(), ["effort", "smart"])
+        expected = {task["id"]: task for task in score_tasks(TestTopKTasks()._tasks(), strategy="effort")}
+        for task in comparison.tasks:
+            del task["scores"]
+            assert task == expected[task["id"]]
+    
+    def test_custom_and_repeated_strategies(self):
+        """Test Strategy objects, and that repeats are ranked once."""
+        from strategies import from_weights
+        custom = from_weights({"effort": 1.0})
+        
+        comparison = compare_strategies(TestTopKTasks()._tasks(), ["urgency", custom, "urgency"])
+        
+        assert comparison.strategies == ["urgency", str(custom)]
+        assert comparison.rankings[str(custom)] == [
+            int(task["id"]) for task in score_tasks(TestTopKTasks()._tasks(), strategy="effort")
+        ]
+    
+    def test_unknown_strategy(self):
+        """Test that unknown names raise instead of falling back to smart."""
+        from strategies import StrategyError
+        with pytest.raises(StrategyError):
+            compare_strategies(TestTopKTasks()._tasks(), ["smart", "nope"])
+    
+    def test_empty_tasks(self):
+        """Test that an empty task list gives empty rankings."""
+        comparison = compare_strategies([], ["smart", "effort"])
+        assert comparison.tasks == []
+        assert comparison.rankings == {"smart": [], "effort": []}
+
+
+class TestComputeSchedule:
+    """Test cases for the critical-path schedule."""
+    
+    def _tasks(self):
+        # a -> b -> d is the long chain (2 + 5 + 1); c runs beside b with 2 units of slack
+        return [
+            {"id": "a", "effort": 2, "dependencies": []},
+            {"id": "b", "effort": 5, "dependencies": ["a"]},
+            {"id": "c", "effort": 3, "dependencies": ["a"]},
+            {"id": "d", "effort": 1, "dependencies": ["b", "c"]},
+            {"id": "e", "effort": 4, "dependencies": []},
+        ]
+    
+    def test_forward_and_backward_pass(self):
+        """Test earliest/latest times and slack on a small DAG."""
+        schedule = compute_schedule(self._tasks())
+        
+        assert schedule.duration == 8
+        assert schedule.earliest_start == {"a": 0, "e": 0, "b": 2, "c": 2, "d": 7}
+        assert schedule.earliest_finish["d"] == 8
+        assert schedule.latest_start["c"] == 4
+        assert schedule.latest_finish["e"] == 8
+        assert schedule.slack == {"a": 0, "b": 0, "c": 2, "d": 0, "e": 4}
+    
+    def test_critical_path(self):
+        """Test the zero-slack tasks and the representative chain."""
+        schedule = compute_schedule(self._tasks())
+        
+        assert schedule.critical_path == ["a", "b", "d"]
+        assert sorted(schedule.critical) == ["a", "b", "d"]
+    
+    def test_order_is_topological(self):
+        """Test that every task comes after its dependencies."""
+        tasks = self._tasks()
+        schedule = compute_schedule(tasks)
+        
+        position = {task_id: i for i, task_id in enumerate(schedule.order)}
+        assert len(position) == len(tasks)
+        for task in tasks:
+            for dep in task["dependencies"]:
+                assert position[dep] < position[task["id"]]
+    
+    def test_cycles_are_excluded(self):
+        """Test that cyclic tasks and their dependents are not scheduled."""
+        tasks = self._tasks() + [
+            {"id": "x", "effort": 1, "dependencies": ["y"]},
+            {"id": "y", "effort": 1, "dependencies": ["x", "a"]},
+            {"id": "z", "effort": 50, "dependencies": ["x"]},
+        ]
+        dependencies = analyze_dependencies(tasks)
+        
+        schedule = compute_schedule(tasks, dependencies)
+        
+        assert schedule.cyclic == ["x", "y"]
+        assert schedule.blocked == ["z"]
+        assert "z" not in schedule.slack
+        assert schedule.duration == 8
+        assert schedule == compute_schedule(tasks)
+    
+    def test_dangling_dependencies_and_bad_effort(self):
+        """Test that unknown dependencies are ignored and invalid efforts take no time."""
+        tasks = [
+            {"id": "a", "effort": "lots", "dependencies": ["ghost"]},
+            {"id": "b", "effort": -3, "dependencies": ["a"]},
+            {"id": "c", "dependencies": ["b"]},
+        ]
+        schedule = compute_schedule(tasks)
+        
+        assert schedule.earliest_start == {"a": 0, "b": 0, "c": 0}
+        assert schedule.duration == 5
+        assert schedule.critical_path == ["a", "b", "c"]
+    
+    def test_non_finite_efforts_take_no_time(self):
+        """Test that NaN, Infinity and oversized efforts count as invalid efforts."""
+        tasks = [
+            {"id": "a", "effort": float("nan")},
+            {"id": "b", "effort": float("inf"), "dependencies": ["a"]},
+            {"id": "c", "effort": 10 ** 400, "dependencies": ["b"]},
+            {"id": "d", "effort": 2, "dependencies": ["c"]},
+        ]
+        schedule = compute_schedule(tasks)
+        
+        assert schedule.earliest_finish == {"a": 0, "b": 0, "c": 0, "d": 2}
+        assert schedule.duration == 2
+        assert schedule.critical_path == ["a", "b", "c", "d"]
+    
+    def test_float_efforts_keep_zero_slack(self):
+        """Test that accumulated float error does not knock tasks off the critical path."""
+        tasks = [{"id": str(i), "effort": 0.1, "dependencies": [str(i - 1)] if i else []} for i in range(1000)]
+        
+        schedule = compute_schedule(tasks)
+        
+        assert len(schedule.critical_path) == 1000
+        assert set(schedule.slack.values()) == {0.0}
+    
+    def test_deep_chain(self):
+        """Test a chain far deeper than the recursion limit."""
+        depth = 50000
+        tasks = [{"id": str(i), "effort": 1, "dependencies": [str(i + 1)] if i + 1 < depth else []} for i in range(depth)]
+        
+        schedule = compute_schedule(tasks)
+        
+        assert schedule.duration == depth
+        assert schedule.critical_path[0] == str(depth - 1)
+        assert schedule.critical_path[-1] == "0"
+    
+    def test_empty(self):
+        """Test scheduling no tasks."""
+        schedule = compute_schedule([])
+        assert schedule.order == [] and schedule.critical_path == [] and schedule.duration == 0
+
+
+class TestCriticalPathBoost:
+    """Test the smart strategy's critical-path urgency boost."""
+    
+    def _tasks(self):
+        return [
+            {"id": "long", "priority": 5, "effort": 8, "dependencies": []},
+            {"id": "short", "priority": 5, "effort": 8, "dependencies": []},
+            {"id": "tail", "priority": 5, "effort": 8, "dependencies": ["long"]},
+        ]
+    
+    def test_critical_tasks_rank_higher(self):
+        """Test that a critical task outranks an otherwise identical one."""
+        tasks = self._tasks()
+        plain = {task["id"]: task for task in score_tasks(self._tasks())}
+        
+        boosted = score_tasks(tasks, schedule=compute_schedule(tasks))
+        by_id = {task["id"]: task for task in boosted}
+        
+        assert by_id["long"]["components"]["urgency"] > plain["long"]["components"]["urgency"]
+        assert by_id["short"]["raw_score"] == plain["short"]["raw_score"]
+        assert by_id["long"]["raw_score"] > by_id["short"]["raw_score"]
+    
+    @pytest.mark.parametrize("strategy", ["urgency", "effort", "importance", "unblocker"])
+    def test_other_strategies_unaffected(self, strategy):
+        """Test that only the smart strategy uses the schedule."""
+        tasks = self._tasks()
+        assert score_tasks(tasks, strategy=strategy, schedule=compute_schedule(tasks)) == score_tasks(self._tasks(), strategy=strategy)
+    
+    def test_numpy_backend_matches(self):
+        """Test that the columnar backend applies the same boost."""
+        pytest.importorskip("numpy")
+        tasks = TestNumpyBackend()._tasks()
+        schedule = compute_schedule(tasks)
+        expected = score_tasks(TestNumpyBackend()._tasks(), schedule=schedule)
+        assert score_tasks(TestNumpyBackend()._tasks(), backend="numpy", schedule=schedule) == expected
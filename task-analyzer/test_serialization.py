@@ -0,0 +1,107 @@
+"""Tests for the response JSON encoder and task projection."""
+import json
+
+import pytest
+import serialization
+from serialization import dumps, json_response, project_tasks
+
+
+def scored_task(task_id="a", raw_score=0.123456789):
+    return {
+        "id": task_id,
+        "title": "Task",
+        "score": round(raw_score, 2),
+        "raw_score": raw_score,
+        "components": {"urgency": 0.333333333, "effort": 0.666666666},
+        "explanation": "Why",
+    }
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def encoder(request, monkeypatch):
+    """Run a test with orjson (when installed) and with the stdlib fallback."""
+    if request.param == "stdlib":
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+class TestDumps:
+    """Test the compact JSON encoder."""
+    
+    def test_round_trip(self, encoder):
+        """Test that encoded bytes decode to the original value."""
+        data = {"tasks": [scored_task(str(i)) for i in range(50)], "cycles": [["a", "b"]], "ok": True}
+        encoded = dumps(data)
+        assert isinstance(encoded, bytes)
+        assert json.loads(encoded) == data
+    
+    def test_compact_output(self, encoder):
+        """Test that no whitespace separators are emitted."""
+        assert dumps({"a": [1, 2], "b": None}) == b'{"a":[1,2],"b":null}'
+    
+    def test_sort_keys(self, encoder):
+        """Test that sort_keys orders object keys."""
+        assert dumps({"b": 1, "a": {"d": 2, "c": 3}}, sort_keys=True) == b'{"a":{"c":3,"d":2},"b":1}'
+    
+    def test_default_for_unknown_types(self, encoder):
+        """Test that default is called for values the encoder cannot handle."""
+        class Opaque:
+            def __str__(self):
+                return "opaque"
+        assert dumps({"x": Opaque()}, default=str) == b'{"x":"opaque"}'
+    
+    def test_falls_back_for_big_integers(self):
+        """Test that integers beyond 64 bits still encode."""
+        assert json.loads(dumps({"n": 2 ** 70})) == {"n": 2 ** 70}
+    
+    def test_json_response(self, encoder):
+        """Test that json_response carries the encoded body and status."""
+        response = json_response({"error": "Nope"}, status=400)
+        assert response.status_code == 400
+        assert response["Content-Type"] == "application/json"
+        assert json.loads(response.content) == {"error": "Nope"}
+
+
+class TestProjectTasks:
+    """Test field projection and score rounding."""
+    
+    def test_no_options_keeps_tasks(self):
+        """Test that without options the same dicts are returned."""
+        tasks = [scored_task("a"), scored_task("b")]
+        projected = project_tasks(tasks)
+        assert projected == tasks
+        assert projected[0] is tasks[0]
+    
+    def test_fields(self):
+        """Test that only the requested fields are kept, in request order."""
+        projected = project_tasks([scored_task()], fields=["score", "id", "missing"])
+        assert projected == [{"score": 0.12, "id": "a"}]
+        assert list(projected[0]) == ["score", "id"]
+    
+    def test_precision(self):
+        """Test that score, raw_score and components are rounded."""
+        task = project_tasks([scored_task()], precision=3)[0]
+        assert task["score"] == 0.123
+        assert task["raw_score"] == 0.123
+        assert task["components"] == {"urgency": 0.333, "effort": 0.667}
+        assert task["explanation"] == "Why"
+    
+    def test_precision_adds_score_digits(self):
+        """Test that score is re-derived from raw_score, even when raw_score is not selected."""
+        assert project_tasks([scored_task()], precision=6)[0]["score"] == 0.123457
+        assert project_tasks([scored_task()], fields=["id", "score"], precision=4)[0] == {"id": "a", "score": 0.1235}
+    
+    def test_precision_rounds_strategy_scores(self):
+        """Test that comparison "scores" maps are rounded too."""
+        task = dict(scored_task(), scores={"smart": 0.123456, "effort": 0.987654})
+        assert project_tasks([task], precision=2)[0]["scores"] == {"smart": 0.12, "effort": 0.99}
+    
+    def test_inputs_not_modified(self):
+        """Test that projection never mutates the scored tasks."""
+        tasks = [scored_task()]
+        original = json.loads(json.dumps(tasks))
+        project_tasks(tasks, fields=["id", "score", "components"], precision=1)
+        project_tasks(tasks, precision=1)
+        assert tasks == original
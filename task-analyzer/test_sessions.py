@@ -0,0 +1,170 @@
+"""Tests for incremental task sessions."""
+import copy
+import json
+import os
+import random
+import sys
+
+import django
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings")
+sys.path.insert(0, BASE_DIR)
+django.setup()
+
+from django.test import Client
+
+import views
+from scoring import score_tasks, analyze_dependencies
+from sessions import SessionError, SessionStore, TaskSession
+
+
+def _random_task(rng, task_id, pool):
+    return {
+        "id": task_id,
+        "priority": rng.randint(1, 10),
+        "effort": rng.randint(1, 10),
+        "due_date": rng.choice([None, "2026-01-05", "2030-06-01", "bad-date"]),
+        "dependencies": rng.sample(pool + ["ghost"], k=min(len(pool) + 1, rng.randint(0, 2))),
+    }
+
+
+def _assert_matches_full_rescore(session, tasks, strategy):
+    expected = score_tasks([copy.deepcopy(t) for t in tasks.values()], strategy=strategy)
+    assert session.ranked() == expected
+    graph = analyze_dependencies(list(tasks.values()))
+    summary = session.summary()
+    assert summary["cycle_detected"] == bool(graph.cycles)
+    assert set(summary["dangling_dependencies"]) == set(graph.dangling)
+
+
+class TestTaskSession:
+    """Test cases for incremental re-scoring."""
+    
+    @pytest.mark.parametrize("seed", range(40))
+    def test_deltas_match_full_rescore(self, seed):
+        """Test that any sequence of deltas ranks exactly like scoring from scratch."""
+        rng = random.Random(seed)
+        strategy = rng.choice(["smart", "unblocker", "urgency", "effort"])
+        tasks = {}
+        for i in range(rng.randint(0, 12)):
+            tasks[f"t{i}"] = _random_task(rng, f"t{i}", list(tasks))
+        session = TaskSession([copy.deepcopy(t) for t in tasks.values()], strategy)
+        _assert_matches_full_rescore(session, tasks, strategy)
+        
+        next_id = len(tasks)
+        for _ in range(12):
+            roll = rng.random()
+            if roll < 0.3 or not tasks:
+                task = _random_task(rng, f"t{next_id}", list(tasks) + [f"t{next_id + 1}"])
+                next_id += 1
+                tasks[task["id"]] = task
+                session.apply(add=[copy.deepcopy(task)])
+            elif roll < 0.5:
+                task_id = rng.choice(list(tasks))
+                del tasks[task_id]
+                session.apply(delete=[task_id])
+            else:
+                task_id = rng.choice(list(tasks))
+                field = rng.choice(["priority", "effort", "due_date", "dependencies"])
+                if field == "dependencies":
+                    value = rng.sample(list(tasks), k=min(len(tasks), rng.randint(0, 2)))
+                elif field == "due_date":
+                    value = rng.choice([None, "2026-02-02", "2031-01-01"])
+                else:
+                    value = rng.randint(1, 12)
+                tasks[task_id][field] = value
+                session.apply(update=[{"id": task_id, field: value}])
+            _assert_matches_full_rescore(session, tasks, strategy)
+    
+    def test_local_edit_rescores_only_that_task(self):
+        """Test that an edit leaving the normalizers alone touches one task."""
+        tasks = [{"id": str(i), "priority": 10 - i % 10, "effort": 1 + i % 10} for i in range(100)]
+        session = TaskSession(tasks)
+        
+        result = session.apply(update=[{"id": "50", "due_date": "2026-01-01"}])
+        
+        assert result["rescored"] == 1
+        assert result["full_rescore"] is False
+        assert result["updated"][0]["id"] == "50"
+        assert session.ranked()[result["updated"][0]["rank"]]["id"] == "50"
+    
+    def test_new_cycle_is_reported(self):
+        """Test that closing a cycle updates the cycle index."""
+        session = TaskSession([{"id": "a", "dependencies": ["b"]}, {"id": "b"}])
+        assert session.summary()["cycle_detected"] is False
+        
+        result = session.apply(update=[{"id": "b", "dependencies": ["a"]}])
+        
+        assert result["cycle_detected"] is True
+        assert result["cycles"] == [["a", "b", "a"]]
+    
+    @pytest.mark.parametrize("delta", [
+        {"delete": ["missing"]},
+        {"add": [{"id": "a"}]},
+        {"update": [{"priority": 3}]},
+        {"update": [{"id": "a", "priority": "high"}]},
+        {"add": [{"id": "x"}], "update": [{"id": "nope"}]},
+    ])
+    def test_invalid_delta_leaves_session_untouched(self, delta):
+        """Test that rejected deltas are not partially applied."""
+        session = TaskSession([{"id": "a", "priority": 4}])
+        before = copy.deepcopy(session.ranked())
+        
+        with pytest.raises(SessionError):
+            session.apply(**delta)
+        
+        assert session.ranked() == before
+    
+    def test_duplicate_ids_rejected(self):
+        """Test that a session cannot be created with duplicate ids."""
+        with pytest.raises(SessionError):
+            TaskSession([{"id": "a"}, {"id": "a"}])
+
+
+class TestSessionStore:
+    """Test cases for the in-process session store."""
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used session is evicted first."""
+        store = SessionStore(max_sessions=2)
+        first, _ = store.create([])
+        second, _ = store.create([])
+        store.get(first)
+        third, _ = store.create([])
+        
+        assert store.get(second) is None
+        assert store.get(first) is not None
+        assert store.get(third) is not None
+    
+    def test_idle_sessions_expire(self):
+        """Test the idle timeout."""
+        store = SessionStore(ttl_seconds=0)
+        session_id, session = store.create([])
+        session.touched -= 1
+        
+        assert store.get(session_id) is None
+
+
+class TestSessionViews:
+    """Test the session endpoints."""
+    
+    def test_ranking_is_encoded_under_the_lock(self, monkeypatch):
+        """Test that live task dicts are serialized before a concurrent delta can change them."""
+        encode = views.json_response
+        held = []
+        
+        def json_response(body, **kwargs):
+            held.append(any(session.lock.locked() for session in views._sessions._sessions.values()))
+            return encode(body, **kwargs)
+        
+        monkeypatch.setattr(views, "json_response", json_response)
+        client = Client()
+        created = client.post("/api/tasks/sessions/", json.dumps([{"id": "a"}]), content_type="application/json")
+        session_id = json.loads(created.content)["session_id"]
+        detail = client.get(f"/api/tasks/sessions/{session_id}/")
+        
+        assert created.status_code == 201
+        assert detail.status_code == 200
+        assert held == [True, True]
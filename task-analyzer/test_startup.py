@@ -0,0 +1,65 @@
+"""Tests for the API-only settings profile and lazy imports."""
+import json
+import os
+import subprocess
+import sys
+
+import bench_startup
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_PROBE = """
+import json, sys
+import django
+django.setup()
+from django.test import Client
+from django.urls import Resolver404, resolve
+client = Client()
+analyze = client.post("/api/tasks/analyze/", json.dumps([{"id": "a"}]), content_type="application/json")
+try:
+    store_routed = resolve("/api/store/team/top/") is not None
+except Resolver404:
+    store_routed = False
+print(json.dumps({
+    "analyze": analyze.status_code,
+    "store_routed": store_routed,
+    "loaded": sorted(name for name in ("numpy", "parallel", "taskstore.models", "django.contrib.auth") if name in sys.modules),
+}))
+"""
+
+
+def _probe(settings_module):
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings_module)
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE], check=True, capture_output=True, text=True, cwd=BASE_DIR, env=env,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+class TestApiSettings:
+    """Test the lean settings_api profile in a fresh interpreter."""
+    
+    def test_api_profile_serves_without_optional_modules(self):
+        """Test that analyze works without auth, the store, numpy or the process pool."""
+        result = _probe("settings_api")
+        assert result["analyze"] == 200
+        assert not result["store_routed"]
+        assert result["loaded"] == []
+    
+    def test_full_profile_keeps_the_store(self):
+        """Test that the default settings still route the task store."""
+        result = _probe("settings")
+        assert result["analyze"] == 200
+        assert result["store_routed"]
+        assert result["loaded"] == ["django.contrib.auth", "taskstore.models"]
+
+
+class TestStartupBenchmark:
+    """Test the cold-start benchmark harness."""
+    
+    def test_run_reports_medians(self):
+        """Test that one cold worker is measured end to end."""
+        result = bench_startup.run("settings_api", repeat=1)
+        assert result["settings"] == "settings_api"
+        assert 0 < result["boot_ms"] <= result["first_response_ms"] < result["process_ms"]
+        assert result["rss_boot_mb"] > 0
@@ -0,0 +1,134 @@
+"""Tests for the persistent task store."""
+import copy
+import os
+import sys
+from datetime import datetime, timedelta
+
+import django
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings")
+sys.path.insert(0, BASE_DIR)
+django.setup()
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+
+from bench_tasks import generate_tasks
+from scoring import score_tasks
+from taskstore import store
+from taskstore.models import STRATEGIES, Portfolio
+
+
+@pytest.fixture(scope="module", autouse=True)
+def test_database():
+    """Run against a throwaway test database instead of db.sqlite3."""
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    yield
+    connection.creation.destroy_test_db(old_name, verbosity=0)
+    teardown_test_environment()
+
+
+class TestTaskStore:
+    """Test indexed queries against the in-memory scorer."""
+    
+    def setup_method(self):
+        """Start every test with an empty store."""
+        Portfolio.objects.all().delete()
+    
+    @pytest.mark.parametrize("strategy", STRATEGIES)
+    def test_top_matches_score_tasks(self, strategy):
+        """Test that the indexed top N equals the head of score_tasks, ties included."""
+        tasks = generate_tasks(300, seed=5, graph="dag")
+        store.upsert_tasks("team", copy.deepcopy(tasks))
+        
+        expected = score_tasks(copy.deepcopy(tasks), strategy=strategy)[:10]
+        
+        assert store.top_tasks("team", strategy, 10) == expected
+    
+    def test_upsert_replaces_by_id_and_keeps_position(self):
+        """Test that updates rescore the portfolio and preserve submission order."""
+        tasks = generate_tasks(50, seed=6)
+        store.upsert_tasks("team", copy.deepcopy(tasks))
+        tasks[10]["priority"] = 100
+        store.upsert_tasks("team", [copy.deepcopy(tasks[10]), {"title": "new"}])
+        
+        assert store.top_tasks("team", "importance", 1)[0]["id"] == "t10"
+        assert store.top_tasks("team", "smart", 51) == score_tasks(copy.deepcopy(tasks) + [{"title": "new", "id": "task_50"}])
+    
+    @pytest.mark.parametrize("change", [
+        {"id": "t3", "title": "Renamed"},
+        {"id": "t3", "priority": 1, "due_date": None},
+        {"id": "t3", "dependencies": []},
+        {"id": "t3", "priority": 1000},
+        {"id": "fresh"},
+        {"id": "fresh", "dependencies": ["t1"]},
+        {"id": "t7_missing"},
+    ])
+    def test_partial_rescore_matches_score_tasks(self, change):
+        """Test that an upsert leaves the store as score_tasks would rank it, whichever path it takes."""
+        tasks = generate_tasks(40, seed=8, graph="dag")
+        tasks[7]["dependencies"] = tasks[7].get("dependencies", []) + ["t7_missing"]
+        store.upsert_tasks("team", copy.deepcopy(tasks))
+        
+        ids = [task["id"] for task in tasks]
+        if change["id"] in ids:
+            change = tasks[ids.index(change["id"])] = {**tasks[ids.index(change["id"])], **change}
+        else:
+            tasks.append(change)
+        store.upsert_tasks("team", [copy.deepcopy(change)])
+        
+        assert store.top_tasks("team", "smart", 41) == score_tasks(copy.deepcopy(tasks))
+    
+    def test_upsert_writes_only_changed_rows(self):
+        """Test that an edit which moves no other score updates only the edited row."""
+        tasks = generate_tasks(200, seed=9, graph="dag")
+        store.upsert_tasks("team", tasks)
+        
+        with CaptureQueriesContext(connection) as queries:
+            store.upsert_tasks("team", [dict(tasks[5], title="Renamed", priority=1)])
+        
+        updates = [query["sql"] for query in queries if "UPDATE" in query["sql"] and "storedtask" in query["sql"]]
+        assert len(updates) == 1 and updates[0].startswith("1 times:")
+    
+    def test_delete_rescores_dependents(self):
+        """Test that deleting a dependent drops the unlock count of its dependency."""
+        store.upsert_tasks("team", [
+            {"id": "a", "priority": 5},
+            {"id": "b", "priority": 5, "dependencies": ["a"]},
+        ])
+        assert store.top_tasks("team", "unblocker", 1)[0]["id"] == "a"
+        
+        assert store.delete_tasks("team", ["b"]) == 1
+        assert store.top_tasks("team", "unblocker", 1)[0]["components"]["dependency"] == 0
+    
+    def test_overdue_uses_due_dates(self):
+        """Test that only past, parseable due dates are returned, most overdue first."""
+        today = datetime.now().date()
+        store.upsert_tasks("team", [
+            {"id": "late", "due_date": (today - timedelta(days=2)).isoformat()},
+            {"id": "later", "due_date": (today - timedelta(days=9)).isoformat()},
+            {"id": "soon", "due_date": (today + timedelta(days=1)).isoformat()},
+            {"id": "bad", "due_date": "not-a-date"},
+        ])
+        
+        overdue = store.overdue_tasks("team")
+        
+        assert [(t["id"], t["days_overdue"]) for t in overdue] == [("later", 9), ("late", 2)]
+    
+    def test_scores_refresh_once_per_day(self):
+        """Test that a new day recomputes the urgency buckets, and the same day does not."""
+        store.upsert_tasks("team", generate_tasks(20, seed=7))
+        portfolio = Portfolio.objects.get(name="team")
+        
+        assert not store.refresh_portfolio(portfolio)
+        assert store.refresh_portfolio(portfolio, today=portfolio.scored_on + timedelta(days=1))
+    
+    @pytest.mark.parametrize("tasks", [[{"priority": "high"}], [{"id": "a"}, {"id": "a"}], ["x"]])
+    def test_invalid_tasks_rejected(self, tasks):
+        """Test that malformed tasks and duplicate ids leave the store untouched."""
+        with pytest.raises(store.StoreError):
+            store.upsert_tasks("team", tasks)
+        assert not Portfolio.objects.filter(name="team").exists()
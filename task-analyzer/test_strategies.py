@@ -0,0 +1,116 @@
+"""Tests for the strategy registry and compiled weight strategies."""
+import copy
+import pickle
+
+import pytest
+import strategies
+from bench_tasks import generate_tasks
+from scoring import score_tasks
+from strategies import StrategyError, compile_weights, from_weights, get_strategy, register, resolve
+
+
+class TestCompileWeights:
+    """Test compiling weight vectors into scoring functions."""
+    
+    def test_weighted_sum(self):
+        """Test that the compiled function sums the weighted components."""
+        score = compile_weights([("urgency", 0.5), ("effort", 0.25), ("dependency", 0)])
+        assert score(0.8, 1.0, 0.4, 1.0) == 0.8 * 0.5 + 0.4 * 0.25
+    
+    def test_works_on_arrays(self):
+        """Test that compiled functions apply elementwise to numpy columns."""
+        np = pytest.importorskip("numpy")
+        score = compile_weights([("importance_norm", 0.5), ("effort", 0.5)])
+        result = score(np.zeros(3), np.array([1.0, 0.5, 0.0]), np.array([1.0, 0.5, 0.0]), np.zeros(3))
+        assert result.tolist() == [1.0, 0.5, 0.0]
+    
+    @pytest.mark.parametrize("weights", [[("speed", 1.0)], [("urgency", float("nan"))], [("urgency", "1")], [("urgency", 10 ** 400)]])
+    def test_rejects_invalid_weights(self, weights):
+        """Test that unknown components and non-numeric weights are refused."""
+        with pytest.raises(StrategyError):
+            compile_weights(weights)
+
+
+class TestRegistry:
+    """Test registering and resolving strategies."""
+    
+    def test_builtin_strategies(self):
+        """Test that the historical strategies are registered."""
+        assert strategies.strategy_names()[:5] == ["smart", "urgency", "effort", "importance", "unblocker"]
+        assert get_strategy("unblocker").score(0.5, 1.0, 0.0, 1.0) == (1.0 * 0.6) + (0.5 * 0.2) + (1.0 * 0.2)
+    
+    def test_unknown_names(self):
+        """Test that resolve falls back to smart while get_strategy refuses."""
+        assert resolve("nope") is get_strategy("smart")
+        with pytest.raises(StrategyError):
+            get_strategy("nope")
+    
+    def test_register_custom_strategy(self):
+        """Test that a registered strategy is used by score_tasks."""
+        register("test-deadline", weights=[("urgency", 0.9), ("importance_norm", 0.1)])
+        try:
+            tasks = [{"id": "a", "priority": 10}, {"id": "b", "priority": 1, "due_date": "2000-01-01"}]
+            ranked = score_tasks(tasks, strategy="test-deadline")
+            assert [task["id"] for task in ranked] == ["b", "a"]
+            assert ranked[0]["raw_score"] == 1.0 * 0.9 + 0.1 * 0.1
+        finally:
+            strategies._registry.pop("test-deadline")
+    
+    def test_register_requires_one_definition(self):
+        """Test that exactly one of weights and function must be given."""
+        with pytest.raises(StrategyError):
+            register("broken")
+        with pytest.raises(StrategyError):
+            register("broken", weights=[("urgency", 1.0)], function=lambda *components: 0.0)
+
+
+class TestFromWeights:
+    """Test user-defined weight strategies."""
+    
+    def test_cached_by_weights(self):
+        """Test that equal weightings share one compiled strategy, regardless of key order."""
+        first = from_weights({"urgency": 0.5, "effort": 1})
+        assert from_weights({"effort": 1.0, "urgency": 0.5}) is first
+        assert str(first) == "weights(urgency=0.5,effort=1.0)"
+    
+    @pytest.mark.parametrize("weights", [{}, {"effort": -1}, {"effort": 0}, {"bogus": 1}, {"effort": True}, [], {"urgency": 10 ** 400}])
+    def test_validation(self, weights):
+        """Test that invalid weightings are refused."""
+        with pytest.raises(StrategyError):
+            from_weights(weights)
+    
+    def test_pickles_by_weights(self):
+        """Test that compiled strategies survive the trip to a process worker."""
+        strategy = from_weights({"dependency": 0.7, "effort": 0.3})
+        assert pickle.loads(pickle.dumps(strategy)) is strategy
+        assert pickle.loads(pickle.dumps(get_strategy("smart"))) is get_strategy("smart")
+    
+    def test_replaced_strategies_pickle_by_definition(self):
+        """Test that strategies no longer in the registry rebuild from weights or fail clearly."""
+        weighted = register("test-pickle", weights=[("effort", 0.5)], critical_path_boost=True)
+        function = register("test-pickle", function=lambda *components: 0.0)
+        try:
+            copy_ = pickle.loads(pickle.dumps(weighted))
+            assert (copy_.name, copy_.weights, copy_.critical_path_boost) == ("test-pickle", (("effort", 0.5),), True)
+            assert copy_.score(0.0, 0.0, 0.8, 0.0) == 0.4
+            register("test-pickle", weights=[("urgency", 1.0)])
+            with pytest.raises(StrategyError, match="test-pickle"):
+                pickle.dumps(function)
+        finally:
+            strategies._registry.pop("test-pickle")
+        with pytest.raises(StrategyError):
+            pickle.dumps(function)
+    
+    def test_matches_equivalent_builtin(self):
+        """Test that a weighting equal to a builtin strategy scores identically."""
+        tasks = generate_tasks(300, seed=4, graph="dag")
+        expected = score_tasks(copy.deepcopy(tasks), strategy="effort")
+        assert score_tasks(copy.deepcopy(tasks), strategy=from_weights({"effort": 1})) == expected
+    
+    def test_numpy_backend_matches(self):
+        """Test that both backends agree on a custom weighting."""
+        pytest.importorskip("numpy")
+        tasks = generate_tasks(300, seed=4, graph="dag")
+        strategy = from_weights({"urgency": 0.3, "importance_norm": 0.3, "effort": 0.1, "dependency": 0.3})
+        expected = score_tasks(copy.deepcopy(tasks), strategy=strategy)
+        assert score_tasks(copy.deepcopy(tasks), strategy=strategy, backend="numpy") == expected
@@ -0,0 +1,79 @@
+"""Tests for NDJSON streaming ingestion and output."""
+import io
+import json
+
+import pytest
+from scoring import score_tasks, rank_records, analyze_dependencies
+from streaming import NDJSONError, index_ndjson_file, read_ndjson_tasks, iter_ndjson_results, ndjson_trailer, is_ndjson
+
+
+def _lines(tasks):
+    return [json.dumps(t).encode("utf-8") + b"\n" for t in tasks]
+
+
+class TestReadNDJSON:
+    """Test cases for incremental NDJSON parsing."""
+    
+    def test_keeps_only_compact_fields(self):
+        """Test that bulky fields stay on the spool, not in memory."""
+        spool = io.BytesIO()
+        lines = _lines([{"id": "1", "title": "x" * 1000, "priority": 3, "notes": "y" * 1000}])
+        
+        records = read_ndjson_tasks(lines, spool)
+        
+        assert len(records) == 1
+        assert (records[0].id, records[0].priority, records[0].effort) == ("1", 3, 5)
+        assert records[0].source == (0, len(lines[0]))
+        assert spool.getvalue() == lines[0]
+    
+    def test_skips_blank_lines(self):
+        """Test that blank lines are ignored."""
+        compact = read_ndjson_tasks([b"\n", b'{"id": "1"}\n', b"  \n"], io.BytesIO())
+        assert len(compact) == 1
+    
+    @pytest.mark.parametrize("line", [b"{not json}\n", b"[1, 2]\n"])
+    def test_rejects_invalid_lines(self, line):
+        """Test that non-object lines raise with the line number."""
+        with pytest.raises(NDJSONError, match="(?i)line 2"):
+            read_ndjson_tasks([b'{"id": "1"}\n', line], io.BytesIO())
+    
+    def test_index_file_in_place(self):
+        """Test that indexed records point at their lines in the input itself."""
+        data = b'{"id": "1", "priority": 9}\n\n{"id": "2"}'
+        
+        records = index_ndjson_file(io.BytesIO(data))
+        
+        assert [(r.id, r.priority, r.index) for r in records] == [("1", 9, 0), ("2", 5, 1)]
+        assert [data[start:start + length] for start, length in (r.source for r in records)] == [
+            b'{"id": "1", "priority": 9}\n', b'{"id": "2"}',
+        ]
+
+
+class TestNDJSONOutput:
+    """Test cases for the streamed ranking output."""
+    
+    def test_round_trip_matches_in_memory_scoring(self):
+        """Test that streamed records equal score_tasks over the full dicts."""
+        tasks = [
+            {"id": "a", "title": "A", "priority": 2, "effort": 8, "dependencies": ["b"]},
+            {"id": "b", "title": "B", "priority": 9, "effort": 1, "extra": {"k": 1}},
+            {"title": "C", "dependencies": ["missing"]},
+        ]
+        spool = io.BytesIO()
+        parsed = read_ndjson_tasks(_lines(tasks), spool)
+        graph = analyze_dependencies(parsed)
+        
+        records = [json.loads(r) for r in iter_ndjson_results(rank_records(parsed), spool, ndjson_trailer(graph, 3))]
+        
+        expected = score_tasks([dict(t) for t in tasks])
+        assert [r["task"] for r in records[:-1]] == expected
+        assert records[-1] == {"trailer": {
+            "count": 3, "cycle_detected": False, "cycles": [], "dangling_dependencies": ["missing"],
+        }}
+        assert spool.closed
+    
+    def test_content_type_detection(self):
+        """Test NDJSON media type matching."""
+        assert is_ndjson("application/x-ndjson; charset=utf-8")
+        assert not is_ndjson("application/json")
+        assert not is_ndjson(None)
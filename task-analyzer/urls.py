@@ -1,13 +1,35 @@
 """URL Configuration for task-analyzer project."""
-from django.urls import path
+from django.apps import apps
+from django.conf import settings
+from django.urls import include, path
 import views
 
+# Async views run scoring in bounded executors (see TASK_ADMISSION); the sync views
+# are kept for WSGI deployments that prefer them
+if getattr(settings, "TASK_ASYNC_VIEWS", True):
+    analyze_view, suggest_view = views.analyze_tasks_async, views.suggest_tasks_async
+else:
+    analyze_view, suggest_view = views.analyze_tasks, views.suggest_tasks
+
 urlpatterns = [
     path("", views.serve_index, name="index"),
     path("script.js", views.serve_asset, kwargs={"filename": "script.js"}),
     path("styles.css", views.serve_asset, kwargs={"filename": "styles.css"}),
     path("tasks.json", views.serve_asset, kwargs={"filename": "tasks.json"}),
     path("favicon.ico", views.favicon, name="favicon"),
-    path("api/tasks/analyze/", views.analyze_tasks, name="tasks-analyze"),
-    path("api/tasks/suggest/", views.suggest_tasks, name="tasks-suggest"),
+    path("metrics", views.metrics_view, name="metrics"),
+    path("api/debug/profiles/", views.profile_list, name="debug-profiles"),
+    path("api/debug/profiles/<str:capture_id>/", views.profile_detail, name="debug-profile-detail"),
+    path("api/tasks/analyze/", analyze_view, name="tasks-analyze"),
+    path("api/tasks/analyze/bulk/", views.analyze_bulk, name="tasks-analyze-bulk"),
+    path("api/tasks/schedule/", views.schedule_tasks, name="tasks-schedule"),
+    path("api/tasks/suggest/", suggest_view, name="tasks-suggest"),
+    path("api/tasks/sessions/", views.create_session, name="tasks-sessions"),
+    path("api/tasks/sessions/<str:session_id>/", views.session_detail, name="tasks-session-detail"),
+    path("api/tasks/sessions/<str:session_id>/deltas/", views.session_deltas, name="tasks-session-deltas"),
 ]
+
+# The task store needs the ORM and a database; API-only deployments (settings_api)
+# leave the app out and never import it
+if apps.is_installed("taskstore"):
+    urlpatterns.append(path("api/store/", include("taskstore.urls")))
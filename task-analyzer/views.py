@@ -1,12 +1,175 @@
 # tasks/views.py
 import json
-from django.http import JsonResponse, HttpResponseBadRequest, HttpResponse, FileResponse
+from django.http import JsonResponse, HttpResponseBadRequest, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.cache import parse_etags
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
-from scoring import score_tasks, detect_cycles
-import os
+from scoring import score_tasks, top_k_tasks, rank_records, analyze_dependencies, compute_schedule, compare_strategies
+from streaming import NDJSONError, read_ndjson_tasks, iter_ndjson_results, new_spool, is_ndjson, ndjson_trailer
+from sessions import SessionError, SessionStore
+from result_cache import cache_from_settings
+from bulk import analyze_task_sets
+from encoding import EncodingError, MAX_DECOMPRESSED_SIZE, decode_columns, gunzip, is_gzip, iter_gunzip_lines
+from admission import GZIP_EXPANSION, Overloaded, admission_from_settings
+import functools
 from django.conf import settings
+import metrics
+from serialization import json_response, project_tasks
+from strategies import StrategyError, from_weights, get_strategy, strategy_names
+from assets import assets_from_settings
+from profiling import payload_shape, profiler_from_settings
+
+# In-process store for incremental task sessions
+_sessions = SessionStore(
+    max_sessions=getattr(settings, "TASK_SESSION_MAX_SESSIONS", 100),
+    ttl_seconds=getattr(settings, "TASK_SESSION_TTL_SECONDS", 3600),
+)
+
+# Content-addressed cache of analyze/suggest response bodies
+_result_cache = cache_from_settings(getattr(settings, "TASK_RESULT_CACHE", None))
+
+# Bounded executor lanes for the async analyze/suggest views
+_admission = admission_from_settings(getattr(settings, "TASK_ADMISSION", None))
+
+# Largest number of strategies one comparison request may rank
+MAX_COMPARED_STRATEGIES = 16
+
+# Frontend files, held in memory with precompressed variants (reloaded on change in DEBUG)
+_assets = assets_from_settings(settings.BASE_DIR, getattr(settings, "TASK_STATIC_ASSETS", None), settings.DEBUG)
+
+# Opt-in cProfile/tracemalloc captures of single requests for trusted callers
+_profiler = profiler_from_settings(getattr(settings, "TASK_PROFILING", None), settings.BASE_DIR)
+
+# Stage timing: sampled requests get a Server-Timing header and feed /metrics
+_metrics_config = {"ENABLED": True, "SAMPLE_RATE": 1.0, "SERVER_TIMING": True, **getattr(settings, "TASK_METRICS", {})}
+
+
+def _instrumented(endpoint):
+    """Count requests to `endpoint` and time the stages of sampled ones (?debug=timing forces it)."""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            metrics.count("requests", endpoint=endpoint)
+            debug = getattr(request, "GET", {}).get("debug") == "timing"
+            timed = _metrics_config["ENABLED"] and (debug or metrics.sampled(_metrics_config["SAMPLE_RATE"]))
+            with metrics.collect(timed) as timings:
+                with metrics.stage("total"):
+                    response = view(request, *args, **kwargs)
+            if timings is not None and (debug or _metrics_config["SERVER_TIMING"]):
+                response["Server-Timing"] = timings.server_timing()
+            return response
+        return wrapper
+    return decorator
+
+
+def _profiled(endpoint):
+    """Capture a profile of the view when a trusted caller asks (X-Profile: 1 or ?debug=profile)."""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not _profiler.wanted(getattr(request, "META", {}), getattr(request, "GET", {})):
+                return view(request, *args, **kwargs)
+            response, capture_id = _profiler.capture(
+                endpoint, lambda: view(request, *args, **kwargs), _payload_metadata(request),
+            )
+            if capture_id is not None:
+                response["X-Profile-Id"] = capture_id
+            return response
+        return wrapper
+    return decorator
+
+
+def _payload_metadata(request):
+    """Size and shape of a request's task payload for a profile capture (never its contents)."""
+    try:
+        content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        content_length = 0
+    meta = {
+        "method": request.method,
+        "content_type": request.META.get("CONTENT_TYPE", ""),
+        "content_encoding": request.META.get("HTTP_CONTENT_ENCODING", ""),
+        "content_length": content_length,
+        "query_length": len(request.META.get("QUERY_STRING", "")),
+        "query": sorted(key for key in request.GET if key != "tasks"),
+        "strategy": None,
+        "shape": None,
+    }
+    if is_ndjson(getattr(request, "content_type", "")):
+        return meta  # Reading the body here would defeat the streaming parser
+    try:
+        if request.method == "POST":
+            body, err = _request_body(request)
+            if err:
+                return meta
+            meta["decoded_bytes"] = len(body)
+            payload, err = _tasks_from_payload(json.loads(body))
+        else:
+            payload, err = {"tasks": json.loads(request.GET["tasks"]), "strategy": request.GET.get("strategy")}, None
+    except (KeyError, ValueError):
+        return meta
+    if not err and isinstance(payload["tasks"], list):
+        meta["strategy"] = str(payload.get("strategy"))
+        meta["shape"] = payload_shape(payload["tasks"])
+    return meta
+
+
+def _cache_hit(content):
+    """Build a response from a cached JSON body."""
+    response = HttpResponse(content, content_type="application/json")
+    response["X-Cache"] = "HIT"
+    return response
+
+
+def _cache_store(key, response):
+    """Cache a successful JSON response body and mark it as a miss."""
+    _result_cache.set(key, response.content)
+    response["X-Cache"] = "MISS"
+    return response
+
+
+def _is_gzip_request(request):
+    return is_gzip(getattr(request, "META", {}).get("HTTP_CONTENT_ENCODING", ""))
+
+
+# Helper: request body, inflated when sent with Content-Encoding: gzip
+def _request_body(request):
+    if not _is_gzip_request(request):
+        return request.body, None
+    try:
+        return gunzip(request.body, getattr(settings, "TASK_MAX_DECOMPRESSED_BYTES", MAX_DECOMPRESSED_SIZE)), None
+    except EncodingError as e:
+        return None, str(e)
+
+
+# Helper: decoded and validated task payload of a (possibly gzip) request
+def _load_tasks_from_request(request):
+    with metrics.stage("parse"):
+        body, err = _request_body(request)
+        if err:
+            return None, err
+        return _load_tasks_from_body(body)
+
+
+# Helper: ?fields=id,score&precision=3 output options for task lists
+def _output_options(request):
+    params = getattr(request, "GET", {})
+    fields = params.get("fields")
+    if fields is not None:
+        fields = [field.strip() for field in fields.split(",") if field.strip()]
+        if not fields:
+            return None, None, "'fields' must list at least one field"
+    precision = params.get("precision")
+    if precision is not None:
+        try:
+            precision = int(precision)
+        except ValueError:
+            return None, None, "'precision' must be an integer"
+        if not 0 <= precision <= 15:
+            return None, None, "'precision' must be between 0 and 15"
+    return fields, precision, None
+
 
 # Helper: normalize incoming payload to list of tasks
 def _load_tasks_from_body(body_bytes):
@@ -14,9 +177,20 @@ def _load_tasks_from_body(body_bytes):
         payload = json.loads(body_bytes.decode("utf-8"))
     except Exception:
         return None, "Invalid JSON payload"
+    return _tasks_from_payload(payload)
+
 
+# Helper: validate a decoded analyze payload (also used for each set of a bulk request)
+def _tasks_from_payload(payload):
     # Accept either {"tasks": [...], "strategy": "..."} or a raw list
-    if isinstance(payload, dict) and "tasks" in payload:
+    if isinstance(payload, dict) and "columns" in payload:
+        # Compact columnar encoding: {"columns": {"id": [...], "priority": [...], ...}}
+        try:
+            tasks = decode_columns(payload["columns"])
+        except EncodingError as e:
+            return None, str(e)
+        strategy = payload.get("strategy", "smart")
+    elif isinstance(payload, dict) and "tasks" in payload:
         tasks = payload.get("tasks", [])
         strategy = payload.get("strategy", "smart")
     elif isinstance(payload, list):
@@ -32,61 +206,435 @@ def _load_tasks_from_body(body_bytes):
     if not isinstance(tasks, list):
         return None, "'tasks' must be a list"
 
-    return {"tasks": tasks, "strategy": strategy}, None
+    strategy, err = _strategy_from_payload(strategy)
+    if err:
+        return None, err
+
+    result = {"tasks": tasks, "strategy": strategy}
+    if isinstance(payload, dict) and "strategies" in payload:
+        result["strategies"], err = _strategies_from_payload(payload["strategies"])
+        if err:
+            return None, err
+    return result, None
+
+
+# Helper: a strategy name, or {"weights": {...}} compiled into a custom Strategy
+def _strategy_from_payload(value):
+    if value is None:
+        return "smart", None
+    if isinstance(value, str):
+        return value, None
+    if isinstance(value, dict) and "weights" in value:
+        try:
+            return from_weights(value["weights"]), None
+        except StrategyError as e:
+            return None, str(e)
+    return None, "'strategy' must be a name or an object with 'weights'"
+
+
+# Helper: "all", or a list of strategy names / {"weights": {...}} objects to compare
+def _strategies_from_payload(value):
+    if value == "all":
+        return strategy_names(), None
+    if not isinstance(value, list) or not value:
+        return None, "'strategies' must be \"all\" or a non-empty list"
+    if len(value) > MAX_COMPARED_STRATEGIES:
+        return None, f"At most {MAX_COMPARED_STRATEGIES} strategies can be compared"
+    strategies = []
+    for item in value:
+        strategy, err = _strategy_from_payload(item)
+        if err:
+            return None, err
+        if isinstance(strategy, str):
+            try:
+                strategy = get_strategy(strategy)
+            except StrategyError as e:
+                return None, str(e)
+        strategies.append(strategy)
+    return strategies, None
 
 
 @csrf_exempt
 @require_http_methods(["POST"])
+@_instrumented("analyze")
+@_profiled("analyze")
 def analyze_tasks(request):
     """
     POST /api/tasks/analyze/
     Body: JSON array of tasks OR {"tasks":[...], "strategy":"smart"}
-    Response: { "tasks": [ ...scored tasks... ], "cycle_detected": bool, "cycles": [...] }
+          OR {"columns": {"id": [...], "priority": [...], ...}, "strategy": "smart"};
+          optionally sent with Content-Encoding: gzip
+    Response: { "tasks": [ ...scored tasks... ], "cycle_detected": bool, "cycles": [...],
+                "dangling_dependencies": [...] }
+
+    "strategy" is a registered name or a custom weighting such as
+    {"weights": {"urgency": 0.5, "importance_norm": 0.3, "effort": 0.2}}.
+
+    Query options: ?fields=id,score keeps only those task fields and ?precision=N
+    rounds score, raw_score and components to N digits.
+
+    With Content-Type: application/x-ndjson the body is one task object per line
+    (strategy via ?strategy=) and the response streams one {"task": {...}} line per
+    ranked task followed by a {"trailer": {...}} line with the cycle information.
+
+    Comparison mode: with "strategies": ["smart", "effort", ...] (or "all") the tasks
+    are scored once and returned in input order, each with "scores": {strategy: raw
+    score}, plus "rankings": {strategy: [task indices, best first]}, so a client can
+    switch strategies without another request. Unknown names are rejected here.
     """
-    payload, err = _load_tasks_from_body(request.body)
+    if is_ndjson(getattr(request, "content_type", "")):
+        return _analyze_ndjson(request)
+
+    payload, err = _load_tasks_from_request(request)
     if err:
         return HttpResponseBadRequest(json.dumps({"error": err}), content_type="application/json")
 
     tasks = payload["tasks"]
     strategy = payload.get("strategy", "smart")
+    strategies = payload.get("strategies")
+    fields, precision, err = _output_options(request)
+    if err:
+        return HttpResponseBadRequest(json.dumps({"error": err}), content_type="application/json")
+
+    # Identical payloads on the same day skip cycle detection and scoring
+    with metrics.stage("cache"):
+        params = {"fields": fields, "precision": precision}
+        if strategies is not None:
+            params["strategies"] = [str(s) for s in strategies]
+        cache_key = _result_cache.key("analyze", tasks, strategy, **params)
+        cached = _result_cache.get(cache_key)
+    if cached is not None:
+        return _cache_hit(cached)
 
     # Ensure all tasks have stable ids (the scorer will assign if needed)
-    # Detect cycles
-    has_cycle, cycles = detect_cycles(tasks)
+    # Detect cycles (one representative cycle per cyclic component)
+    with metrics.stage("cycles"):
+        dependency_graph = analyze_dependencies(tasks)
 
     # Score tasks
     try:
-        scored = score_tasks(tasks, strategy=strategy)
+        if strategies is not None:
+            comparison = compare_strategies(tasks, strategies)
+        else:
+            scored = score_tasks(tasks, strategy=strategy)
     except Exception as e:
         return JsonResponse({"error": "Scoring failed", "details": str(e)}, status=500)
 
-    return JsonResponse({"tasks": scored, "cycle_detected": has_cycle, "cycles": cycles}, safe=False)
+    if strategies is not None:
+        with metrics.stage("serialize"):
+            response = json_response({
+                "tasks": project_tasks(comparison.tasks, fields, precision),
+                "strategies": comparison.strategies,
+                "rankings": comparison.rankings,
+                "cycle_detected": bool(dependency_graph.cycles),
+                "cycles": dependency_graph.cycles,
+                "dangling_dependencies": dependency_graph.dangling,
+            })
+        return _cache_store(cache_key, response)
 
+    with metrics.stage("serialize"):
+        response = json_response({
+            "tasks": project_tasks(scored, fields, precision),
+            "cycle_detected": bool(dependency_graph.cycles),
+            "cycles": dependency_graph.cycles,
+            "dangling_dependencies": dependency_graph.dangling,
+        })
+    return _cache_store(cache_key, response)
 
-@require_http_methods(["GET"])
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@_instrumented("analyze_bulk")
+def analyze_bulk(request):
+    """
+    POST /api/tasks/analyze/bulk/
+    Body: {"sets": [<analyze body>, ...], "parallel": false}
+          Each set is anything /api/tasks/analyze/ accepts; an "id" next to "tasks"
+          is echoed back so callers can match results to teams.
+          ?fields= and ?precision= apply to every set, as for /api/tasks/analyze/.
+    Response: { "results": [ {"index": i, "id": ..., <analyze response>} or
+                             {"index": i, "id": ..., "error": "..."}, ... ],
+                "count": int, "errors": int }
+
+    A set that fails validation or scoring gets an error entry; the other sets
+    are still returned.
+    """
+    raw, err = _request_body(request)
+    if err:
+        return HttpResponseBadRequest(json.dumps({"error": err}), content_type="application/json")
+    try:
+        body = json.loads(raw.decode("utf-8"))
+    except Exception:
+        return HttpResponseBadRequest(json.dumps({"error": "Invalid JSON payload"}), content_type="application/json")
+    if not isinstance(body, dict) or not isinstance(body.get("sets"), list):
+        return HttpResponseBadRequest(json.dumps({"error": "Body must be an object with a 'sets' list"}), content_type="application/json")
+
+    fields, precision, err = _output_options(request)
+    if err:
+        return HttpResponseBadRequest(json.dumps({"error": err}), content_type="application/json")
+
+    max_sets = getattr(settings, "TASK_BULK_MAX_SETS", 1000)
+    if len(body["sets"]) > max_sets:
+        return HttpResponseBadRequest(json.dumps({"error": f"At most {max_sets} sets per request"}), content_type="application/json")
+
+    results = []
+    valid = []
+    for index, entry in enumerate(body["sets"]):
+        result = {"index": index}
+        if isinstance(entry, dict) and "tasks" in entry and "id" in entry:
+            result["id"] = entry["id"]
+        payload, err = _tasks_from_payload(entry)
+        if err:
+            result["error"] = err
+        else:
+            valid.append((result, (payload["tasks"], payload.get("strategy", "smart"))))
+        results.append(result)
+
+    analyzed = analyze_task_sets(
+        [task_set for _, task_set in valid],
+        parallel=bool(body.get("parallel", False)),
+        workers=getattr(settings, "TASK_BULK_WORKERS", None),
+    )
+    for (result, _), analysis in zip(valid, analyzed):
+        if "tasks" in analysis:
+            analysis["tasks"] = project_tasks(analysis["tasks"], fields, precision)
+        result.update(analysis)
+
+    return json_response({
+        "results": results,
+        "count": len(results),
+        "errors": sum(1 for result in results if "error" in result),
+    })
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@_instrumented("schedule")
+def schedule_tasks(request):
+    """
+    POST /api/tasks/schedule/
+    Body: anything /api/tasks/analyze/ accepts (tasks or columns, optionally gzip)
+    Response: { "tasks": [ ...scored tasks, each with a "schedule" object... ],
+                "critical_path": [ids], "duration": float, "cyclic": [ids], "blocked": [ids],
+                "cycle_detected": bool, "cycles": [...], "dangling_dependencies": [...] }
+
+    Effort is each task's duration. A task's "schedule" holds earliest_start,
+    earliest_finish, latest_start, latest_finish, slack and critical; it is null for
+    tasks in a cycle ("cyclic") or depending on one ("blocked"). The smart strategy
+    boosts the urgency of critical-path tasks.
+    """
+    payload, err = _load_tasks_from_request(request)
+    if err:
+        return HttpResponseBadRequest(json.dumps({"error": err}), content_type="application/json")
+
+    tasks = payload["tasks"]
+    strategy = payload.get("strategy", "smart")
+
+    with metrics.stage("cache"):
+        cache_key = _result_cache.key("schedule", tasks, strategy)
+        cached = _result_cache.get(cache_key)
+    if cached is not None:
+        return _cache_hit(cached)
+
+    # The schedule reuses the cycle pass's graph and cyclic components
+    with metrics.stage("cycles"):
+        dependency_graph = analyze_dependencies(tasks)
+    with metrics.stage("schedule"):
+        schedule = compute_schedule(tasks, dependency_graph)
+
+    try:
+        scored = score_tasks(tasks, strategy=strategy, schedule=schedule)
+    except Exception as e:
+        return JsonResponse({"error": "Scoring failed", "details": str(e)}, status=500)
+
+    critical = set(schedule.critical)
+    for task in scored:
+        task_id = task["id"]
+        if task_id in schedule.slack:
+            task["schedule"] = {
+                "earliest_start": schedule.earliest_start[task_id],
+                "earliest_finish": schedule.earliest_finish[task_id],
+                "latest_start": schedule.latest_start[task_id],
+                "latest_finish": schedule.latest_finish[task_id],
+                "slack": schedule.slack[task_id],
+                "critical": task_id in critical,
+            }
+        else:
+            task["schedule"] = None
+
+    with metrics.stage("serialize"):
+        response = json_response({
+            "tasks": scored,
+            "critical_path": schedule.critical_path,
+            "duration": schedule.duration,
+            "cyclic": schedule.cyclic,
+            "blocked": schedule.blocked,
+            "cycle_detected": bool(dependency_graph.cycles),
+            "cycles": dependency_graph.cycles,
+            "dangling_dependencies": dependency_graph.dangling,
+        })
+    return _cache_store(cache_key, response)
+
+
+def _analyze_ndjson(request):
+    """Stream-parse an NDJSON task body and stream the ranking back as NDJSON."""
+    strategy = request.GET.get("strategy", "smart")
+    spool = new_spool()
+    lines = request
+    if _is_gzip_request(request):
+        lines = iter_gunzip_lines(request, getattr(settings, "TASK_MAX_DECOMPRESSED_BYTES", MAX_DECOMPRESSED_SIZE))
+    try:
+        records = read_ndjson_tasks(lines, spool)
+    except (NDJSONError, EncodingError) as e:
+        spool.close()
+        return HttpResponseBadRequest(json.dumps({"error": str(e)}), content_type="application/json")
+
+    dependency_graph = analyze_dependencies(records)
+
+    try:
+        ranked = rank_records(records, strategy=strategy)
+    except Exception as e:
+        spool.close()
+        return JsonResponse({"error": "Scoring failed", "details": str(e)}, status=500)
+
+    trailer = ndjson_trailer(dependency_graph, len(ranked))
+    return StreamingHttpResponse(iter_ndjson_results(ranked, spool, trailer), content_type="application/x-ndjson")
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def create_session(request):
+    """
+    POST /api/tasks/sessions/
+    Body: same as /api/tasks/analyze/
+    Response (201): { "session_id": "...", "tasks": [ ...scored tasks... ], "count": int,
+                      "cycle_detected": bool, "cycles": [...], "dangling_dependencies": [...] }
+    """
+    payload, err = _load_tasks_from_request(request)
+    if err:
+        return HttpResponseBadRequest(json.dumps({"error": err}), content_type="application/json")
+
+    try:
+        session_id, session = _sessions.create(payload["tasks"], payload.get("strategy", "smart"))
+    except SessionError as e:
+        return HttpResponseBadRequest(json.dumps({"error": str(e)}), content_type="application/json")
+
+    # Encoded under the lock: the ranked dicts are the session's live tasks, which a
+    # concurrent delta would otherwise change mid-encoding
+    with session.lock:
+        return json_response({"session_id": session_id, "tasks": session.ranked(), **session.summary()}, status=201)
+
+
+@csrf_exempt
+@require_http_methods(["GET", "DELETE"])
+def session_detail(request, session_id):
+    """
+    GET /api/tasks/sessions/<session_id>/?limit=N  -> current ranking (optionally top N)
+    DELETE /api/tasks/sessions/<session_id>/       -> drop the session
+    """
+    if request.method == "DELETE":
+        if not _sessions.delete(session_id):
+            return JsonResponse({"error": "Unknown session"}, status=404)
+        return HttpResponse(status=204)
+
+    session = _sessions.get(session_id)
+    if session is None:
+        return JsonResponse({"error": "Unknown session"}, status=404)
+
+    limit = request.GET.get("limit")
+    try:
+        limit = int(limit) if limit is not None else None
+    except ValueError:
+        return HttpResponseBadRequest(json.dumps({"error": "'limit' must be an integer"}), content_type="application/json")
+
+    with session.lock:  # See create_session
+        return json_response({"session_id": session_id, "tasks": session.ranked(limit), **session.summary()})
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def session_deltas(request, session_id):
+    """
+    POST /api/tasks/sessions/<session_id>/deltas/
+    Body: {"add": [tasks], "update": [{"id": ..., changed fields}], "delete": [ids]}
+    Response: { "updated": [ ...re-scored tasks with "rank"... ], "deleted": [...],
+                "rescored": int, "full_rescore": bool, "count": int, cycle info }
+    """
+    session = _sessions.get(session_id)
+    if session is None:
+        return JsonResponse({"error": "Unknown session"}, status=404)
+
+    raw, err = _request_body(request)
+    if err:
+        return HttpResponseBadRequest(json.dumps({"error": err}), content_type="application/json")
+    try:
+        delta = json.loads(raw.decode("utf-8"))
+    except Exception:
+        return HttpResponseBadRequest(json.dumps({"error": "Invalid JSON payload"}), content_type="application/json")
+    if not isinstance(delta, dict) or not all(isinstance(delta.get(key, []), list) for key in ("add", "update", "delete")):
+        return HttpResponseBadRequest(json.dumps({"error": "Delta must be an object with 'add', 'update' and/or 'delete' lists"}), content_type="application/json")
+
+    try:
+        with session.lock:
+            result = session.apply(delta.get("add", []), delta.get("update", []), delta.get("delete", []))
+    except SessionError as e:
+        return HttpResponseBadRequest(json.dumps({"error": str(e)}), content_type="application/json")
+
+    return json_response({"session_id": session_id, **result})
+
+
+@csrf_exempt
+@require_http_methods(["GET", "POST"])
+@_instrumented("suggest")
+@_profiled("suggest")
 def suggest_tasks(request):
     """
-    GET /api/tasks/suggest/?tasks=<json-encoded-list>&strategy=smart
-    Returns top 3 suggestions with a basic explanation in 'why'.
+    GET /api/tasks/suggest/?tasks=<json-encoded-list>&strategy=smart&k=3
+    POST /api/tasks/suggest/?k=3 with any body /api/tasks/analyze/ accepts (including the
+         columnar encoding and gzip), for portfolios too large for a query string
+    Returns the top k (default 3) suggestions with a basic explanation in 'why'.
     Example usage (curl): 
       curl --get --data-urlencode 'tasks=[{"id":"1","title":"A","due_date":"2025-11-30",...}]' "http://localhost:8000/api/tasks/suggest/"
     """
-    tasks_param = request.GET.get("tasks")
-    if not tasks_param:
-        return HttpResponseBadRequest(json.dumps({"error": "Provide 'tasks' query parameter (JSON-encoded list)"}), content_type="application/json")
+    if request.method == "POST":
+        payload, err = _load_tasks_from_request(request)
+        if err:
+            return HttpResponseBadRequest(json.dumps({"error": err}), content_type="application/json")
+        tasks = payload["tasks"]
+        strategy = payload.get("strategy", "smart")
+    else:
+        tasks_param = request.GET.get("tasks")
+        if not tasks_param:
+            return HttpResponseBadRequest(json.dumps({"error": "Provide 'tasks' query parameter (JSON-encoded list)"}), content_type="application/json")
+
+        try:
+            with metrics.stage("parse"):
+                tasks = json.loads(tasks_param)
+        except Exception:
+            return HttpResponseBadRequest(json.dumps({"error": "Invalid JSON in 'tasks' parameter"}), content_type="application/json")
+
+        if not isinstance(tasks, list):
+            return HttpResponseBadRequest(json.dumps({"error": "'tasks' must be a list"}), content_type="application/json")
+        strategy = request.GET.get("strategy", "smart")
 
     try:
-        tasks = json.loads(tasks_param)
-    except Exception:
-        return HttpResponseBadRequest(json.dumps({"error": "Invalid JSON in 'tasks' parameter"}), content_type="application/json")
+        k = int(request.GET.get("k", 3))
+    except ValueError:
+        return HttpResponseBadRequest(json.dumps({"error": "'k' must be an integer"}), content_type="application/json")
+    if k < 1:
+        return HttpResponseBadRequest(json.dumps({"error": "'k' must be at least 1"}), content_type="application/json")
 
-    strategy = request.GET.get("strategy", "smart")
-    scored = score_tasks(tasks, strategy=strategy)
-    top3 = scored[:3]
+    with metrics.stage("cache"):
+        cache_key = _result_cache.key("suggest", tasks, strategy, k=k)
+        cached = _result_cache.get(cache_key)
+    if cached is not None:
+        return _cache_hit(cached)
+
+    top = top_k_tasks(tasks, k=k, strategy=strategy)
 
     # Provide a brief "why" message for each suggestion
     suggestions = []
-    for t in top3:
+    for t in top:
         reasons = []
         comp = t.get("components", {})
         if comp.get("urgency", 0) >= 0.7:
@@ -106,40 +654,158 @@ def suggest_tasks(request):
             "due_date": t.get("due_date")
         })
 
-    return JsonResponse({"suggestions": suggestions}, safe=False)
+    with metrics.stage("serialize"):
+        response = json_response({"suggestions": suggestions})
+    return _cache_store(cache_key, response)
+
+
+def _request_size(request):
+    """
+    Approximate payload size in bytes, used to pick an admission lane.
+
+    Taken from Content-Length: reading request.body here would load a spooled
+    upload into memory (and enforce DATA_UPLOAD_MAX_MEMORY_SIZE), which NDJSON
+    streaming must avoid. A body without a usable length, e.g. chunked, is
+    assumed to be large.
+    """
+    try:
+        size = int(request.META.get("CONTENT_LENGTH") or "")
+    except ValueError:
+        if request.method != "POST":
+            size = 0
+        else:
+            size = _admission.large_threshold
+    if _is_gzip_request(request):
+        size *= GZIP_EXPANSION
+    return size + len(request.META.get("QUERY_STRING", ""))
+
+
+async def _run_admitted(request, view):
+    """Run a synchronous view in the admission lane for this request's size."""
+    try:
+        return await _admission.run(_request_size(request), view, request)
+    except Overloaded:
+        response = JsonResponse({"error": "Too many large analyses in progress; retry shortly"}, status=503)
+        response["Retry-After"] = "1"
+        return response
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+async def analyze_tasks_async(request):
+    """
+    Async (ASGI) variant of analyze_tasks with the same request and response.
+
+    Under ASGI the body has already been read without blocking when the view
+    runs. Parsing, cycle detection, scoring and serialization happen in an
+    executor lane chosen by body size (see TASK_ADMISSION), so the event loop
+    stays free and small requests never wait behind large analyses.
+    """
+    return await _run_admitted(request, analyze_tasks)
+
+
+@csrf_exempt
+@require_http_methods(["GET", "POST"])
+async def suggest_tasks_async(request):
+    """Async (ASGI) variant of suggest_tasks; see analyze_tasks_async."""
+    return await _run_admitted(request, suggest_tasks)
+
+
+@require_http_methods(["GET"])
+def metrics_view(request):
+    """GET /metrics - stage timings and counters in the Prometheus text format."""
+    cache_stats = _result_cache.stats()
+    admission_stats = _admission.stats()
+    body = metrics.REGISTRY.render([
+        ("result_cache_hits_total", "counter", "Analyze/suggest responses served from the cache", cache_stats["hits"]),
+        ("result_cache_misses_total", "counter", "Analyze/suggest cache lookups that missed", cache_stats["misses"]),
+        ("large_requests_pending", "gauge", "Large requests running or queued in the admission lane", admission_stats["large_pending"]),
+    ])
+    return HttpResponse(body, content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def _asset_response(request, name):
+    """Serve an in-memory asset: negotiated encoding, strong ETag, 304 on a matching If-None-Match."""
+    asset, encoding, not_modified = _assets.lookup(
+        name,
+        request.META.get("HTTP_ACCEPT_ENCODING", ""),
+        parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")),
+    )
+    if asset is None:
+        return None
+    variant = asset.variants[encoding]
+    if not_modified:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(variant.body, content_type=asset.content_type)
+        response["Content-Length"] = str(len(variant.body))
+        if encoding != "identity":
+            response["Content-Encoding"] = encoding
+    response["ETag"] = variant.etag
+    response["Cache-Control"] = _assets.cache_control
+    if len(asset.variants) > 1:
+        response["Vary"] = "Accept-Encoding"
+    return response
+
+
+@require_http_methods(["GET"])
+def profile_list(request):
+    """
+    GET /api/debug/profiles/?limit=20 - newest profile captures, for trusted callers.
+
+    Answers 404 unless TASK_PROFILING is enabled and the caller is trusted.
+    """
+    if not _profiler.enabled or not _profiler.trusted(request.META):
+        return JsonResponse({"error": "Not found"}, status=404)
+    try:
+        limit = int(request.GET.get("limit", 20))
+    except ValueError:
+        return HttpResponseBadRequest(json.dumps({"error": "'limit' must be an integer"}), content_type="application/json")
+    return json_response({"directory": _profiler.directory, "captures": _profiler.captures(limit)})
+
+
+@require_http_methods(["GET"])
+def profile_detail(request, capture_id):
+    """
+    GET /api/debug/profiles/<id>/?top=25 - one capture with its costliest functions
+    (by cumulative time) and largest allocation sites.
+    """
+    if not _profiler.enabled or not _profiler.trusted(request.META):
+        return JsonResponse({"error": "Not found"}, status=404)
+    try:
+        top = int(request.GET.get("top", 25))
+    except ValueError:
+        return HttpResponseBadRequest(json.dumps({"error": "'top' must be an integer"}), content_type="application/json")
+    detail = _profiler.detail(capture_id, top)
+    if detail is None:
+        return JsonResponse({"error": "Unknown capture"}, status=404)
+    return json_response(detail)
 
 
 def serve_index(request):
     """Serve the frontend `index.html` file located in project root."""
-    index_path = os.path.join(settings.BASE_DIR, "index.html")
-    if not os.path.exists(index_path):
+    response = _asset_response(request, "index.html")
+    if response is None:
         return HttpResponse("index.html not found", status=404)
-    return FileResponse(open(index_path, "rb"), content_type="text/html")
+    return response
 
 
 def favicon(request):
     """Serve favicon.ico if present in project root; otherwise return 204 No Content."""
-    fav_path = os.path.join(settings.BASE_DIR, "favicon.ico")
-    if not os.path.exists(fav_path):
+    response = _asset_response(request, "favicon.ico")
+    if response is None:
         return HttpResponse(status=204)
-    return FileResponse(open(fav_path, "rb"), content_type="image/x-icon")
+    return response
 
 
 def serve_asset(request, filename):
     """Serve a handful of top-level static assets from project root safely.
 
-    Only allow whitelisted filenames to avoid exposing arbitrary files.
+    Only whitelisted filenames are served, to avoid exposing arbitrary files.
     """
-    allowed = {
-        "script.js": "application/javascript",
-        "styles.css": "text/css",
-        "tasks.json": "application/json",
-    }
-    if filename not in allowed:
+    if filename not in ("script.js", "styles.css", "tasks.json"):
         return HttpResponse(status=404)
-
-    asset_path = os.path.join(settings.BASE_DIR, filename)
-    if not os.path.exists(asset_path):
+    response = _asset_response(request, filename)
+    if response is None:
         return HttpResponse(status=404)
-
-    return FileResponse(open(asset_path, "rb"), content_type=allowed[filename])
+    return response